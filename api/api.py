@@ -1,7 +1,13 @@
-from fastapi import FastAPI, HTTPException
+import base64
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List, Optional
+from api.response_cache import ResponseCache, encode_json
 from core.autoticket_facade import AutoTicketFacade
+from models.film_catalog import CATALOG_ORDER
 from utils.env_loader import get_env
 
 # Gunakan environment variable untuk menginisialisasi FastAPI
@@ -14,12 +20,54 @@ app = FastAPI(
 # Inisialisasi facade menggunakan environment variable untuk config path
 facade = AutoTicketFacade()  # Internally uses CONFIG_PATH from env
 
+# Cache-Control untuk endpoint katalog; klien tetap memvalidasi ulang lewat ETag
+CATALOG_CACHE_CONTROL = get_env("CATALOG_CACHE_CONTROL", "public, max-age=60, must-revalidate")
+
+# Nama urutan di API -> kunci urutan katalog
+FILM_SORT_OPTIONS = {"title": "judul", "price": "harga", "theater": "teater"}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Bytes JSON respons katalog per versi katalog (daftar film per genre, detail, jadwal)
+catalog_responses = ResponseCache()
+
+def catalog_cache_headers(version: Dict[str, object]) -> Dict[str, str]:
+    """
+    Header caching untuk respons katalog. Versi diambil sebelum data dibaca
+    agar saat konfigurasi dimuat ulang ETag paling buruk hanya usang, tidak
+    pernah lebih baru dari isi respons
+    """
+    headers = {"ETag": f'"{version["etag"]}"', "Cache-Control": CATALOG_CACHE_CONTROL}
+    if version["last_modified"] is not None:
+        headers["Last-Modified"] = formatdate(version["last_modified"], usegmt=True)
+    return headers
+
+def is_not_modified(request: Request, headers: Dict[str, str]) -> bool:
+    """
+    Mengecek If-None-Match (diutamakan) lalu If-Modified-Since terhadap header katalog
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        etag = headers["ETag"]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and "Last-Modified" in headers:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return parsedate_to_datetime(headers["Last-Modified"]) <= since
+    return False
+
 class SeatReservation(BaseModel):
     film_title: str
     showtime: str
     seats: List[str]
     is_holiday: bool = False
     is_member: bool = False
+    show_date: Optional[str] = None
 
 class TicketRequest(BaseModel):
     film_title: str
@@ -28,6 +76,29 @@ class TicketRequest(BaseModel):
     is_holiday: bool = False
     is_member: bool = False
     seat_preference: str = "berurutan"
+    show_date: Optional[str] = None
+
+class BatchTicketRequest(BaseModel):
+    bookings: List[TicketRequest]
+
+class PriceBatchRequest(BaseModel):
+    films: List[str]
+    showtimes: List[str]
+    is_holiday: Optional[List[bool]] = None
+    is_member: Optional[List[bool]] = None
+    ticket_counts: Optional[List[int]] = None
+
+class HoldRequest(BaseModel):
+    film_title: str
+    showtime: str
+    ticket_count: int = 1
+    seat_preference: str = "berurutan"
+    seats: Optional[List[str]] = None
+    show_date: Optional[str] = None
+
+class HoldConfirmation(BaseModel):
+    is_holiday: bool = False
+    is_member: bool = False
 
 @app.get("/", tags=["Info"])
 def read_root():
@@ -37,37 +108,112 @@ def read_root():
     return {"message": "Selamat datang di AutoTicket API", "version": get_env("API_VERSION", "1.0.0")}
 
 @app.get("/films", tags=["Film"])
-def get_films(genre: str = None):
+async def get_films(
+    request: Request,
+    genre: str = None,
+    sort: Optional[str] = None,
+    fields: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+):
+    """
+    Mendapatkan daftar semua film atau filter berdasarkan genre.
+    sort: title, price, atau theater. fields: daftar field dipisah koma.
+    Jika limit atau cursor diberikan, respons berupa satu halaman
+    {"films": [...], "next_cursor": ...}
+    """
+    if sort is not None and sort not in FILM_SORT_OPTIONS:
+        raise HTTPException(status_code=400, detail=f"Urutan '{sort}' tidak dikenal")
+
+    version = facade.get_catalog_version()
+    headers = catalog_cache_headers(version)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+
+    paginated = limit is not None or cursor is not None
+    field_list = tuple(field.strip() for field in fields.split(",") if field.strip()) if fields else None
+    key = ("films", genre.lower() if genre else None, sort, field_list, limit, cursor)
+    body = catalog_responses.get(version["etag"], key)
+    if body is None:
+        if not paginated and sort is None and field_list is None:
+            films = await facade.get_films_async(genre)
+            if not films:
+                raise HTTPException(status_code=404, detail="Tidak ada film yang tersedia")
+            body = catalog_responses.put(version["etag"], key, [film.model_dump() for film in films])
+        else:
+            result = await facade.get_films_page_async(
+                genre,
+                FILM_SORT_OPTIONS.get(sort, CATALOG_ORDER),
+                cursor,
+                min(limit, MAX_PAGE_SIZE) if limit is not None else (DEFAULT_PAGE_SIZE if paginated else None),
+                field_list
+            )
+            if not result["success"]:
+                raise HTTPException(status_code=400, detail=result["message"])
+            if not result["films"] and cursor is None:
+                raise HTTPException(status_code=404, detail="Tidak ada film yang tersedia")
+            payload = (
+                {"films": result["films"], "next_cursor": result["next_cursor"]}
+                if paginated else result["films"]
+            )
+            body = catalog_responses.put(version["etag"], key, payload)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.get("/films/search", tags=["Film"])
+def search_films(q: str, request: Request, limit: int = 10):
+    """
+    Mencari film berdasarkan judul (toleran salah ketik) atau genre,
+    diurutkan dari yang paling mirip. Harus didefinisikan sebelum /films/{title}
+    """
+    version = facade.get_catalog_version()
+    headers = catalog_cache_headers(version)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+
+    key = ("search", q.strip().casefold(), min(limit, MAX_PAGE_SIZE))
+    body = catalog_responses.get(version["etag"], key)
+    if body is None:
+        result = facade.search_films(q, min(limit, MAX_PAGE_SIZE))
+        if not result["success"]:
+            raise HTTPException(status_code=400, detail=result["message"])
+        body = catalog_responses.put(version["etag"], key, [
+            {**item["film"].model_dump(), "score": item["score"]} for item in result["results"]
+        ])
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def film_detail_response(request: Request, title: str, kind: str, build) -> Response:
     """
-    Mendapatkan daftar semua film atau filter berdasarkan genre
+    Respons detail film atau jadwal dari cache bytes JSON (fungsi bantu)
     """
-    films = facade.get_films(genre)
-    if not films:
-        raise HTTPException(status_code=404, detail="Tidak ada film yang tersedia")
-    return [film.dict() for film in films]
+    version = facade.get_catalog_version()
+    headers = catalog_cache_headers(version)
+    key = (kind, title.casefold())
+    body = catalog_responses.get(version["etag"], key)
+    if body is None:
+        result = facade.get_film_detail(title)
+        if not result["success"]:
+            raise HTTPException(status_code=404, detail=result["message"])
+        body = catalog_responses.put(version["etag"], key, build(result["film"]))
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @app.get("/films/{title}", tags=["Film"])
-def get_film_by_title(title: str):
+def get_film_by_title(title: str, request: Request):
     """
     Mendapatkan informasi film berdasarkan judul
     """
-    result = facade.get_film_detail(title)
-    if not result["success"]:
-        raise HTTPException(status_code=404, detail=result["message"])
-    return result["film"].dict()
+    return film_detail_response(request, title, "film", lambda film: film.model_dump())
 
 @app.get("/films/{title}/showtimes", tags=["Film"])
-def get_film_showtimes(title: str):
+def get_film_showtimes(title: str, request: Request):
     """
     Mendapatkan jadwal tayang untuk film tertentu
     """
-    result = facade.get_film_detail(title)
-    if not result["success"]:
-        raise HTTPException(status_code=404, detail=result["message"])
-    return result["film"].jadwal
+    return film_detail_response(request, title, "showtimes", lambda film: film.jadwal)
 
 @app.get("/films/{title}/price", tags=["Film"])
-def get_film_price(
+async def get_film_price(
     title: str,
     showtime: str,
     is_holiday: bool = False,
@@ -77,7 +223,7 @@ def get_film_price(
     """
     Mendapatkan informasi harga tiket untuk film tertentu
     """
-    price_result = facade.calculate_ticket_price(
+    price_result = await facade.calculate_ticket_price_async(
         title, showtime, is_holiday, is_member, ticket_count
     )
 
@@ -103,34 +249,169 @@ def get_film_price(
         "total_price": price_result["total"]
     }
 
+@app.post("/prices/batch", tags=["Film"])
+def get_prices_batch(request: PriceBatchRequest):
+    """
+    Menghitung harga untuk banyak kombinasi film dan jam tayang sekaligus.
+    Hasil dikembalikan per kolom dengan urutan sama seperti permintaan
+    """
+    result = facade.calculate_ticket_prices_batch(
+        request.films,
+        request.showtimes,
+        request.is_holiday,
+        request.is_member,
+        request.ticket_counts
+    )
+
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+
+    return {
+        "count": result["jumlah"],
+        "film": result["film"],
+        "showtime": result["jadwal"],
+        "valid": result["valid"],
+        "admin_fee": result["biaya_admin"],
+        "base_price": result["harga_dasar"],
+        "time_discount": result["diskon_waktu"],
+        "holiday_discount": result["diskon_libur"],
+        "member_discount": result["diskon_member"],
+        "total_discount": result["total_diskon"],
+        "price_per_ticket": result["harga_per_tiket"],
+        "total_price": result["total_harga"]
+    }
+
 @app.get("/seats/{teater_name}", tags=["Kursi"])
-def get_available_seats(teater_name: str):
+async def get_available_seats(
+    teater_name: str,
+    film_title: Optional[str] = None,
+    showtime: Optional[str] = None,
+    show_date: Optional[str] = None
+):
     """
-    Mendapatkan daftar kursi yang tersedia untuk teater tertentu
+    Mendapatkan daftar kursi yang tersedia untuk satu pertunjukan jika
+    film_title dan showtime diberikan. Tanpa showtime, semua pertunjukan
+    teater (atau film) pada show_date digabungkan: jumlah kursi tersedia
+    per pertunjukan, dan kursi yang tersedia di semua pertunjukan
     """
-    result = facade.check_seats(theater_name=teater_name)
+    result = await facade.check_seats_async(
+        theater_name=teater_name,
+        film_title=film_title,
+        showtime=showtime,
+        show_date=show_date
+    )
 
     if not result["success"]:
         return {"message": result["message"], "seats": []}
 
-    return {
+    response = {
         "teater": teater_name,
         "available_count": result["total"],
         "seats": result["contoh_kursi"]
     }
+    if "pertunjukan" in result:
+        response["show_date"] = result["tanggal"]
+        response["shows"] = [
+            {"film": show["film"], "showtime": show["jadwal"], "available_count": show["total"]}
+            for show in result["pertunjukan"]
+        ]
+    return response
+
+@app.get("/seats/{teater_name}/map", tags=["Kursi"])
+def get_seat_map(
+    teater_name: str,
+    request: Request,
+    film_title: Optional[str] = None,
+    showtime: Optional[str] = None,
+    show_date: Optional[str] = None,
+    encoding: str = "bitmap"
+):
+    """
+    Mendapatkan peta kursi lengkap dalam bentuk ringkas.
+    encoding=bitmap: base64 bitmap (bit 1 = tersedia, kursi ke-i = bit i mod 8 pada byte i div 8).
+    encoding=runs: daftar [nomor kursi awal, panjang] untuk deretan kursi tersedia.
+    Klien dapat mengirim If-None-Match untuk melewati peta yang tidak berubah
+    """
+    if encoding not in ("bitmap", "runs"):
+        raise HTTPException(status_code=400, detail=f"Encoding '{encoding}' tidak dikenal")
+
+    result = facade.get_seat_map(teater_name, film_title, showtime, show_date)
+    if not result["success"]:
+        raise HTTPException(status_code=404, detail=result["message"])
+
+    digest = hashlib.blake2b(result["bitmap"], digest_size=8)
+    digest.update(result["jumlah_kursi"].to_bytes(4, "little"))
+    headers = {"ETag": f'"{digest.hexdigest()}"', "Cache-Control": "no-cache"}
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+
+    payload = {
+        "teater": result["teater"],
+        "size": result["jumlah_kursi"],
+        "seats_per_row": result["kursi_per_baris"],
+        "rows": [
+            {
+                "name": row["nama"],
+                "start": row["awal"],
+                "count": row["jumlah"],
+                "aisles_after": row["celah"],
+                "class": row["kelas"]
+            }
+            for row in result["layout"]["baris"]
+        ],
+        "version": result["versi"],
+        "available_count": result["total"],
+        "encoding": encoding
+    }
+    if encoding == "bitmap":
+        payload["bitmap"] = base64.b64encode(result["bitmap"]).decode("ascii")
+    else:
+        payload["runs"] = result["deretan_kosong"]
+    return Response(content=encode_json(payload), media_type="application/json", headers=headers)
+
+@app.get("/seats/{teater_name}/stream", tags=["Kursi"])
+async def stream_seats(
+    teater_name: str,
+    film_title: Optional[str] = None,
+    showtime: Optional[str] = None,
+    show_date: Optional[str] = None
+):
+    """
+    Server-Sent Events berisi perubahan kursi satu pertunjukan:
+    event "snapshot" (bitmap base64 seperti /seats/{teater_name}/map),
+    lalu event "delta" berisi nomor kursi yang terisi (taken) dan kembali
+    kosong (freed), digabung per interval singkat
+    """
+    result = facade.stream_seats(teater_name, film_title, showtime, show_date)
+    if not result["success"]:
+        raise HTTPException(status_code=404, detail=result["message"])
+
+    async def event_source():
+        async for event, data in result["events"]:
+            if data is None:
+                yield b": ping\n\n"
+            else:
+                yield b"event: " + event.encode("ascii") + b"\ndata: " + encode_json(data) + b"\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.post("/book", tags=["Reservasi"])
-def book_tickets(request: TicketRequest):
+async def book_tickets(request: TicketRequest):
     """
     Memesan tiket film dengan jumlah tertentu
     """
-    result = facade.book_tickets(
+    result = await facade.book_tickets_async(
         request.film_title,
         request.showtime,
         request.ticket_count,
         request.is_holiday,
         request.is_member,
-        request.seat_preference
+        request.seat_preference,
+        request.show_date
     )
 
     if not result["success"]:
@@ -140,12 +421,40 @@ def book_tickets(request: TicketRequest):
         "reservation_id": result["reservation_id"],
         "film": result["film"],
         "showtime": result["jadwal"],
+        "show_date": result["tanggal"],
         "teater": result["teater"],
         "seats": result["kursi"],
         "price": result["harga"],
         "status": result["status"]
     }
 
+@app.post("/book/batch", tags=["Reservasi"])
+def book_tickets_batch(request: BatchTicketRequest):
+    """
+    Memesan banyak tiket sekaligus untuk pesanan grup; semua berhasil atau tidak sama sekali
+    """
+    result = facade.book_tickets_batch([booking.model_dump() for booking in request.bookings])
+
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+
+    return {
+        "reservations": [
+            {
+                "reservation_id": reservation["reservation_id"],
+                "film": reservation["film"],
+                "showtime": reservation["jadwal"],
+                "show_date": reservation["tanggal"],
+                "teater": reservation["teater"],
+                "seats": reservation["kursi"],
+                "price": reservation["harga"],
+                "status": reservation["status"]
+            }
+            for reservation in result["reservations"]
+        ],
+        "total_price": result["total"]
+    }
+
 @app.post("/reservation", tags=["Reservasi"])
 def reserve_specific_seats(reservation: SeatReservation):
     """
@@ -156,53 +465,133 @@ def reserve_specific_seats(reservation: SeatReservation):
     if not film_details["success"]:
         raise HTTPException(status_code=404, detail=film_details["message"])
 
-    # Validasi jadwal
-    film = film_details["film"]
-    if reservation.showtime not in film.jadwal:
-        raise HTTPException(status_code=400, detail=f"Jadwal '{reservation.showtime}' tidak valid")
+    result = facade.reserve_seats(
+        reservation.film_title,
+        reservation.showtime,
+        reservation.seats,
+        reservation.is_holiday,
+        reservation.is_member,
+        reservation.show_date
+    )
 
-    # Cek ketersediaan kursi
-    seat_check = facade.check_seats(theater_name=film.teater)
-    if not seat_check["success"]:
-        raise HTTPException(status_code=400, detail=seat_check["message"])
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
 
-    # Validasi kursi spesifik yang diminta
-    for seat in reservation.seats:
-        seat_index = facade._seat_manager.get_seat_index(seat)
-        if seat_index == -1:
-            raise HTTPException(status_code=400, detail=f"Format kursi '{seat}' tidak valid")
+    return {
+        "reservation_id": result["reservation_id"],
+        "film": result["film"],
+        "showtime": result["jadwal"],
+        "show_date": result["tanggal"],
+        "teater": result["teater"],
+        "seats": result["kursi"],
+        "price": result["harga"],
+        "status": result["status"]
+    }
 
-        if seat_index >= len(facade._seat_manager.seat_status[film.teater]) or not facade._seat_manager.seat_status[film.teater][seat_index]:
-            raise HTTPException(status_code=400, detail=f"Kursi '{seat}' tidak tersedia")
+@app.get("/reservations", tags=["Reservasi"])
+def list_reservations(
+    film_title: Optional[str] = None,
+    showtime: Optional[str] = None,
+    show_date: Optional[str] = None,
+    limit: int = 100
+):
+    """
+    Mendapatkan riwayat reservasi yang tersimpan
+    """
+    result = facade.list_reservations(film_title, showtime, show_date, limit)
 
-    # Tandai kursi sebagai dipesan
-    for seat in reservation.seats:
-        seat_index = facade._seat_manager.get_seat_index(seat)
-        facade._seat_manager.seat_status[film.teater][seat_index] = False
+    if not result["success"]:
+        raise HTTPException(status_code=404, detail=result["message"])
+    return result["reservations"]
 
-    # Hitung harga
-    price_result = facade.calculate_ticket_price(
-        reservation.film_title,
-        reservation.showtime,
-        reservation.is_holiday,
-        reservation.is_member,
-        len(reservation.seats)
+@app.get("/reservations/{reservation_id}", tags=["Reservasi"])
+def get_reservation(reservation_id: str):
+    """
+    Mendapatkan detail reservasi berdasarkan ID
+    """
+    result = facade.get_reservation(reservation_id)
+
+    if not result["success"]:
+        raise HTTPException(status_code=404, detail=result["message"])
+
+    reservation = result["reservation"]
+    return {
+        "reservation_id": reservation["reservation_id"],
+        "film": reservation["film"],
+        "showtime": reservation["jadwal"],
+        "show_date": reservation["tanggal"],
+        "teater": reservation["teater"],
+        "seats": reservation["kursi"],
+        "price": reservation["harga"],
+        "status": reservation["status"]
+    }
+
+@app.delete("/reservations/{reservation_id}", tags=["Reservasi"])
+def cancel_reservation(reservation_id: str):
+    """
+    Membatalkan reservasi berdasarkan ID dan membebaskan kursinya
+    """
+    result = facade.cancel_reservation(reservation_id)
+
+    if not result["success"]:
+        raise HTTPException(status_code=404, detail=result["message"])
+    return {"message": result["message"]}
+
+@app.post("/holds", tags=["Reservasi"])
+def hold_seats(request: HoldRequest):
+    """
+    Menahan kursi sementara selama checkout; hold kedaluwarsa otomatis
+    """
+    result = facade.hold_tickets(
+        request.film_title,
+        request.showtime,
+        request.ticket_count,
+        request.seat_preference,
+        request.seats,
+        request.show_date
     )
 
-    if not price_result["success"]:
-        # Kembalikan kursi jika perhitungan gagal
-        facade.cancel_booking(film.teater, reservation.seats)
-        raise HTTPException(status_code=404, detail=price_result["message"])
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+
+    return {
+        "hold_id": result["hold_id"],
+        "film": result["film"],
+        "showtime": result["jadwal"],
+        "show_date": result["tanggal"],
+        "teater": result["teater"],
+        "seats": result["kursi"],
+        "expires_at": result["expires_at"]
+    }
 
-    import secrets
-    reservation_id = f"RES-{secrets.randbelow(9000) + 1000}"
+@app.post("/holds/{hold_id}/confirm", tags=["Reservasi"])
+def confirm_hold(hold_id: str, confirmation: HoldConfirmation):
+    """
+    Mengonfirmasi hold menjadi reservasi tetap
+    """
+    result = facade.confirm_hold(hold_id, confirmation.is_holiday, confirmation.is_member)
+
+    if not result["success"]:
+        raise HTTPException(status_code=404, detail=result["message"])
 
     return {
-        "reservation_id": reservation_id,
-        "film": reservation.film_title,
-        "showtime": reservation.showtime,
-        "teater": film.teater,
-        "seats": reservation.seats,
-        "price": price_result["total"],
-        "status": "confirmed"
+        "reservation_id": result["reservation_id"],
+        "film": result["film"],
+        "showtime": result["jadwal"],
+        "show_date": result["tanggal"],
+        "teater": result["teater"],
+        "seats": result["kursi"],
+        "price": result["harga"],
+        "status": result["status"]
     }
+
+@app.delete("/holds/{hold_id}", tags=["Reservasi"])
+def release_hold(hold_id: str):
+    """
+    Membatalkan hold dan mengembalikan kursi ke inventaris
+    """
+    result = facade.release_hold(hold_id)
+
+    if not result["success"]:
+        raise HTTPException(status_code=404, detail=result["message"])
+    return {"message": result["message"]}
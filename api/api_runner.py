@@ -1,19 +1,97 @@
+import os
+import tempfile
 import webbrowser
+from typing import Optional
 import uvicorn
-from api.api import app
+from config.config_manager import ConfigManager
+from core.services.seat_manager import SeatManager
+from core.services.shared_seat_store import SharedSeatStore
+from models.hold_store import HoldStore
 from utils.env_loader import get_env
 
+def _load_config() -> ConfigManager:
+    config = ConfigManager(get_env("CONFIG_PATH", "config.json"))
+    config.load_config()
+    return config
+
+def create_shared_seat_store() -> SharedSeatStore:
+    """
+    Membuat inventaris kursi di shared memory untuk dipakai bersama oleh
+    semua worker API
+    """
+    slot_count = int(get_env("SEAT_SHM_SLOTS", "4096"))
+    # Kapasitas slot mengikuti teater terbesar, termasuk layout dari konfigurasi
+    capacity = SeatManager(_load_config()).max_seats
+    return SharedSeatStore.create(f"autoticket-{os.getpid()}", slot_count, capacity)
+
+def prepare_shared_state(store: SharedSeatStore) -> Optional[str]:
+    """
+    Menyiapkan state bersama sebelum worker dimulai: database hold dan
+    reservasi (RESERVATION_DB, default file sementara), penghapusan hold
+    dari run sebelumnya, dan pemulihan inventaris kursi dari journal utama
+    serta journal setiap worker di JOURNAL_DIR
+
+    Returns:
+        Lokasi database sementara yang dihapus saat server berhenti, atau None
+    """
+    temporary_db = None
+    if not get_env("RESERVATION_DB"):
+        temporary_db = os.path.join(tempfile.gettempdir(), f"{store.name}.db")
+        os.environ["RESERVATION_DB"] = temporary_db
+
+    # Kursi yang ditahan tidak dipulihkan dari journal, jadi hold lama tidak berlaku lagi
+    holds = HoldStore(os.environ["RESERVATION_DB"])
+    holds.clear()
+    holds.close()
+
+    journal_dir = get_env("JOURNAL_DIR")
+    if journal_dir:
+        seat_manager = SeatManager(_load_config())
+        seat_manager.attach_shared_store(store)
+        seat_manager.restore_journals(journal_dir)
+    else:
+        print("⚠️ JOURNAL_DIR tidak diset: kursi yang sudah dipesan hilang saat server dihentikan")
+    return temporary_db
+
 def run_api_server():
     """
-    Menjalankan server API dengan konfigurasi dari environment variables
+    Menjalankan server API dengan konfigurasi dari environment variables.
+    Jika API_WORKERS lebih dari 1, inventaris kursi dipindah ke shared memory
+    agar semua worker melihat kursi yang sama, sedangkan hold dan reservasi
+    disimpan di RESERVATION_DB. Segmen shared memory dihapus saat server
+    berhenti; kursi yang terjual bertahan lewat journal di JOURNAL_DIR
     """
     api_host = get_env("API_HOST", "127.0.0.1")
     api_port = int(get_env("API_PORT", "8000"))
     api_docs_url = get_env("API_DOCS_URL", "http://localhost:8000/docs")
+    api_workers = int(get_env("API_WORKERS", "1"))
 
     print(f"\n🚀 Memulai server API di http://{api_host}:{api_port}")
     webbrowser.open(api_docs_url)
-    uvicorn.run(app, host=api_host, port=api_port)
+
+    if api_workers <= 1:
+        # Aplikasi (dan facade-nya) hanya dibangun di proses yang melayani request
+        from api.api import app
+        uvicorn.run(app, host=api_host, port=api_port)
+        return
+
+    store = create_shared_seat_store()
+    temporary_db = None
+    try:
+        temporary_db = prepare_shared_state(store)
+        os.environ["SEAT_SHM_NAME"] = store.name
+        uvicorn.run("api.api:app", host=api_host, port=api_port, workers=api_workers)
+    finally:
+        os.environ.pop("SEAT_SHM_NAME", None)
+        store.close()
+        store.unlink()
+        if temporary_db is not None:
+            os.environ.pop("RESERVATION_DB", None)
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.remove(temporary_db + suffix)
+                except FileNotFoundError:
+                    pass
 
 def run_api():
     """
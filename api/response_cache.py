@@ -0,0 +1,50 @@
+import json
+import threading
+from typing import Any, Dict, Hashable, Optional
+
+
+def encode_json(payload: Any) -> bytes:
+    """
+    Serialisasi JSON ringkas langsung ke bytes, tanpa melewati jsonable_encoder
+    """
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ResponseCache:
+    """
+    Cache bytes JSON untuk respons read-only yang hanya berubah saat katalog berubah.
+
+    Setiap entri terikat ke versi katalog: begitu versi berganti, seluruh
+    isi cache dibuang. Jumlah entri dibatasi karena kunci bisa berasal dari
+    input pengguna (misalnya genre).
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._version = None
+        self._entries: Dict[Hashable, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, version: str, key: Hashable) -> Optional[bytes]:
+        """Bytes JSON untuk kunci pada versi katalog tertentu, atau None jika belum ada"""
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._entries = {}
+            return self._entries.get(key)
+
+    def put(self, version: str, key: Hashable, payload: Any) -> bytes:
+        """Menyerialisasi payload dan menyimpannya jika versi katalog masih sama"""
+        # Serialisasi di luar lock; permintaan paralel paling buruk menghitung ulang
+        body = encode_json(payload)
+        with self._lock:
+            if version == self._version:
+                if len(self._entries) >= self.max_entries:
+                    self._entries = {}
+                self._entries[key] = body
+        return body
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version = None
+            self._entries = {}
@@ -55,20 +55,36 @@ def show_film_info(facade):
 def check_seat_availability(facade):
     film_title = input("Masukkan judul film (opsional, kosongkan untuk cek berdasarkan teater): ").strip()
     theater_name = None
+    showtime = None
 
-    if not film_title:
+    if film_title:
+        detail = facade.get_film_detail(film_title)
+        if not detail.get("success", False):
+            print(detail.get("message", "⚠️ Film tidak ditemukan."))
+            return
+        showtime = input(f"Masukkan jam tayang ({', '.join(detail.get('jadwal', []))}; kosongkan untuk semua): ").strip() or None
+    else:
         theater_name = input("Masukkan nama teater: ").strip()
         if not theater_name:
             print("⚠️ Harus memasukkan judul film atau nama teater.")
             return
 
-    result = facade.check_seats(theater_name, film_title)
+    show_date = input("Masukkan tanggal pertunjukan (YYYY-MM-DD, kosongkan untuk hari ini): ").strip() or None
+
+    result = facade.check_seats(theater_name, film_title or None, showtime, show_date)
 
     if not result.get("success", False):
         print(result.get("message", "⚠️ Kursi tidak tersedia."))
         return
 
     print(f"\n💺 Informasi Ketersediaan Kursi di Teater {result.get('teater')}:")
+    if "pertunjukan" in result:
+        print(f"Tanggal: {result.get('tanggal')}")
+        for show in result["pertunjukan"]:
+            print(f"- {show['film']} {show['jadwal']}: {show['total']} kursi tersedia")
+        print(f"Contoh kursi tersedia di semua pertunjukan: {', '.join(result.get('contoh_kursi', []))}")
+        return
+
     print(f"Total kursi tersedia: {result.get('total')}")
     print(f"Contoh kursi tersedia: {', '.join(result.get('contoh_kursi', []))}")
 
@@ -114,9 +130,9 @@ def book_ticket(facade):
     # Input preferensi tambahan
     is_holiday = input("Apakah hari libur? (y/n): ").strip().lower() == 'y'
     is_member = input("Apakah member? (y/n): ").strip().lower() == 'y'
-    seat_pref = input("Preferensi kursi (berurutan/bebas): ").strip().lower()
+    seat_pref = input("Preferensi kursi (berurutan/bebas/terbaik): ").strip().lower()
 
-    if seat_pref not in ["berurutan", "bebas"]:
+    if seat_pref not in ["berurutan", "bebas", "terbaik"]:
         seat_pref = "berurutan"  # Default jika input tidak valid
 
     # Proses pemesanan
@@ -1,5 +1,3 @@
-from api.api_runner import run_api
-from core.autoticket_facade import AutoTicketFacade
 from cli.actions import (
     show_film_list,
     search_film_by_genre,
@@ -22,20 +20,36 @@ def display_menu():
     print("7. Jalankan API (Web Mode)")
     print("8. Keluar")
 
+def run_api():
+    """
+    Web stack (FastAPI, uvicorn, api.api) baru dimuat saat menu 7 dipilih
+    agar tidak memperlambat startup CLI
+    """
+    from api.api_runner import run_api as run_api_server
+    run_api_server()
+
 def start_cli():
-    facade = AutoTicketFacade()
+    facade = None
+
+    def get_facade():
+        # Facade beserta subsistemnya dibangun saat pertama kali dibutuhkan
+        nonlocal facade
+        if facade is None:
+            from core.autoticket_facade import AutoTicketFacade
+            facade = AutoTicketFacade()
+        return facade
 
     while True:
         display_menu()
         choice = input("Masukkan pilihan Anda (1-8): ").strip()
 
         menu_handlers = {
-            '1': lambda: show_film_list(facade),
-            '2': lambda: search_film_by_genre(facade),
-            '3': lambda: show_film_schedule(facade),
-            '4': lambda: show_film_info(facade),
-            '5': lambda: check_seat_availability(facade),
-            '6': lambda: book_ticket(facade),
+            '1': lambda: show_film_list(get_facade()),
+            '2': lambda: search_film_by_genre(get_facade()),
+            '3': lambda: show_film_schedule(get_facade()),
+            '4': lambda: show_film_info(get_facade()),
+            '5': lambda: check_seat_availability(get_facade()),
+            '6': lambda: book_ticket(get_facade()),
             '7': run_api,
             '8': lambda: print("\n🙏 Terima kasih telah menggunakan AutoTicket. Sampai jumpa di pemesanan berikutnya!")
         }
@@ -4,10 +4,144 @@
 # File: config_manager.py
 
 import json
+import marshal
 import os
-from typing import Dict, Any
+import sys
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Mapping, Optional, Tuple
+from models.film_catalog import FilmCatalog
+from models.seat_layout import SeatLayout
 from utils.env_loader import get_env
 
+# Penanda format artefak config terkompilasi; artefak dari versi Python lain diabaikan
+_CACHE_MAGIC = ("autoticket-config", 1, sys.version_info[:2])
+
+# Cache hasil parse per proses: path absolut -> (stamp file, config beku, katalog film)
+_parse_cache: Dict[str, Tuple[Tuple[int, int], Any, FilmCatalog]] = {}
+_parse_cache_lock = threading.Lock()
+
+
+def _freeze(value: Any) -> Any:
+    """Mengubah dict/list hasil json.load menjadi mapping read-only dan tuple."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# Bagian konfigurasi yang harus berupa objek JSON, beserta sub-bagian objeknya
+_MAPPING_SECTIONS = {
+    "bioskop": (),
+    "teater": ("tipe_teater", "layout"),
+    "tiket": ("WAKTU_DISKON",),
+    "kontak": ()
+}
+
+
+def _check_shape(config: Any) -> None:
+    """
+    Memastikan bentuk konfigurasi sesuai harapan sebelum dipakai, sehingga
+    file dengan tipe bagian yang salah (mis. "teater": []) ditolak dengan
+    ValueError alih-alih menimbulkan AttributeError di tengah pemuatan.
+    """
+    if not isinstance(config, Mapping):
+        raise ValueError("Konfigurasi harus berupa objek JSON")
+    for section, children in _MAPPING_SECTIONS.items():
+        value = config.get(section, {})
+        if not isinstance(value, Mapping):
+            raise ValueError(f"Bagian '{section}' pada konfigurasi harus berupa objek")
+        for child in children:
+            if not isinstance(value.get(child, {}), Mapping):
+                raise ValueError(f"Bagian '{section}.{child}' pada konfigurasi harus berupa objek")
+    if not isinstance(config.get("film", ()), (list, tuple)):
+        raise ValueError("Bagian 'film' pada konfigurasi harus berupa daftar")
+
+
+class ConfigSnapshot:
+    """
+    Hasil satu kali pemuatan config.json yang tidak pernah diubah.
+
+    Semua nilai dan katalog film diambil dari snapshot yang sama, sehingga
+    pembaca yang memegang satu snapshot tidak pernah melihat konfigurasi
+    yang setengah diterapkan saat file dimuat ulang.
+    """
+
+    __slots__ = ("config", "version", "stamp", "film_catalog", "seat_layouts")
+
+    def __init__(self, config: Dict[str, Any], version: int, stamp: Optional[Tuple[int, int]] = None,
+                 film_catalog: Optional[FilmCatalog] = None):
+        self.config = _freeze(config)
+        _check_shape(self.config)
+        self.version = version
+        self.stamp = stamp
+        # Dibangun di muka: data film yang tidak valid menggagalkan pemuatan
+        if film_catalog is None:
+            film_catalog = FilmCatalog(self.config.get("film", ()))
+        self.film_catalog = film_catalog
+        # Layout kursi per teater yang dikonfigurasi; layout tidak valid juga menggagalkan pemuatan
+        self.seat_layouts: Dict[str, SeatLayout] = {
+            teater: SeatLayout.from_config(data)
+            for teater, data in self.get_teater_info().get("layout", {}).items()
+        }
+
+    # ===================== AKSES UMUM =====================
+
+    def get_bioskop_info(self) -> Dict[str, Any]:
+        return self.config.get("bioskop", {})
+
+    def get_teater_info(self) -> Dict[str, Any]:
+        return self.config.get("teater", {})
+
+    def get_tiket_config(self) -> Dict[str, Any]:
+        return self.config.get("tiket", {})
+
+    def get_kontak_info(self) -> Dict[str, Any]:
+        return self.config.get("kontak", {})
+
+    # ===================== AKSES NILAI SPESIFIK =====================
+
+    def get_max_kursi(self) -> int:
+        return self.get_teater_info().get("MAX_KURSI", 100)
+
+    def get_seat_count(self, teater_name: str) -> int:
+        """Jumlah kursi teater menurut layout-nya; MAX_KURSI jika layout tidak dikonfigurasi."""
+        layout = self.seat_layouts.get(teater_name)
+        return layout.size if layout is not None else self.get_max_kursi()
+
+    def get_diskon_libur(self) -> int:
+        return self.get_tiket_config().get("DISKON_LIBUR", 0)
+
+    def get_diskon_member(self) -> int:
+        return self.get_tiket_config().get("DISKON_MEMBER", 0)
+
+    def get_waktu_diskon(self) -> Dict[str, int]:
+        return self.get_tiket_config().get("WAKTU_DISKON", {})
+
+    def get_diskon_by_jam(self, jam: str) -> int:
+        """
+        Mengembalikan diskon tambahan berdasarkan waktu (jam tayang film).
+        """
+        jam_int = int(jam.split(':')[0])
+        waktu_diskon = self.get_waktu_diskon()
+        if jam_int < 12:
+            return waktu_diskon.get("pagi", 0)
+        elif 12 <= jam_int < 18:
+            return waktu_diskon.get("siang", 0)
+        else:
+            return waktu_diskon.get("malam", 0)
+
+    def get_biaya_admin(self) -> int:
+        return self.get_tiket_config().get("HARGA_ADMIN", 0)
+
+    def get_hold_ttl(self) -> int:
+        """
+        Mengembalikan lama hold kursi sementara (detik) sebelum kedaluwarsa.
+        """
+        return self.get_tiket_config().get("HOLD_TTL_DETIK", 600)
+
+
 class ConfigManager:
     def __init__(self, config_path: str = None):
         """
@@ -18,63 +152,217 @@ class ConfigManager:
             config_path = get_env("CONFIG_PATH", "config.json")
             
         self.config_path = config_path
-        self.config: Dict[str, Any] = {}
+        self._snapshot = ConfigSnapshot({}, 0)
+        self._load_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        # Pesan kesalahan pemuatan ulang terakhir (None jika berhasil)
+        self.last_reload_error: Optional[str] = None
+        # Dipanggil dengan snapshot baru sebelum diterbitkan; ValueError menolak snapshot
+        # tersebut (dipakai SeatManager untuk menjaga layout teater yang sedang dipakai)
+        self.reload_guard: Optional[Callable[["ConfigSnapshot"], None]] = None
 
     def load_config(self) -> Dict[str, Any]:
         """
-        Memuat konfigurasi dari file JSON eksternal.
+        Memuat konfigurasi dari file JSON eksternal lalu menerbitkannya
+        sebagai snapshot baru.
         """
+        with self._load_lock:
+            stamp = self._file_stamp()
+            self._publish(stamp)
+        return self.config
+
+    def _file_stamp(self) -> Tuple[int, int]:
         if not os.path.exists(self.config_path):
             raise FileNotFoundError(f"Config file tidak ditemukan: {self.config_path}")
+        stat = os.stat(self.config_path)
+        return stat.st_mtime_ns, stat.st_size
 
+    def _read_file(self) -> Dict[str, Any]:
         with open(self.config_path, 'r', encoding='utf-8') as file:
             try:
-                self.config = json.load(file)
+                return json.load(file)
             except json.JSONDecodeError as e:
                 raise ValueError(f"Format config.json tidak valid: {e}")
 
-        return self.config
+    def _cache_path(self) -> str:
+        return self.config_path + ".cache"
+
+    def _read_compiled(self, stamp: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        """
+        Membaca artefak marshal di samping file JSON jika masih sesuai
+        dengan stamp file; None jika tidak ada, usang, atau rusak.
+        """
+        try:
+            with open(self._cache_path(), 'rb') as file:
+                header, config = marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if header != (_CACHE_MAGIC, stamp):
+            return None
+        return config
+
+    def _write_compiled(self, config: Dict[str, Any], stamp: Tuple[int, int]) -> None:
+        """Menyimpan hasil parse sebagai artefak marshal (ditulis atomik, gagal diam-diam)"""
+        tmp_path = f"{self._cache_path()}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as file:
+                marshal.dump(((_CACHE_MAGIC, stamp), config), file)
+            os.replace(tmp_path, self._cache_path())
+        except (OSError, ValueError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _parse(self, stamp: Tuple[int, int]) -> Tuple[Any, FilmCatalog]:
+        """
+        Mengembalikan config beku dan katalog film untuk stamp file ini.
+        Hasil parse dipakai bersama oleh semua ConfigManager di proses yang
+        sama; dengan CONFIG_CACHE=1 hasilnya juga disimpan sebagai artefak
+        marshal agar proses lain tidak perlu mem-parse JSON lagi.
+        """
+        key = os.path.abspath(self.config_path)
+        cached = _parse_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+
+        use_compiled = get_env("CONFIG_CACHE", "0") == "1"
+        config = self._read_compiled(stamp) if use_compiled else None
+        if config is None:
+            config = self._read_file()
+            if use_compiled:
+                self._write_compiled(config, stamp)
+
+        frozen = _freeze(config)
+        _check_shape(frozen)
+        catalog = FilmCatalog(frozen.get("film", ()))
+        with _parse_cache_lock:
+            _parse_cache[key] = (stamp, frozen, catalog)
+        return frozen, catalog
+
+    def _publish(self, stamp: Tuple[int, int]) -> None:
+        # Snapshot dibangun dan divalidasi penuh, lalu diterbitkan dengan satu penggantian referensi
+        config, catalog = self._parse(stamp)
+        snapshot = ConfigSnapshot(config, self._snapshot.version + 1, stamp, catalog)
+        if self.reload_guard is not None:
+            self.reload_guard(snapshot)
+        self._snapshot = snapshot
+
+    # ===================== PEMUATAN ULANG OTOMATIS =====================
+
+    def reload_if_changed(self) -> bool:
+        """
+        Memuat ulang konfigurasi jika mtime atau ukuran file berubah.
+        Jika file baru tidak valid, snapshot lama tetap dipakai dan
+        kesalahannya disimpan di last_reload_error.
+
+        Returns:
+            True jika snapshot baru diterbitkan
+        """
+        with self._load_lock:
+            try:
+                stamp = self._file_stamp()
+                if stamp == self._snapshot.stamp:
+                    return False
+                self._publish(stamp)
+            except Exception as e:
+                # Kesalahan apa pun (termasuk bentuk konfigurasi yang tak terduga)
+                # tidak boleh menghentikan thread pemantau konfigurasi
+                self.last_reload_error = f"{type(e).__name__}: {e}"
+                return False
+        self.last_reload_error = None
+        return True
+
+    def start_watching(self, interval: float = 2.0) -> None:
+        """
+        Menjalankan thread latar yang memeriksa perubahan file setiap interval detik.
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._watch_loop, args=(interval,),
+                                         name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch_loop(self, interval: float) -> None:
+        while not self._stop_watching.wait(interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                self.last_reload_error = f"{type(e).__name__}: {e}"
+
+    # ===================== SNAPSHOT =====================
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Snapshot konfigurasi yang sedang berlaku (immutable)."""
+        return self._snapshot
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self._snapshot.config
+
+    @property
+    def version(self) -> int:
+        """Naik setiap kali snapshot baru diterbitkan; tabel turunan memakainya untuk invalidasi."""
+        return self._snapshot.version
 
     # ===================== AKSES UMUM =====================
 
     def get_bioskop_info(self) -> Dict[str, Any]:
-        return self.config.get("bioskop", {})
+        return self._snapshot.get_bioskop_info()
 
     def get_teater_info(self) -> Dict[str, Any]:
-        return self.config.get("teater", {})
+        return self._snapshot.get_teater_info()
 
     def get_tiket_config(self) -> Dict[str, Any]:
-        return self.config.get("tiket", {})
+        return self._snapshot.get_tiket_config()
 
     def get_kontak_info(self) -> Dict[str, Any]:
-        return self.config.get("kontak", {})
+        return self._snapshot.get_kontak_info()
+
+    def get_film_catalog(self) -> FilmCatalog:
+        """
+        Mengembalikan katalog film terindeks untuk konfigurasi yang sedang dimuat.
+        Katalog dibangun sekali per snapshot lalu dipakai bersama oleh semua subsistem.
+        """
+        return self._snapshot.film_catalog
 
     # ===================== AKSES NILAI SPESIFIK =====================
 
     def get_max_kursi(self) -> int:
-        return self.get_teater_info().get("MAX_KURSI", 100)
+        return self._snapshot.get_max_kursi()
+
+    def get_seat_count(self, teater_name: str) -> int:
+        return self._snapshot.get_seat_count(teater_name)
 
     def get_diskon_libur(self) -> int:
-        return self.get_tiket_config().get("DISKON_LIBUR", 0)
+        return self._snapshot.get_diskon_libur()
 
     def get_diskon_member(self) -> int:
-        return self.get_tiket_config().get("DISKON_MEMBER", 0)
+        return self._snapshot.get_diskon_member()
 
     def get_waktu_diskon(self) -> Dict[str, int]:
-        return self.get_tiket_config().get("WAKTU_DISKON", {})
+        return self._snapshot.get_waktu_diskon()
 
     def get_diskon_by_jam(self, jam: str) -> int:
         """
         Mengembalikan diskon tambahan berdasarkan waktu (jam tayang film).
         """
-        jam_int = int(jam.split(':')[0])
-        waktu_diskon = self.get_waktu_diskon()
-        if jam_int < 12:
-            return waktu_diskon.get("pagi", 0)
-        elif 12 <= jam_int < 18:
-            return waktu_diskon.get("siang", 0)
-        else:
-            return waktu_diskon.get("malam", 0)
+        return self._snapshot.get_diskon_by_jam(jam)
 
     def get_biaya_admin(self) -> int:
-        return self.get_tiket_config().get("HARGA_ADMIN", 0)
\ No newline at end of file
+        return self._snapshot.get_biaya_admin()
+
+    def get_hold_ttl(self) -> int:
+        """
+        Mengembalikan lama hold kursi sementara (detik) sebelum kedaluwarsa.
+        """
+        return self._snapshot.get_hold_ttl()
@@ -1,11 +1,25 @@
-from typing import Dict, List, Any, Optional
+import asyncio
+import base64
+import json
+import os
+import threading
+import weakref
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
 from config.config_manager import ConfigManager
 from core.services.price_calculator import PriceCalculator  # Ubah path service -> core.services
+from core.services.seat_journal import JournalError, SeatJournal, worker_directory
 from core.services.seat_manager import SeatManager  # Ubah path
+from core.services.seat_stream import SeatStreamHub
+from core.services.shared_seat_store import SharedSeatStore
 from core.validation.ticket_validator import TicketValidator  # Ubah path validation -> core.validators
 from models.entities import Film
 from models.data_manager import DataManager
+from models.film_catalog import CATALOG_ORDER, FilmCatalog
+from models.hold_store import HoldStore
+from models.reservation_store import ReservationStore
 from utils.env_loader import get_env
+from utils.id_generator import ReservationIdGenerator
 
 class AutoTicketFacade:
     """
@@ -26,43 +40,396 @@ class AutoTicketFacade:
         self._config = ConfigManager(config_path)
         self._config.load_config()
 
-        # Setup film manager - Subsistem 2
-        self._film_manager = DataManager[Film]()
+        # Setup film manager - Subsistem 2: pasangan (katalog, film manager)
+        # dipasang dalam satu assignment agar pembaca selalu melihat pasangan yang cocok
+        self._film_data: Tuple[FilmCatalog, DataManager[Film]] = (None, DataManager[Film]())
         self._load_film_data()
 
         # Inisialisasi subsistem lainnya
         self._seat_manager = SeatManager(self._config)
+        self._attach_shared_store()
+        self._attach_journal()
         self._calculator = PriceCalculator(self._config)
         self._validator = TicketValidator(self._config)
+        self._start_config_watcher()
+
+        # Penyimpanan riwayat reservasi (opsional) - aktif jika RESERVATION_DB diset.
+        # Dalam mode multi-worker database ini menjadi sumber data reservasi
+        # bersama sehingga setiap penulisan langsung di-commit
+        reservation_db = get_env("RESERVATION_DB")
+        self._shared_state = self._seat_manager.shared_store is not None
+        self._reservation_store = (
+            ReservationStore(reservation_db, write_through=self._shared_state) if reservation_db else None
+        )
+
+        # Indeks reservasi: ID -> pertunjukan, nomor kursi, dan data reservasi
+        self._id_generator = ReservationIdGenerator()
+        self._reservations: Dict[str, Dict[str, Any]] = {}
+        self._reservation_lock = threading.Lock()
+
+        # ID reservasi per pertunjukan; dibuang dari indeks setelah inventaris
+        # pertunjukannya dihapus oleh purge_finished_shows
+        self._reservations_by_show: Dict[tuple, set] = {}
+        self._purged_at = None
+        self._seat_manager.purge_listener = self._on_shows_purged
+
+        # Siaran perubahan kursi (SSE), dibuat saat pertama kali ada pelanggan
+        self._seat_stream: Optional[SeatStreamHub] = None
+
+        # Lock asyncio per pertunjukan: coroutine pemesanan pertunjukan yang sama
+        # mengantre di event loop sehingga paling banyak memakai satu thread
+        self._async_locks: "weakref.WeakValueDictionary[tuple, asyncio.Lock]" = weakref.WeakValueDictionary()
 
     # ===================== METODE PRIVATE UNTUK MENANGANI LOGIKA INTERNAL =====================
 
-    def _load_film_data(self) -> None:
-        """Memuat data film dari konfigurasi (metode private)"""
-        film_data = self._config.config.get("film", [])
-        for f in film_data:
-            self._film_manager.tambah(Film(**f))
+    @property
+    def _catalog(self) -> FilmCatalog:
+        """Katalog film terindeks yang dipakai bersama subsistem lain (metode private)"""
+        return self._config.get_film_catalog()
+
+    def _load_film_data(self) -> Tuple[FilmCatalog, DataManager[Film]]:
+        """
+        Memuat data film dari katalog konfigurasi (metode private).
+        Setelah hot reload, film yang tidak berubah dipakai ulang. Katalog dan
+        daftar film baru dipasang bersama sebagai satu tuple sehingga pembaca
+        tidak pernah memadukan katalog baru dengan daftar film lama
+        """
+        catalog = self._catalog
+        current = {film.judul: film for film in self._film_data[1].ambil_semua()}
+        film_manager = DataManager[Film]()
+        for film in catalog.films:
+            previous = current.get(film.judul)
+            film_manager.tambah(previous if previous == film else film)
+        self._film_data = (catalog, film_manager)
+        return self._film_data
+
+    def _start_config_watcher(self) -> None:
+        """
+        Memantau file konfigurasi setiap CONFIG_RELOAD_INTERVAL detik
+        (0 menonaktifkan hot reload) (metode private)
+        """
+        interval = float(get_env("CONFIG_RELOAD_INTERVAL", "2"))
+        if interval > 0:
+            self._config.start_watching(interval)
+
+    def _attach_shared_store(self) -> None:
+        """
+        Memakai inventaris kursi di shared memory jika SEAT_SHM_NAME diset
+        oleh run_api_server untuk mode multi-worker. Hold disimpan di
+        RESERVATION_DB agar terlihat oleh semua worker (metode private)
+        """
+        shm_name = get_env("SEAT_SHM_NAME")
+        if not shm_name:
+            return
+        state_db = get_env("RESERVATION_DB")
+        if not state_db:
+            raise RuntimeError("Mode multi-worker membutuhkan RESERVATION_DB untuk hold dan reservasi bersama")
+        self._seat_manager.attach_shared_store(SharedSeatStore.attach(shm_name))
+        self._seat_manager.attach_hold_store(HoldStore(state_db))
+
+    def _attach_journal(self) -> None:
+        """
+        Mengaktifkan journal kursi jika JOURNAL_DIR diset, lalu memulihkan
+        state kursi dari snapshot dan log terakhir (metode private).
+        Dengan inventaris shared memory setiap worker menulis ke subfolder
+        journal sendiri; state sudah dipulihkan proses induk lewat
+        SeatManager.restore_journals sebelum worker dimulai.
+        """
+        journal_dir = get_env("JOURNAL_DIR")
+        if not journal_dir:
+            return
+
+        snapshot_every = int(get_env("JOURNAL_SNAPSHOT_EVERY", "10000"))
+        if self._seat_manager.shared_store is not None:
+            journal = SeatJournal(worker_directory(journal_dir, os.getpid()), snapshot_every)
+            self._seat_manager.attach_journal(journal, recover=False)
+            return
+        self._seat_manager.attach_journal(SeatJournal(journal_dir, snapshot_every))
+
+    def _resolve_show(self, theater_name: Optional[str], film_title: Optional[str],
+                      showtime: Optional[str], show_date: Optional[str]) -> Dict[str, Any]:
+        """
+        Memvalidasi kombinasi teater, film, jam tayang, dan tanggal untuk
+        pengecekan kursi (metode private)
+
+        Returns:
+            Dict berisi nama teater dan argumen pertunjukan (judul, jam, tanggal)
+        """
+        film = None
+        if film_title:
+            film = self._catalog.get(film_title)
+            if not film:
+                return {"success": False, "message": f"Film '{film_title}' tidak ditemukan"}
+
+        # Tentukan teater berdasarkan film jika tidak ada nama teater yang diberikan
+        if not theater_name and film:
+            theater_name = film.teater
+
+        if not theater_name:
+            return {"success": False, "message": "Diperlukan nama teater atau judul film"}
+
+        if not self._seat_manager.has_teater(theater_name):
+            return {"success": False, "message": f"Teater '{theater_name}' tidak ditemukan"}
+
+        if showtime is not None:
+            if not film:
+                return {"success": False, "message": "Diperlukan judul film untuk memeriksa jam tayang"}
+            if film.teater != theater_name:
+                return {"success": False, "message": f"Film '{film.judul}' tidak diputar di '{theater_name}'"}
+            if not self._catalog.has_showtime(film.judul, showtime):
+                return {"success": False, "message": f"Jadwal '{showtime}' tidak tersedia"}
+
+        if not self._validator.is_valid_show_date(show_date):
+            return {"success": False, "message": f"Tanggal '{show_date}' tidak valid"}
+
+        return {
+            "success": True,
+            "teater": theater_name,
+            "show_args": (film.judul if film else None, showtime, show_date)
+        }
+
+    def _record_reservation(self, reservation: Dict[str, Any]) -> None:
+        """
+        Mendaftarkan reservasi ke indeks dan penyimpanan riwayat jika aktif.
+        Dalam mode multi-worker reservasi hanya disimpan di database bersama,
+        tanpa indeks per proses yang bisa basi (metode private)
+        """
+        if not self._shared_state:
+            entry = self._index_entry(reservation)
+            with self._reservation_lock:
+                self._index_locked(entry)
+        if self._reservation_store is not None:
+            self._reservation_store.save(reservation)
+
+    def _on_shows_purged(self, now) -> None:
+        """
+        Dipanggil SeatManager setelah pembersihan (metode private). Hanya
+        mencatat waktunya; indeks dibersihkan di bawah lock reservasi pada
+        pendaftaran berikutnya agar tidak bertabrakan dengan lock SeatManager
+        """
+        self._purged_at = now
+
+    def _index_locked(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Memasukkan entri ke indeks; dipanggil di bawah _reservation_lock (metode private)"""
+        purged_at, self._purged_at = self._purged_at, None
+        if purged_at is not None:
+            for show_key in [key for key in self._reservations_by_show
+                             if (end := self._seat_manager.get_show_end(key)) is not None and end <= purged_at]:
+                for reservation_id in self._reservations_by_show.pop(show_key):
+                    self._reservations.pop(reservation_id, None)
+
+        reservation_id = entry["reservation"]["reservation_id"]
+        entry = self._reservations.setdefault(reservation_id, entry)
+        self._reservations_by_show.setdefault(entry["show_key"], set()).add(reservation_id)
+        return entry
+
+    def _index_entry(self, reservation: Dict[str, Any]) -> Dict[str, Any]:
+        """Membentuk entri indeks reservasi (metode private)"""
+        film_title = self._validator.get_film_title(reservation["film"]) or reservation["film"]
+        show_key = self._seat_manager.make_show_key(
+            reservation["teater"], film_title, reservation["jadwal"], reservation["tanggal"]
+        )
+        data = {key: value for key, value in reservation.items() if key != "success"}
+        return {
+            "show_key": show_key,
+            "indices": [self._seat_manager.get_seat_index(seat, reservation["teater"]) for seat in reservation["kursi"]],
+            "reservation": data
+        }
+
+    def _normalize_seats(self, teater: str, seats: List[str]) -> Dict[str, Any]:
+        """
+        Mengubah nama kursi ke bentuk baku layout teater ("c5" -> "C5") dan
+        menolak kursi tidak dikenal atau ganda sebelum harga dihitung (metode private)
+        """
+        indices = []
+        for seat in seats:
+            index = self._seat_manager.get_seat_index(seat, teater)
+            if index == -1:
+                return {"success": False, "message": f"Format kursi '{seat}' tidak valid"}
+            if index in indices:
+                return {"success": False, "message": f"Kursi '{seat}' dipilih lebih dari sekali"}
+            indices.append(index)
+        return {"success": True, "kursi": [self._seat_manager.get_seat_name(index, teater) for index in indices]}
+
+    def _total_price(self, film_title: str, showtime: str, is_holiday: bool, is_member: bool,
+                     ticket_count: int) -> int:
+        """Total harga dari tabel harga tanpa menyusun rincian diskon (metode private)"""
+        return self._calculator.get_ticket_price(film_title, showtime, is_holiday, is_member) * ticket_count
+
+    def _lookup_reservation(self, reservation_id: str) -> Optional[Dict[str, Any]]:
+        """Mencari reservasi di indeks, lalu di penyimpanan riwayat (metode private)"""
+        if self._shared_state:
+            stored = self._reservation_store.get(reservation_id)
+            return self._index_entry(stored) if stored is not None else None
+
+        entry = self._reservations.get(reservation_id)
+        if entry is None and self._reservation_store is not None:
+            stored = self._reservation_store.get(reservation_id)
+            if stored is not None:
+                entry = self._cache_stored(stored)
+        return entry
+
+    def _cache_stored(self, stored: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Memasukkan reservasi dari penyimpanan ke indeks, kecuali pertunjukannya
+        sudah selesai sehingga indeks tidak tumbuh oleh riwayat lama (metode private)
+        """
+        entry = self._index_entry(stored)
+        end = self._seat_manager.get_show_end(entry["show_key"])
+        if end is not None and end <= datetime.now():
+            return entry
+        with self._reservation_lock:
+            return self._index_locked(entry)
+
+    def _seat_owners_locked(self, show_key: tuple, indices: List[int]) -> Dict[str, List[int]]:
+        """Reservasi aktif pemilik kursi pada satu pertunjukan: ID -> nomor kursi (metode private)"""
+        wanted = set(indices)
+        owners = {}
+        for reservation_id in self._reservations_by_show.get(show_key, ()):
+            entry = self._reservations[reservation_id]
+            if entry["reservation"]["status"] == "cancelled":
+                continue
+            owned = [index for index in entry["indices"] if index in wanted]
+            if owned:
+                owners[reservation_id] = owned
+        return owners
 
     # ===================== OPERASI PUBLIK TERPADU (UNIFIED PUBLIC API) =====================
 
-    def get_films(self, genre: Optional[str] = None) -> List[Film]:
+    def get_films(self, genre: Optional[str] = None, sort_by: Optional[str] = None) -> List[Film]:
         """
         Mendapatkan daftar film, dengan filter opsional berdasarkan genre.
 
         Args:
             genre: Opsional. Filter berdasarkan genre.
+            sort_by: Opsional. "judul", "harga", atau "teater"; diambil dari
+                indeks terurut katalog tanpa mengurutkan ulang.
 
         Returns:
             Daftar film, difilter jika genre ditentukan.
         """
-        films = self._film_manager.ambil_semua()
+        # Pasangan dibaca sekali; reload di thread lain tidak mengubah pasangan ini
+        catalog, film_manager = self._film_data
+        if catalog is not self._catalog:
+            catalog, film_manager = self._load_film_data()
+        films = film_manager.ambil_semua()
 
         if genre:
-            # Filter berdasarkan genre jika ditentukan
-            return [f for f in films if genre.lower() in f.genre.lower()]
+            # Filter berdasarkan genre lewat inverted index katalog
+            matched = catalog.genre_indices(genre)
+            if sort_by:
+                matched_set = set(matched)
+                matched = [i for i in catalog.sorted_indices(sort_by) if i in matched_set]
+            return [films[i] for i in matched]
 
+        if sort_by:
+            return [films[i] for i in catalog.sorted_indices(sort_by)]
         return films
 
+    def search_films(self, query: str, limit: int = 10) -> Dict[str, Any]:
+        """
+        Mencari film berdasarkan judul (toleran salah ketik) atau genre.
+
+        Args:
+            query: Kata kunci pencarian
+            limit: Jumlah hasil maksimum
+
+        Returns:
+            Dict berisi daftar hasil {"film", "score"} terurut dari skor tertinggi
+        """
+        if not query or not query.strip():
+            return {"success": False, "message": "Kata kunci pencarian tidak boleh kosong"}
+        if limit < 1:
+            return {"success": False, "message": "Limit harus lebih dari 0"}
+
+        results = self._catalog.search(query, limit)
+        return {
+            "success": True,
+            "results": [{"film": film, "score": score} for film, score in results]
+        }
+
+    def get_films_page(self, genre: Optional[str] = None, sort_by: str = CATALOG_ORDER,
+                       cursor: Optional[str] = None, limit: Optional[int] = None,
+                       fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Mendapatkan satu halaman daftar film dengan paginasi cursor.
+
+        Cursor menyimpan kunci urutan film terakhir (bukan nomor halaman),
+        sehingga untuk urutan judul, harga, dan teater halaman berikutnya tetap
+        konsisten walaupun katalog dimuat ulang.
+
+        Args:
+            genre: Opsional. Filter berdasarkan genre.
+            sort_by: "katalog" (urutan konfigurasi), "judul", "harga", atau "teater".
+            cursor: Opsional. Nilai next_cursor dari halaman sebelumnya.
+            limit: Opsional. Jumlah film maksimum per halaman (tanpa batas jika None).
+            fields: Opsional. Hanya field ini yang dikembalikan untuk setiap film.
+
+        Returns:
+            Dict berisi daftar film (dict) dan next_cursor (None jika halaman terakhir)
+        """
+        catalog = self._catalog
+        if not catalog.has_order(sort_by):
+            return {"success": False, "message": f"Urutan '{sort_by}' tidak dikenal"}
+        if limit is not None and limit < 1:
+            return {"success": False, "message": "Limit harus lebih dari 0"}
+        fields = list(fields) if fields else list(Film.__annotations__)
+        unknown = [field for field in fields if field not in Film.__annotations__]
+        if unknown:
+            return {"success": False, "message": f"Field tidak dikenal: {', '.join(unknown)}"}
+
+        position = 0
+        if cursor:
+            try:
+                cursor_sort, after_key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+                if cursor_sort != sort_by:
+                    raise ValueError(cursor_sort)
+                position = catalog.sort_position(sort_by, tuple(after_key))
+            except (ValueError, TypeError):
+                return {"success": False, "message": "Cursor tidak valid"}
+
+        matched = set(catalog.genre_indices(genre)) if genre else None
+        films = catalog.films
+        indices = catalog.sorted_indices(sort_by)
+        page: List[Film] = []
+        has_more = False
+        for position in range(position, len(indices)):
+            if matched is not None and indices[position] not in matched:
+                continue
+            film = films[indices[position]]
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append(film)
+
+        next_cursor = None
+        if has_more:
+            last_key = list(catalog.sort_key(sort_by, page[-1]))
+            next_cursor = base64.urlsafe_b64encode(
+                json.dumps([sort_by, last_key]).encode("utf-8")
+            ).decode("ascii")
+
+        return {
+            "success": True,
+            "films": [{field: getattr(film, field) for field in fields} for film in page],
+            "next_cursor": next_cursor
+        }
+
+    def get_catalog_version(self) -> Dict[str, Any]:
+        """
+        Mendapatkan versi katalog film yang sedang berlaku untuk caching HTTP.
+
+        Returns:
+            Dict berisi "etag" (hash isi katalog) dan "last_modified"
+            (waktu modifikasi file konfigurasi dalam detik epoch, atau None)
+        """
+        snapshot = self._config.snapshot
+        stamp = snapshot.stamp
+        return {
+            "etag": snapshot.film_catalog.version,
+            "last_modified": stamp[0] // 1_000_000_000 if stamp is not None else None
+        }
+
     def get_film_detail(self, title: str) -> Dict[str, Any]:
         """
         Mendapatkan detail film termasuk jadwal, teater, dan harga dasar.
@@ -73,10 +440,14 @@ class AutoTicketFacade:
         Returns:
             Dict berisi detail film atau None jika tidak ditemukan
         """
-        film = next((f for f in self._film_manager.ambil_semua() if f.judul.lower() == title.lower()), None)
+        film = self._catalog.get(title)
 
         if not film:
-            return {"success": False, "message": f"Film '{title}' tidak ditemukan"}
+            message = f"Film '{title}' tidak ditemukan"
+            suggestions = self._catalog.search(title, limit=1)
+            if suggestions:
+                message += f". Mungkin maksud Anda '{suggestions[0][0].judul}'?"
+            return {"success": False, "message": message}
 
         base_price = self._calculator.get_base_price(film.judul)
 
@@ -88,36 +459,40 @@ class AutoTicketFacade:
             "harga_dasar": base_price
         }
 
-    def check_seats(self, theater_name: Optional[str] = None, film_title: Optional[str] = None) -> Dict[str, Any]:
+    def check_seats(self, theater_name: Optional[str] = None, film_title: Optional[str] = None,
+                    showtime: Optional[str] = None, show_date: Optional[str] = None) -> Dict[str, Any]:
         """
         Memeriksa ketersediaan kursi di teater tertentu atau teater untuk film tertentu.
+        Jika film dan jam tayang diberikan, yang diperiksa adalah inventaris
+        pertunjukan tersebut (pada tanggal show_date, default hari ini).
+        Tanpa jam tayang, inventaris semua pertunjukan teater (atau film)
+        pada tanggal tersebut digabungkan: total per pertunjukan, dan contoh
+        kursi yang masih tersedia di semua pertunjukan.
 
         Args:
             theater_name: Nama teater (opsional jika film_title diberikan)
             film_title: Judul film (opsional jika theater_name diberikan)
+            showtime: Jam tayang (opsional)
+            show_date: Tanggal pertunjukan YYYY-MM-DD (opsional)
 
         Returns:
             Informasi ketersediaan kursi
         """
-        # Tentukan teater berdasarkan film jika tidak ada nama teater yang diberikan
-        if not theater_name and film_title:
-            film = next((f for f in self._film_manager.ambil_semua() if f.judul.lower() == film_title.lower()), None)
-            if not film:
-                return {"success": False, "message": f"Film '{film_title}' tidak ditemukan"}
-            theater_name = film.teater
+        show = self._resolve_show(theater_name, film_title, showtime, show_date)
+        if not show["success"]:
+            return show
+        theater_name, show_args = show["teater"], show["show_args"]
 
-        if not theater_name:
-            return {"success": False, "message": "Diperlukan nama teater atau judul film"}
+        if showtime is None:
+            return self._check_theater_seats(theater_name, show_args[0], show_date)
 
-        if theater_name not in self._seat_manager.seat_status:
-            return {"success": False, "message": f"Teater '{theater_name}' tidak ditemukan"}
-        total = self._seat_manager.get_total_available_seats(theater_name)
+        total = self._seat_manager.get_total_available_seats(theater_name, *show_args)
 
         if total <= 0:
             return {"success": False, "message": "Tidak ada kursi tersedia"}
 
-        seats = self._seat_manager.get_available_seats(theater_name)
-        seat_names = [self._seat_manager.get_seat_name(i) for i in seats[:10]]
+        seats = self._seat_manager.get_available_seats(theater_name, *show_args, limit=10)
+        seat_names = [self._seat_manager.get_seat_name(i, theater_name) for i in seats]
 
         return {
             "success": True,
@@ -126,6 +501,91 @@ class AutoTicketFacade:
             "contoh_kursi": seat_names
         }
 
+    def _check_theater_seats(self, theater_name: str, film_title: Optional[str],
+                             show_date: Optional[str]) -> Dict[str, Any]:
+        """Ketersediaan kursi gabungan semua pertunjukan teater pada satu tanggal (metode private)"""
+        films = [self._catalog.get(film_title)] if film_title else self._catalog.by_teater(theater_name)
+        shows = [(film.judul, jam) for film in films for jam in film.jadwal]
+        if not shows:
+            return {"success": False, "message": f"Tidak ada pertunjukan di '{theater_name}'"}
+
+        totals, common = self._seat_manager.get_theater_availability(theater_name, shows, show_date)
+        if not any(totals):
+            return {"success": False, "message": "Tidak ada kursi tersedia"}
+
+        return {
+            "success": True,
+            "teater": theater_name,
+            "tanggal": self._seat_manager.make_show_key(theater_name, *shows[0], show_date)[3],
+            "total": sum(totals),
+            "pertunjukan": [
+                {"film": judul, "jadwal": jam, "total": total}
+                for (judul, jam), total in zip(shows, totals)
+            ],
+            "contoh_kursi": [self._seat_manager.get_seat_name(i, theater_name) for i in common.free_indices(10)]
+        }
+
+    def get_seat_map(self, theater_name: Optional[str] = None, film_title: Optional[str] = None,
+                     showtime: Optional[str] = None, show_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Mendapatkan peta kursi lengkap satu pertunjukan dalam bentuk
+        ringkas: bitmap (bit 1 = tersedia) dan deretan kursi kosong.
+
+        Args:
+            theater_name: Nama teater (opsional jika film_title diberikan)
+            film_title: Judul film
+            showtime: Jam tayang
+            show_date: Tanggal pertunjukan YYYY-MM-DD (opsional)
+
+        Returns:
+            Dict berisi jumlah kursi, layout teater, versi peta, jumlah kursi
+            tersedia, bitmap (bytes), dan deretan kursi kosong [(awal, panjang), ...]
+        """
+        show = self._resolve_show(theater_name, film_title, showtime, show_date)
+        if not show["success"]:
+            return show
+        if showtime is None:
+            return {"success": False, "message": "Diperlukan judul film dan jam tayang untuk peta kursi"}
+
+        seat_map = self._seat_manager.get_seat_map(show["teater"], *show["show_args"])
+        layout = self._seat_manager.layout_for(show["teater"])
+        return {
+            "success": True,
+            "teater": show["teater"],
+            "jumlah_kursi": seat_map.size,
+            "kursi_per_baris": layout.kursi_per_baris,
+            "layout": layout.to_dict(),
+            "versi": seat_map.version,
+            "total": seat_map.free_count,
+            "bitmap": seat_map.to_bytes(),
+            "deretan_kosong": seat_map.free_runs()
+        }
+
+    def stream_seats(self, theater_name: Optional[str] = None, film_title: Optional[str] = None,
+                     showtime: Optional[str] = None, show_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Berlangganan perubahan kursi satu pertunjukan.
+        Harus dipanggil dari dalam event loop asyncio.
+
+        Returns:
+            Dict berisi "events": async generator yang menghasilkan snapshot
+            awal lalu delta kursi yang digabung per interval SEAT_STREAM_INTERVAL
+        """
+        show = self._resolve_show(theater_name, film_title, showtime, show_date)
+        if not show["success"]:
+            return show
+        if showtime is None:
+            return {"success": False, "message": "Diperlukan judul film dan jam tayang untuk siaran kursi"}
+
+        if self._seat_stream is None:
+            interval = float(get_env("SEAT_STREAM_INTERVAL", "0.25"))
+            self._seat_stream = SeatStreamHub(self._seat_manager, interval)
+        return {
+            "success": True,
+            "teater": show["teater"],
+            "events": self._seat_stream.subscribe(show["teater"], *show["show_args"])
+        }
+
     def calculate_ticket_price(self, film_title: str, showtime: str,
                                is_holiday: bool = False, is_member: bool = False,
                                ticket_count: int = 1) -> Dict[str, Any]:
@@ -143,20 +603,20 @@ class AutoTicketFacade:
             Informasi harga tiket
         """
         # Validasi film dan jadwal
-        film = next((f for f in self._film_manager.ambil_semua() if f.judul.lower() == film_title.lower()), None)
+        film = self._catalog.get(film_title)
 
         if not film:
             return {"success": False, "message": f"Film '{film_title}' tidak ditemukan"}
 
-        if showtime not in film.jadwal:
+        if not self._catalog.has_showtime(film_title, showtime):
             return {"success": False, "message": f"Jadwal '{showtime}' tidak tersedia"}
 
         # Gunakan subsistem kalkulator untuk menghitung harga
-        price_info = self._calculator.get_price(film_title, showtime, is_holiday, is_member, ticket_count)
+        price_info = self._calculator.get_price(film.judul, showtime, is_holiday, is_member, ticket_count)
 
         return {
             "success": True,
-            "film": film_title,
+            "film": film.judul,
             "harga_dasar": price_info.get("harga_dasar", 0),
             "diskon": {
                 "waktu": price_info.get("diskon_waktu", {}).get("nominal", 0),
@@ -170,9 +630,75 @@ class AutoTicketFacade:
             "total": price_info.get("total_harga", 0)
         }
 
+    def calculate_ticket_prices_batch(self, film_titles: List[str], showtimes: List[str],
+                                      is_holiday: Optional[List[bool]] = None,
+                                      is_member: Optional[List[bool]] = None,
+                                      ticket_counts: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Menghitung harga untuk banyak kombinasi film dan jam tayang sekaligus.
+        Hasil dikembalikan per kolom; kombinasi yang tidak valid ditandai
+        pada kolom "valid" dengan harga 0.
+
+        Args:
+            film_titles: Judul film per kombinasi
+            showtimes: Jam tayang per kombinasi
+            is_holiday: Status hari libur per kombinasi (default semua False)
+            is_member: Status member per kombinasi (default semua False)
+            ticket_counts: Jumlah tiket per kombinasi (default semua 1)
+
+        Returns:
+            Kolom-kolom harga sepanjang jumlah kombinasi
+        """
+        count = len(film_titles)
+        is_holiday = is_holiday if is_holiday is not None else [False] * count
+        is_member = is_member if is_member is not None else [False] * count
+        ticket_counts = ticket_counts if ticket_counts is not None else [1] * count
+
+        if any(len(column) != count for column in (showtimes, is_holiday, is_member, ticket_counts)):
+            return {"success": False, "message": "Panjang semua kolom harus sama"}
+
+        # Validasi film dan jadwal; judul dikanonisasi sekali per judul unik
+        catalog = self._catalog
+        titles: Dict[str, Optional[str]] = {}
+        for title in set(film_titles):
+            film = catalog.get(title)
+            titles[title] = film.judul if film else None
+
+        canonical = [titles[title] for title in film_titles]
+        valid = [
+            judul is not None and jumlah > 0 and catalog.has_showtime(judul, jam)
+            for judul, jam, jumlah in zip(canonical, showtimes, ticket_counts)
+        ]
+
+        rows = [i for i, ok in enumerate(valid) if ok]
+        prices = self._calculator.get_prices_batch(
+            [canonical[i] for i in rows], [showtimes[i] for i in rows],
+            [is_holiday[i] for i in rows], [is_member[i] for i in rows],
+            [ticket_counts[i] for i in rows]
+        )
+
+        result: Dict[str, Any] = {
+            "success": True,
+            "jumlah": count,
+            "film": [judul or title for judul, title in zip(canonical, film_titles)],
+            "jadwal": list(showtimes),
+            "valid": valid,
+            "biaya_admin": self._calculator.biaya_admin
+        }
+        for column, values in prices.items():
+            if len(rows) == count:
+                result[column] = values
+            else:
+                # Sebar kembali hasil kombinasi valid ke posisi aslinya
+                full = [0] * count
+                for i, value in zip(rows, values):
+                    full[i] = value
+                result[column] = full
+        return result
+
     def book_tickets(self, film_title: str, showtime: str, ticket_count: int,
                     is_holiday: bool = False, is_member: bool = False,
-                    seat_preference: str = "berurutan") -> Dict[str, Any]:
+                    seat_preference: str = "berurutan", show_date: Optional[str] = None) -> Dict[str, Any]:
         """
         Operasi terpadu untuk memesan tiket film - menggabungkan berbagai subsistem.
         Menyembunyikan kompleksitas validasi, alokasi kursi, dan perhitungan harga.
@@ -183,20 +709,23 @@ class AutoTicketFacade:
             ticket_count: Jumlah tiket
             is_holiday: Apakah hari libur
             is_member: Apakah member
-            seat_preference: Preferensi kursi ("berurutan" atau "bebas")
+            seat_preference: Preferensi kursi ("berurutan", "bebas", atau "terbaik")
+            show_date: Tanggal pertunjukan YYYY-MM-DD (default hari ini)
 
         Returns:
             Hasil pemesanan tiket
         """
         # 1. Validasi parameter dasar
-        validation = self._validator.validate_ticket_request(film_title, showtime, ticket_count)
+        validation = self._validator.validate_ticket_request(film_title, showtime, ticket_count, show_date)
         if not validation["valid"]:
             return {"success": False, "message": validation["message"]}
 
         teater = validation["teater"]
+        show_args = (validation["film"], showtime, show_date)
+        tanggal = self._seat_manager.make_show_key(teater, *show_args)[3]
 
         # 2. Periksa ketersediaan kursi
-        available_seats = self._seat_manager.get_total_available_seats(teater)
+        available_seats = self._seat_manager.get_total_available_seats(teater, *show_args)
         if available_seats < ticket_count:
             return {
                 "success": False,
@@ -204,55 +733,542 @@ class AutoTicketFacade:
             }
 
         # 3. Alokasi kursi
+        # "terbaik" memilih blok kursi dengan skor layout tertinggi (tengah, jarak ideal dari layar)
         prefer_consecutive = (seat_preference.lower() == "berurutan")
-        seats = self._seat_manager.assign_seat(teater, ticket_count, prefer_consecutive)
+        best_available = (seat_preference.lower() == "terbaik")
+        try:
+            seats = self._seat_manager.assign_seat(teater, ticket_count, prefer_consecutive, *show_args,
+                                                   best_available=best_available)
+        except JournalError as error:
+            return {"success": False, "message": f"Pemesanan dibatalkan, gagal menyimpan journal kursi: {error}"}
 
         if not seats or len(seats) < ticket_count:
             return {"success": False, "message": "Gagal mengalokasikan kursi"}
 
-        # 4. Hitung harga tiket
-        price_result = self.calculate_ticket_price(
-            film_title, showtime, is_holiday, is_member, ticket_count
-        )
-
-        if not price_result["success"]:
-            # Kembalikan kursi jika ada masalah dengan harga
-            self._seat_manager.release_seat(teater, seats)
-            return price_result
+        # 4. Hitung harga tiket (film dan jadwal sudah divalidasi)
+        total_price = self._total_price(validation["film"], showtime, is_holiday, is_member, ticket_count)
 
         # 5. Hasilkan nomor reservasi unik
-        import secrets
-        reservation_id = f"RES-{secrets.randbelow(9000) + 1000}"
+        reservation_id = self._id_generator.next_id()
 
         # 6. Menggabungkan semua informasi untuk hasil akhir
-        return {
+        reservation = {
             "success": True,
             "reservation_id": reservation_id,
-            "film": film_title,
+            "film": validation["film"],
             "teater": teater,
             "jadwal": showtime,
+            "tanggal": tanggal,
             "kursi": seats,
             "jumlah_tiket": ticket_count,
             "is_holiday": is_holiday,
             "is_member": is_member,
-            "harga": price_result["total"],
+            "harga": total_price,
+            "status": "confirmed"
+        }
+        self._record_reservation(reservation)
+        return reservation
+
+    def book_tickets_batch(self, bookings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Memesan banyak tiket sekaligus (pesanan grup) dengan semantik
+        all-or-nothing. Seluruh pesanan divalidasi di muka, kursi semua
+        pertunjukan dialokasikan dalam satu critical section, dan harga
+        dihitung dalam satu kali proses batch.
+
+        Args:
+            bookings: Daftar pesanan; setiap pesanan berisi film_title,
+                showtime, ticket_count, dan opsional is_holiday, is_member,
+                seat_preference, show_date
+
+        Returns:
+            Daftar reservasi dan total harga seluruh pesanan
+        """
+        if not bookings:
+            return {"success": False, "message": "Daftar pesanan kosong"}
+
+        # 1. Validasi seluruh pesanan sebelum ada kursi yang disentuh
+        requests = []
+        for nomor, booking in enumerate(bookings, start=1):
+            validation = self._validator.validate_ticket_request(
+                booking["film_title"], booking["showtime"], booking["ticket_count"], booking.get("show_date")
+            )
+            if not validation["valid"]:
+                return {"success": False, "message": f"Pesanan ke-{nomor}: {validation['message']}"}
+
+            show_key = self._seat_manager.make_show_key(
+                validation["teater"], validation["film"], booking["showtime"], booking.get("show_date")
+            )
+            seat_preference = booking.get("seat_preference", "berurutan").lower()
+            requests.append((show_key, booking["ticket_count"], seat_preference == "berurutan",
+                             seat_preference == "terbaik"))
+
+        # 2. Hitung harga seluruh pesanan dalam satu proses
+        prices = self._calculator.get_prices_batch(
+            [show_key[1] for show_key, *_ in requests],
+            [show_key[2] for show_key, *_ in requests],
+            [booking.get("is_holiday", False) for booking in bookings],
+            [booking.get("is_member", False) for booking in bookings],
+            [jumlah for _, jumlah, *_ in requests]
+        )
+
+        # 3. Alokasi kursi seluruh pesanan secara atomik
+        try:
+            allocations = self._seat_manager.assign_batch(requests)
+        except JournalError as error:
+            return {"success": False, "message": f"Pemesanan dibatalkan, gagal menyimpan journal kursi: {error}"}
+        if allocations is None:
+            return {"success": False, "message": "Kursi tidak cukup untuk seluruh pesanan"}
+
+        # 4. Susun dan daftarkan reservasi
+        reservations = []
+        for booking, (show_key, jumlah, *_), seats, harga in zip(bookings, requests, allocations, prices["total_harga"]):
+            reservation = {
+                "success": True,
+                "reservation_id": self._id_generator.next_id(),
+                "film": show_key[1],
+                "teater": show_key[0],
+                "jadwal": show_key[2],
+                "tanggal": show_key[3],
+                "kursi": seats,
+                "jumlah_tiket": jumlah,
+                "is_holiday": booking.get("is_holiday", False),
+                "is_member": booking.get("is_member", False),
+                "harga": harga,
+                "status": "confirmed"
+            }
+            self._record_reservation(reservation)
+            reservations.append(reservation)
+
+        return {
+            "success": True,
+            "reservations": reservations,
+            "total": sum(prices["total_harga"])
+        }
+
+    def reserve_seats(self, film_title: str, showtime: str, seats: List[str],
+                      is_holiday: bool = False, is_member: bool = False,
+                      show_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Memesan kursi spesifik untuk satu pertunjukan. Pengecekan dan
+        penandaan kursi dilakukan atomik oleh SeatManager, sehingga dua
+        permintaan bersamaan tidak bisa mendapatkan kursi yang sama.
+
+        Args:
+            film_title: Judul film
+            showtime: Jam tayang
+            seats: Daftar nama kursi (misal ["A1", "A2"])
+            is_holiday: Apakah hari libur
+            is_member: Apakah member
+            show_date: Tanggal pertunjukan YYYY-MM-DD (default hari ini)
+
+        Returns:
+            Hasil pemesanan tiket
+        """
+        # 1. Validasi parameter dasar
+        validation = self._validator.validate_ticket_request(film_title, showtime, len(seats), show_date)
+        if not validation["valid"]:
+            return {"success": False, "message": validation["message"]}
+
+        teater = validation["teater"]
+        show_args = (validation["film"], showtime, show_date)
+        tanggal = self._seat_manager.make_show_key(teater, *show_args)[3]
+
+        normalized = self._normalize_seats(teater, seats)
+        if not normalized["success"]:
+            return normalized
+        seats = normalized["kursi"]
+
+        # 2. Hitung harga sebelum kursi dikunci
+        total_price = self._total_price(validation["film"], showtime, is_holiday, is_member, len(seats))
+
+        # 3. Cek dan tandai kursi secara atomik
+        try:
+            unavailable = self._seat_manager.reserve_seats(teater, seats, *show_args)
+        except JournalError as error:
+            return {"success": False, "message": f"Pemesanan dibatalkan, gagal menyimpan journal kursi: {error}"}
+        if unavailable:
+            return {"success": False, "message": f"Kursi '{unavailable[0]}' tidak tersedia"}
+
+        # 4. Hasilkan nomor reservasi unik
+        reservation_id = self._id_generator.next_id()
+
+        reservation = {
+            "success": True,
+            "reservation_id": reservation_id,
+            "film": validation["film"],
+            "teater": teater,
+            "jadwal": showtime,
+            "tanggal": tanggal,
+            "kursi": list(seats),
+            "jumlah_tiket": len(seats),
+            "is_holiday": is_holiday,
+            "is_member": is_member,
+            "harga": total_price,
             "status": "confirmed"
         }
+        self._record_reservation(reservation)
+        return reservation
 
-    def cancel_booking(self, teater: str, seats: List[str]) -> Dict[str, Any]:
+    def hold_tickets(self, film_title: str, showtime: str, ticket_count: int,
+                     seat_preference: str = "berurutan", seats: Optional[List[str]] = None,
+                     show_date: Optional[str] = None) -> Dict[str, Any]:
         """
-        Membatalkan pemesanan dengan membebaskan kursi.
+        Menahan kursi sementara selama proses checkout. Kursi kembali ke
+        inventaris jika hold tidak dikonfirmasi sebelum kedaluwarsa.
+
+        Args:
+            film_title: Judul film
+            showtime: Jam tayang
+            ticket_count: Jumlah tiket (diabaikan jika seats diberikan)
+            seat_preference: Preferensi kursi ("berurutan", "bebas", atau "terbaik")
+            seats: Daftar kursi spesifik (opsional)
+            show_date: Tanggal pertunjukan YYYY-MM-DD (default hari ini)
+
+        Returns:
+            Informasi hold (hold_id, kursi, waktu kedaluwarsa)
+        """
+        if seats is not None:
+            ticket_count = len(seats)
+
+        validation = self._validator.validate_ticket_request(film_title, showtime, ticket_count, show_date)
+        if not validation["valid"]:
+            return {"success": False, "message": validation["message"]}
+
+        teater = validation["teater"]
+        if seats is not None:
+            normalized = self._normalize_seats(teater, seats)
+            if not normalized["success"]:
+                return normalized
+            seats = normalized["kursi"]
+
+        prefer_consecutive = (seat_preference.lower() == "berurutan")
+        hold = self._seat_manager.hold_seats(
+            teater, ticket_count, prefer_consecutive,
+            validation["film"], showtime, show_date, seat_names=seats,
+            best_available=(seat_preference.lower() == "terbaik")
+        )
+        if not hold:
+            return {"success": False, "message": "Kursi tidak tersedia untuk ditahan"}
+
+        return {
+            "success": True,
+            "hold_id": hold["hold_id"],
+            "film": validation["film"],
+            "teater": teater,
+            "jadwal": showtime,
+            "tanggal": hold["show_key"][3],
+            "kursi": hold["kursi"],
+            "expires_at": hold["expires_at"]
+        }
+
+    def confirm_hold(self, hold_id: str, is_holiday: bool = False, is_member: bool = False) -> Dict[str, Any]:
+        """
+        Mengonfirmasi hold menjadi pemesanan tetap dan menghitung harganya.
+
+        Args:
+            hold_id: ID hold dari hold_tickets
+            is_holiday: Apakah hari libur
+            is_member: Apakah member
+
+        Returns:
+            Hasil pemesanan tiket
+        """
+        hold = self._seat_manager.get_hold(hold_id)
+        if not hold:
+            return {"success": False, "message": f"Hold '{hold_id}' tidak ditemukan atau sudah kedaluwarsa"}
+
+        teater, film_title, showtime, tanggal = hold["show_key"]
+        if not self._catalog.has_showtime(film_title, showtime):
+            return {"success": False, "message": f"Jadwal '{showtime}' tidak tersedia"}
+        total_price = self._total_price(film_title, showtime, is_holiday, is_member, len(hold["kursi"]))
+
+        try:
+            confirmed = self._seat_manager.confirm_hold(hold_id)
+        except JournalError as error:
+            return {"success": False, "message": f"Konfirmasi dibatalkan, gagal menyimpan journal kursi: {error}"}
+        if not confirmed:
+            return {"success": False, "message": f"Hold '{hold_id}' tidak ditemukan atau sudah kedaluwarsa"}
+
+        reservation_id = self._id_generator.next_id()
+
+        reservation = {
+            "success": True,
+            "reservation_id": reservation_id,
+            "film": film_title,
+            "teater": teater,
+            "jadwal": showtime,
+            "tanggal": tanggal,
+            "kursi": hold["kursi"],
+            "jumlah_tiket": len(hold["kursi"]),
+            "is_holiday": is_holiday,
+            "is_member": is_member,
+            "harga": total_price,
+            "status": "confirmed"
+        }
+        self._record_reservation(reservation)
+        return reservation
+
+    def release_hold(self, hold_id: str) -> Dict[str, Any]:
+        """
+        Membatalkan hold dan mengembalikan kursinya ke inventaris.
+
+        Args:
+            hold_id: ID hold dari hold_tickets
+
+        Returns:
+            Status operasi
+        """
+        if self._seat_manager.release_hold(hold_id):
+            return {"success": True, "message": "Hold berhasil dibatalkan"}
+        return {"success": False, "message": f"Hold '{hold_id}' tidak ditemukan atau sudah kedaluwarsa"}
+
+    def list_reservations(self, film_title: Optional[str] = None, showtime: Optional[str] = None,
+                          show_date: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """
+        Mengambil riwayat reservasi yang tersimpan.
+
+        Args:
+            film_title: Filter judul film (opsional)
+            showtime: Filter jam tayang (opsional)
+            show_date: Filter tanggal pertunjukan YYYY-MM-DD (opsional)
+            limit: Jumlah maksimal reservasi
+
+        Returns:
+            Daftar reservasi, terbaru lebih dulu
+        """
+        if self._reservation_store is None:
+            return {"success": False, "message": "Penyimpanan reservasi tidak aktif"}
+
+        if film_title:
+            film = self._catalog.get(film_title)
+            if not film:
+                return {"success": False, "message": f"Film '{film_title}' tidak ditemukan"}
+            film_title = film.judul
+
+        reservations = self._reservation_store.find(film_title, show_date, showtime, limit)
+        return {"success": True, "reservations": reservations}
+
+    def get_reservation(self, reservation_id: str) -> Dict[str, Any]:
+        """
+        Mengambil reservasi berdasarkan ID.
+
+        Args:
+            reservation_id: ID reservasi
+
+        Returns:
+            Data reservasi
+        """
+        entry = self._lookup_reservation(reservation_id)
+        if entry is None:
+            return {"success": False, "message": f"Reservasi '{reservation_id}' tidak ditemukan"}
+        return {"success": True, "reservation": dict(entry["reservation"])}
+
+    def cancel_reservation(self, reservation_id: str) -> Dict[str, Any]:
+        """
+        Membatalkan reservasi berdasarkan ID. Kursi dibebaskan memakai nomor
+        kursi yang tersimpan di indeks reservasi.
+
+        Args:
+            reservation_id: ID reservasi
+
+        Returns:
+            Status operasi
+        """
+        entry = self._lookup_reservation(reservation_id)
+        if entry is None:
+            return {"success": False, "message": f"Reservasi '{reservation_id}' tidak ditemukan"}
+
+        if self._shared_state:
+            # Klaim pembatalan di database bersama; hanya satu worker yang berhasil
+            if self._reservation_store.cancel(reservation_id) is None:
+                return {"success": False, "message": f"Reservasi '{reservation_id}' sudah dibatalkan"}
+            self._seat_manager.release_indices(entry["show_key"], entry["indices"])
+            return {"success": True, "message": "Reservasi berhasil dibatalkan"}
+
+        with self._reservation_lock:
+            if entry["reservation"]["status"] == "cancelled":
+                return {"success": False, "message": f"Reservasi '{reservation_id}' sudah dibatalkan"}
+            entry["reservation"]["status"] = "cancelled"
+            indices = list(entry["indices"])
+
+        self._seat_manager.release_indices(entry["show_key"], indices)
+        if self._reservation_store is not None:
+            self._reservation_store.update_status(reservation_id, "cancelled")
+        return {"success": True, "message": "Reservasi berhasil dibatalkan"}
+
+    def cancel_booking(self, teater: str, seats: List[str], film_title: Optional[str] = None,
+                       showtime: Optional[str] = None, show_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Membatalkan pemesanan dengan membebaskan kursi. Setiap kursi harus
+        dimiliki reservasi aktif pertunjukan tersebut; reservasi yang semua
+        kursinya dibebaskan menjadi "cancelled", selebihnya "partially_released".
 
         Args:
             teater: Nama teater
             seats: Daftar kursi yang akan dibebaskan
+            film_title: Judul film pertunjukan (opsional)
+            showtime: Jam tayang pertunjukan (opsional)
+            show_date: Tanggal pertunjukan YYYY-MM-DD (opsional)
 
         Returns:
             Status operasi
         """
-        result = self._seat_manager.release_seat(teater, seats)
+        if not self._seat_manager.has_teater(teater):
+            return {"success": False, "message": f"Teater '{teater}' tidak ditemukan"}
+        normalized = self._normalize_seats(teater, seats)
+        if not normalized["success"]:
+            return normalized
+        if not normalized["kursi"]:
+            return {"success": False, "message": "Tidak ada kursi yang dibatalkan"}
 
-        if result:
-            return {"success": True, "message": "Reservasi berhasil dibatalkan"}
-        else:
-            return {"success": False, "message": "Gagal membatalkan reservasi"}
+        if film_title:
+            film_title = self._validator.get_film_title(film_title) or film_title
+        try:
+            show_key = self._seat_manager.make_show_key(teater, film_title, showtime, show_date)
+        except ValueError:
+            return {"success": False, "message": f"Tanggal '{show_date}' tidak valid"}
+        indices = [self._seat_manager.get_seat_index(seat, teater) for seat in normalized["kursi"]]
+
+        if self._shared_state:
+            return self._cancel_shared_booking(show_key, normalized["kursi"], indices)
+
+        with self._reservation_lock:
+            owners = self._seat_owners_locked(show_key, indices)
+        if self._reservation_store is not None and None not in show_key:
+            owned = {index for owned in owners.values() for index in owned}
+            missing = [seat for seat, index in zip(normalized["kursi"], indices) if index not in owned]
+            if missing:
+                for stored in self._reservation_store.find_seat_owners(*show_key, missing):
+                    self._cache_stored(stored)
+
+        released = {}
+        with self._reservation_lock:
+            owners = self._seat_owners_locked(show_key, indices)
+            owned = {index for owned in owners.values() for index in owned}
+            for seat, index in zip(normalized["kursi"], indices):
+                if index not in owned:
+                    return {"success": False, "message": f"Kursi '{seat}' tidak dimiliki reservasi aktif"}
+
+            # Reservasi diperbarui sebelum kursi dibebaskan agar kursi yang sama
+            # tidak dibebaskan dua kali oleh pembatalan lain
+            for reservation_id, owned in owners.items():
+                entry = self._reservations[reservation_id]
+                reservation = entry["reservation"]
+                names = {self._seat_manager.get_seat_name(index, teater) for index in owned}
+                entry["indices"] = [index for index in entry["indices"] if index not in owned]
+                reservation["kursi"] = [seat for seat in reservation["kursi"] if seat not in names]
+                reservation["jumlah_tiket"] = len(reservation["kursi"])
+                reservation["status"] = "partially_released" if reservation["kursi"] else "cancelled"
+                released[reservation_id] = (sorted(names), reservation["status"])
+
+        self._seat_manager.release_indices(show_key, indices)
+        if self._reservation_store is not None:
+            for reservation_id, (names, status) in released.items():
+                self._reservation_store.release_seats(reservation_id, names, status)
+        return {
+            "success": True,
+            "message": "Reservasi berhasil dibatalkan",
+            "reservations": {reservation_id: status for reservation_id, (_, status) in released.items()}
+        }
+
+    def _cancel_shared_booking(self, show_key: tuple, seats: List[str], indices: List[int]) -> Dict[str, Any]:
+        """
+        cancel_booking untuk mode multi-worker: kepemilikan kursi diklaim di
+        database bersama dalam satu transaksi sebelum kursi dibebaskan (metode private)
+        """
+        released = None
+        if None not in show_key:
+            released = self._reservation_store.release_owned(*show_key, seats)
+        if released is None:
+            return {"success": False, "message": "Ada kursi yang tidak dimiliki reservasi aktif"}
+
+        self._seat_manager.release_indices(show_key, indices)
+        return {
+            "success": True,
+            "message": "Reservasi berhasil dibatalkan",
+            "reservations": {reservation_id: status for reservation_id, (_, status) in released.items()}
+        }
+
+    # ===================== OPERASI ASINKRON (UNTUK ENDPOINT ASYNC) =====================
+
+    def _async_lock_for(self, show_key: tuple) -> asyncio.Lock:
+        """
+        Lock asyncio per pertunjukan (metode private). Disimpan secara weak
+        sehingga lock hilang sendiri saat tidak ada coroutine yang memakainya.
+        """
+        lock = self._async_locks.get(show_key)
+        if lock is None:
+            lock = self._async_locks[show_key] = asyncio.Lock()
+        return lock
+
+    async def _run_seat_operation(self, show_key: Optional[tuple], operation, *args):
+        """
+        Menjalankan operasi kursi (metode private).
+
+        Tanpa journal dan shared memory, operasi hanya menyentuh memori: jika
+        lock pertunjukan bisa diambil tanpa menunggu, operasi dijalankan
+        langsung di event loop. Jika lock sedang dipegang thread lain, atau
+        operasi bisa menunggu fsync journal, lock fcntl, maupun SQLite,
+        operasi dipindah ke thread agar event loop tidak terblokir.
+        """
+        seat_manager = self._seat_manager
+        in_memory = seat_manager.journal is None and seat_manager.shared_store is None
+        if show_key is not None and in_memory:
+            lock = seat_manager.try_lock_show(show_key)
+            if lock is not None:
+                try:
+                    return operation(*args)
+                finally:
+                    lock.release()
+        return await asyncio.to_thread(operation, *args)
+
+    async def get_films_async(self, genre: Optional[str] = None, sort_by: Optional[str] = None) -> List[Film]:
+        """Versi asinkron get_films; hanya membaca indeks katalog."""
+        return self.get_films(genre, sort_by)
+
+    async def get_films_page_async(self, genre: Optional[str] = None, sort_by: str = CATALOG_ORDER,
+                                   cursor: Optional[str] = None, limit: Optional[int] = None,
+                                   fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Versi asinkron get_films_page; hanya membaca indeks katalog."""
+        return self.get_films_page(genre, sort_by, cursor, limit, fields)
+
+    async def calculate_ticket_price_async(self, film_title: str, showtime: str,
+                                           is_holiday: bool = False, is_member: bool = False,
+                                           ticket_count: int = 1) -> Dict[str, Any]:
+        """Versi asinkron calculate_ticket_price; hanya lookup tabel harga."""
+        return self.calculate_ticket_price(film_title, showtime, is_holiday, is_member, ticket_count)
+
+    async def check_seats_async(self, theater_name: Optional[str] = None, film_title: Optional[str] = None,
+                                showtime: Optional[str] = None, show_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Versi asinkron check_seats. Pengecekan satu pertunjukan bisa berjalan
+        langsung di event loop; gabungan beberapa pertunjukan selalu di thread.
+        """
+        show_key = None
+        show = self._resolve_show(theater_name, film_title, showtime, show_date)
+        if show["success"] and showtime is not None:
+            show_key = self._seat_manager.make_show_key(show["teater"], *show["show_args"])
+        return await self._run_seat_operation(
+            show_key, self.check_seats, theater_name, film_title, showtime, show_date
+        )
+
+    async def book_tickets_async(self, film_title: str, showtime: str, ticket_count: int,
+                                 is_holiday: bool = False, is_member: bool = False,
+                                 seat_preference: str = "berurutan",
+                                 show_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Versi asinkron book_tickets. Pemesanan untuk pertunjukan yang sama
+        diantrekan lewat asyncio.Lock per pertunjukan, sehingga coroutine
+        yang menunggu tidak memakai thread dari threadpool.
+        """
+        validation = self._validator.validate_ticket_request(film_title, showtime, ticket_count, show_date)
+        if not validation["valid"]:
+            return {"success": False, "message": validation["message"]}
+
+        show_key = self._seat_manager.make_show_key(validation["teater"], validation["film"], showtime, show_date)
+        async with self._async_lock_for(show_key):
+            return await self._run_seat_operation(
+                show_key, self.book_tickets, film_title, showtime, ticket_count,
+                is_holiday, is_member, seat_preference, show_date
+            )
@@ -0,0 +1,69 @@
+# ======================================
+# AutoTicket CLI Project
+# ======================================
+# File: best_seats.py
+
+import heapq
+from typing import Dict, List, Set, Tuple
+
+from models.seat_layout import SeatLayout
+
+
+class BestSeatIndex:
+    """
+    Antrean prioritas blok kursi terbaik untuk satu pertunjukan dan satu
+    panjang blok.
+
+    Heap berisi (-skor, nomor kursi awal) untuk setiap blok yang seluruh
+    kursinya tersedia menurut mask terakhir yang dilihat. Blok yang kursinya
+    sudah terisi baru dibuang saat muncul di puncak heap (invalidasi malas),
+    dan saat ada kursi yang kembali kosong hanya blok yang mencakup kursi
+    tersebut yang dimasukkan lagi. Karena perubahan dideteksi dari mask
+    peta kursi, perubahan dari worker lain pada shared memory ikut terhitung.
+    """
+
+    __slots__ = ("layout", "length", "_blocks", "_full", "_heap", "_in_heap", "_mask")
+
+    def __init__(self, layout: SeatLayout, length: int, mask: int):
+        self.layout = layout
+        self.length = length
+        self._blocks: Dict[int, float] = layout.blocks(length)
+        self._full = (1 << length) - 1
+        self._mask = mask
+        self._heap: List[Tuple[float, int]] = [
+            (-score, awal) for awal, score in self._blocks.items() if self._is_free(awal, mask)
+        ]
+        heapq.heapify(self._heap)
+        self._in_heap: Set[int] = {awal for _, awal in self._heap}
+
+    def _is_free(self, awal: int, mask: int) -> bool:
+        return (mask >> awal) & self._full == self._full
+
+    def sync(self, mask: int) -> None:
+        """Memasukkan kembali blok yang mencakup kursi yang kosong sejak mask terakhir."""
+        freed = mask & ~self._mask
+        self._mask = mask
+        while freed:
+            low_bit = freed & -freed
+            seat = low_bit.bit_length() - 1
+            freed ^= low_bit
+            for awal in range(max(seat - self.length + 1, 0), seat + 1):
+                if awal in self._blocks and awal not in self._in_heap and self._is_free(awal, mask):
+                    heapq.heappush(self._heap, (-self._blocks[awal], awal))
+                    self._in_heap.add(awal)
+
+    def best(self) -> int:
+        """Nomor kursi awal blok terbaik yang masih tersedia, atau -1."""
+        heap = self._heap
+        while heap:
+            awal = heap[0][1]
+            if self._is_free(awal, self._mask):
+                return awal
+            heapq.heappop(heap)
+            self._in_heap.discard(awal)
+        return -1
+
+    def take(self, indices: List[int]) -> None:
+        """Mencatat kursi yang baru dialokasikan agar pembebasannya nanti terdeteksi."""
+        for index in indices:
+            self._mask &= ~(1 << index)
@@ -2,6 +2,7 @@ from typing import Dict, List, Optional, Any
 from config.config_manager import ConfigManager
 from models.entities import Film
 from models.data_manager import DataManager
+from models.film_catalog import FilmCatalog
 
 
 class FilmService:
@@ -18,8 +19,15 @@ class FilmService:
             config_manager: Instance dari ConfigManager yang telah dimuat
         """
         self.config_manager = config_manager
-        self.films = []
-        self.load_film_data()
+
+    @property
+    def catalog(self) -> FilmCatalog:
+        """Katalog dari snapshot konfigurasi yang sedang berlaku, ikut berganti saat hot reload"""
+        return self.config_manager.get_film_catalog()
+
+    @property
+    def films(self) -> List[Dict[str, Any]]:
+        return list(self.catalog.raw_films)
 
     def load_film_data(self) -> List[Dict[str, Any]]:
         """
@@ -29,8 +37,7 @@ class FilmService:
         Returns:
             List data film yang telah dimuat
         """
-        # Menggunakan config_manager untuk mendapatkan data film
-        self.films = self.config_manager.config.get("film", [])
+        # Katalog selalu dibaca dari snapshot terbaru config_manager
         return self.films
 
     def get_film_info(self, film_title: str) -> Optional[Dict[str, Any]]:
@@ -43,11 +50,8 @@ class FilmService:
         Returns:
             Dictionary berisi informasi film, atau None jika tidak ditemukan
         """
-        # Mencari film berdasarkan judul
-        for film in self.films:
-            if film.get("judul", "").lower() == film_title.lower():
-                return film
-        return None
+        # Mencari film berdasarkan judul lewat indeks katalog
+        return self.catalog.get_raw(film_title)
 
     def get_film_schedule(self, film_title: str) -> List[str]:
         """
@@ -61,7 +65,7 @@ class FilmService:
         """
         film_info = self.get_film_info(film_title)
         if film_info:
-            return film_info.get("jadwal", [])
+            return list(film_info.get("jadwal", []))
         return []
 
     def get_all_films(self) -> List[Dict[str, Any]]:
@@ -83,12 +87,8 @@ class FilmService:
         Returns:
             List film yang memiliki genre yang dicari
         """
-        result = []
-        for film in self.films:
-            film_genres = film.get("genre", "").lower()
-            if genre.lower() in film_genres:
-                result.append(film)
-        return result
+        # Lewat inverted index genre di katalog, tanpa memindai semua film
+        return self.catalog.raw_by_genre(genre)
 
     def get_film_price(self, film_title: str) -> int:
         """
@@ -130,11 +130,7 @@ class FilmService:
         Returns:
             List film yang diputar di teater tersebut
         """
-        result = []
-        for film in self.films:
-            if film.get("teater", "") == teater_name:
-                result.append(film)
-        return result
+        return self.catalog.raw_by_teater(teater_name)
 
     def is_film_available_at_time(self, film_title: str, time: str) -> bool:
         """
@@ -147,8 +143,7 @@ class FilmService:
         Returns:
             True jika film tersedia pada waktu tersebut, False jika tidak
         """
-        schedule = self.get_film_schedule(film_title)
-        return time in schedule
+        return self.catalog.has_showtime(film_title, time)
 
 film_manager = DataManager[Film]()  # ← DI SINILAH GENERIC DIGUNAKAN
 
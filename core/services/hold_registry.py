@@ -0,0 +1,71 @@
+# ======================================
+# AutoTicket CLI Project
+# ======================================
+# File: hold_registry.py
+
+import heapq
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+ShowKey = Tuple
+
+
+class HoldRegistry:
+    """
+    Daftar hold kursi sementara di memori satu proses.
+
+    Hold disimpan per hold_id, kedaluwarsa diurutkan lewat min-heap, dan
+    nomor kursi yang ditahan dicatat per pertunjukan. Perubahan hold dilakukan
+    oleh SeatManager di bawah lock pertunjukannya. Untuk mode multi-worker
+    dipakai HoldStore (SQLite) dengan antarmuka yang sama.
+    """
+
+    def __init__(self):
+        self._holds: Dict[str, Dict[str, Any]] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._by_show: Dict[ShowKey, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, hold: Dict[str, Any]) -> None:
+        with self._lock:
+            self._holds[hold["hold_id"]] = hold
+            self._by_show.setdefault(hold["show_key"], set()).add(hold["hold_id"])
+            heapq.heappush(self._heap, (hold["expires_at"], hold["hold_id"]))
+
+    def get(self, hold_id: str) -> Optional[Dict[str, Any]]:
+        return self._holds.get(hold_id)
+
+    def take(self, hold_id: str) -> Optional[Dict[str, Any]]:
+        """Menghapus hold dan mengembalikan datanya, atau None jika sudah tidak ada."""
+        with self._lock:
+            hold = self._holds.pop(hold_id, None)
+            if hold is not None:
+                self._by_show.get(hold["show_key"], set()).discard(hold_id)
+        return hold
+
+    def held_indices(self, show_key: ShowKey) -> Set[int]:
+        with self._lock:
+            return {index for hold_id in self._by_show.get(show_key, ())
+                    for index in self._holds[hold_id]["indices"]}
+
+    def has_due(self, now: float) -> bool:
+        # Hanya melihat puncak heap; O(1) jika belum ada hold yang kedaluwarsa
+        return bool(self._heap) and self._heap[0][0] <= now
+
+    def due(self, now: float) -> Dict[ShowKey, List[str]]:
+        """Hold yang sudah kedaluwarsa, dikelompokkan per pertunjukan."""
+        due: Dict[ShowKey, List[str]] = {}
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, hold_id = heapq.heappop(self._heap)
+                # Entri heap untuk hold yang sudah dikonfirmasi/dibatalkan diabaikan
+                hold = self._holds.get(hold_id)
+                if hold is not None:
+                    due.setdefault(hold["show_key"], []).append(hold_id)
+        return due
+
+    def discard_shows(self, predicate: Callable[[ShowKey], bool]) -> None:
+        """Melupakan daftar kursi yang ditahan untuk pertunjukan yang sudah dihapus."""
+        with self._lock:
+            for show_key in [key for key in self._by_show if predicate(key)]:
+                del self._by_show[show_key]
@@ -1,11 +1,33 @@
-from typing import Dict, Any
-from config.config_manager import ConfigManager
+import operator
+import threading
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from config.config_manager import ConfigManager, ConfigSnapshot
+
+# Satu baris tabel harga per (judul, jam tayang, hari libur, member):
+# (harga dasar, persen waktu, nominal waktu, persen libur, nominal libur,
+#  persen member, nominal member, total diskon, harga setelah diskon, harga per tiket)
+PriceRow = Tuple[int, int, int, int, int, int, int, int, int, int]
+
+
+class PriceTables:
+    """Tabel harga yang dibangun dari satu snapshot konfigurasi."""
+
+    __slots__ = ("snapshot", "film_prices", "price_table")
+
+    def __init__(self, snapshot: ConfigSnapshot, film_prices: Dict[str, int],
+                 price_table: Dict[Tuple[str, str, bool, bool], PriceRow]):
+        self.snapshot = snapshot
+        self.film_prices = film_prices
+        self.price_table = price_table
 
 
 class PriceCalculator:
     """
     Kelas untuk menghitung harga tiket berdasarkan berbagai parameter.
-    Mengimplementasikan table-driven construction untuk perhitungan harga.
+    Mengimplementasikan table-driven construction untuk perhitungan harga:
+    harga per tiket untuk setiap kombinasi film, jam tayang, hari libur, dan
+    member dihitung sekali di muka, dan dibangun ulang hanya saat konfigurasi
+    berubah.
     """
 
     def __init__(self, config_manager: ConfigManager):
@@ -16,35 +38,182 @@ class PriceCalculator:
             config_manager: Instance dari ConfigManager yang telah dimuat
         """
         self.config_manager = config_manager
+        self._tables: Optional[PriceTables] = None
+        # Tabel harga dibangun saat pertama kali dibutuhkan, bukan saat startup
+        self._rebuild_lock = threading.Lock()
+
+    def _refresh_tables(self) -> PriceTables:
+        """
+        Mengembalikan tabel harga untuk snapshot konfigurasi yang berlaku,
+        membangunnya ulang jika snapshot berganti. Tabel baru diterbitkan
+        dengan satu penggantian referensi sehingga pembaca tidak pernah
+        melihat tabel yang setengah jadi.
+        """
+        snapshot = self.config_manager.snapshot
+        tables = self._tables
+        if tables is not None and tables.snapshot is snapshot:
+            return tables
 
-        # Memuat konfigurasi diskon dari config
-        self.diskon_libur = config_manager.get_diskon_libur()
-        self.diskon_member = config_manager.get_diskon_member()
-        self.waktu_diskon = config_manager.get_waktu_diskon()
-        self.biaya_admin = config_manager.get_biaya_admin()
+        with self._rebuild_lock:
+            tables = self._tables
+            if tables is None or tables.snapshot is not snapshot:
+                tables = self._tables = self._build_tables(snapshot, tables)
+        return tables
 
-        # Membuat tabel harga film (table-driven construction)
-        self.film_prices = self._build_film_price_table()
+    def _build_tables(self, snapshot: ConfigSnapshot, previous: Optional[PriceTables]) -> PriceTables:
+        # Jika aturan diskon tidak berubah, baris film yang harga dan jadwalnya
+        # sama disalin dari tabel lama; hanya film yang berubah dihitung ulang
+        reuse = previous is not None and previous.snapshot.get_tiket_config() == snapshot.get_tiket_config()
 
-    def _build_film_price_table(self) -> Dict[str, int]:
+        # Membuat tabel harga film (table-driven construction)
         film_prices = {}
-        films = self.config_manager.config.get("film", [])
+        matrix = {}
+        for film in snapshot.film_catalog:
+            film_prices[film.judul] = film.harga_tiket
+
+            old = previous.snapshot.film_catalog.get(film.judul) if reuse else None
+            unchanged = (old is not None and old.judul == film.judul
+                         and old.harga_tiket == film.harga_tiket and old.jadwal == film.jadwal)
+            for jam in film.jadwal:
+                for is_holiday in (False, True):
+                    for is_member in (False, True):
+                        key = (film.judul, jam, is_holiday, is_member)
+                        matrix[key] = (previous.price_table[key] if unchanged
+                                       else self._compute_row(snapshot, film.harga_tiket, jam, is_holiday, is_member))
+
+        return PriceTables(snapshot, film_prices, matrix)
+
+    @staticmethod
+    def _compute_row(snapshot: ConfigSnapshot, base_price: int, jam_tayang: str, is_holiday: bool,
+                     is_member: bool) -> PriceRow:
+        diskon_libur = snapshot.get_diskon_libur()
+        diskon_member = snapshot.get_diskon_member()
+
+        waktu_diskon_persen = snapshot.get_diskon_by_jam(jam_tayang)
+        waktu_diskon_nominal = (base_price * waktu_diskon_persen) // 100
+
+        # Menghitung diskon hari libur
+        libur_persen = diskon_libur if is_holiday else 0
+        holiday_diskon = (base_price * diskon_libur) // 100 if is_holiday else 0
+
+        # Menghitung diskon member
+        member_persen = diskon_member if is_member else 0
+        member_diskon = (base_price * diskon_member) // 100 if is_member else 0
+
+        # Menghitung total diskon dan harga setelah diskon
+        total_diskon = waktu_diskon_nominal + holiday_diskon + member_diskon
+        price_after_discount = base_price - total_diskon
+
+        return (base_price, waktu_diskon_persen, waktu_diskon_nominal, libur_persen, holiday_diskon,
+                member_persen, member_diskon, total_diskon, price_after_discount,
+                price_after_discount + snapshot.get_biaya_admin())
+
+    # ===================== NILAI YANG SEDANG BERLAKU =====================
+
+    @property
+    def diskon_libur(self) -> int:
+        return self._refresh_tables().snapshot.get_diskon_libur()
+
+    @property
+    def diskon_member(self) -> int:
+        return self._refresh_tables().snapshot.get_diskon_member()
+
+    @property
+    def waktu_diskon(self) -> Dict[str, int]:
+        return self._refresh_tables().snapshot.get_waktu_diskon()
 
-        for film in films:
-            judul = film.get("judul", "")
-            harga = film.get("harga_tiket", 0)
-            film_prices[judul] = harga
+    @property
+    def biaya_admin(self) -> int:
+        return self._refresh_tables().snapshot.get_biaya_admin()
 
-        return film_prices
+    @property
+    def film_prices(self) -> Dict[str, int]:
+        return self._refresh_tables().film_prices
+
+    @property
+    def price_table(self) -> Dict[Tuple[str, str, bool, bool], PriceRow]:
+        return self._refresh_tables().price_table
+
+    def _lookup_row(self, film_title: str, jam_tayang: str, is_holiday: bool, is_member: bool,
+                    tables: Optional[PriceTables] = None) -> PriceRow:
+        tables = tables or self._refresh_tables()
+        row = tables.price_table.get((film_title, jam_tayang, is_holiday, is_member))
+        if row is None:
+            film = tables.snapshot.film_catalog.get(film_title)
+            if film is not None:
+                row = tables.price_table.get((film.judul, jam_tayang, is_holiday, is_member))
+        if row is None:
+            # Kombinasi di luar jadwal: hitung langsung tanpa disimpan
+            row = self._compute_row(tables.snapshot, self._base_price(tables, film_title),
+                                    jam_tayang, is_holiday, is_member)
+        return row
+
+    @staticmethod
+    def _base_price(tables: PriceTables, film_title: str) -> int:
+        harga = tables.film_prices.get(film_title)
+        if harga is None:
+            # Judul dengan penulisan berbeda dicari lewat indeks katalog
+            film = tables.snapshot.film_catalog.get(film_title)
+            harga = tables.film_prices.get(film.judul, 0) if film else 0
+        return harga
 
     def get_base_price(self, film_title: str) -> int:
+        return self._base_price(self._refresh_tables(), film_title)
+
+    def get_ticket_price(self, film_title: str, jam_tayang: str, is_holiday: bool = False,
+                         is_member: bool = False) -> int:
+        """
+        Jalur cepat: mengembalikan harga per tiket (termasuk biaya admin)
+        langsung dari tabel harga.
+        """
+        return self._lookup_row(film_title, jam_tayang, is_holiday, is_member)[9]
+
+    def get_prices_batch(self, film_titles: Sequence[str], jam_tayang: Sequence[str],
+                         is_holiday: Sequence[bool], is_member: Sequence[bool],
+                         jumlah_tiket: Sequence[int]) -> Dict[str, List[int]]:
+        """
+        Menghitung harga untuk banyak kombinasi sekaligus dalam bentuk kolom.
+        Setiap kombinasi cukup satu lookup ke tabel harga; baris tabel lalu
+        ditransposisi menjadi kolom tanpa menyusun dictionary per kombinasi.
 
-        return self.film_prices.get(film_title, 0)
+        Args:
+            film_titles: Judul film per kombinasi
+            jam_tayang: Jam tayang per kombinasi
+            is_holiday: Status hari libur per kombinasi
+            is_member: Status member per kombinasi
+            jumlah_tiket: Jumlah tiket per kombinasi
+
+        Returns:
+            Dictionary kolom; setiap kolom sepanjang jumlah kombinasi
+        """
+        tables = self._refresh_tables()
+        table = tables.price_table
+        rows = []
+        for key in zip(film_titles, jam_tayang, map(bool, is_holiday), map(bool, is_member)):
+            row = table.get(key)
+            rows.append(row if row is not None else self._lookup_row(*key, tables=tables))
+
+        if not rows:
+            columns = [()] * 10
+        else:
+            columns = list(zip(*rows))
+
+        return {
+            "harga_dasar": list(columns[0]),
+            "diskon_waktu": list(columns[2]),
+            "diskon_libur": list(columns[4]),
+            "diskon_member": list(columns[6]),
+            "total_diskon": list(columns[7]),
+            "harga_setelah_diskon": list(columns[8]),
+            "harga_per_tiket": list(columns[9]),
+            "total_harga": list(map(operator.mul, columns[9], jumlah_tiket))
+        }
 
     def get_price(self, film_title: str, jam_tayang: str, is_holiday: bool = False, is_member: bool = False,jumlah_tiket: int = 1) -> Dict[
         str, Any]:
         """
-        Menghitung harga tiket berdasarkan berbagai parameter
+        Menghitung harga tiket berdasarkan berbagai parameter.
+        Rincian lengkap disusun dari baris tabel harga hanya saat diminta.
 
         Args:
             film_title: Judul film
@@ -55,26 +224,10 @@ class PriceCalculator:
         Returns:
             Dictionary berisi informasi harga
         """
-        # Mendapatkan harga dasar
-        base_price = self.get_base_price(film_title)
-
-
-        waktu_diskon_persen = self.config_manager.get_diskon_by_jam(jam_tayang)
-        waktu_diskon_nominal = (base_price * waktu_diskon_persen) // 100
-
-        # Menghitung diskon hari libur
-        holiday_diskon = (base_price * self.diskon_libur) // 100 if is_holiday else 0
-
-        # Menghitung diskon member
-        member_diskon = (base_price * self.diskon_member) // 100 if is_member else 0
-
-        # Menghitung total diskon
-        total_diskon = waktu_diskon_nominal + holiday_diskon + member_diskon
-
-        # Menghitung harga setelah diskon
-        price_after_discount = base_price - total_diskon
-
-        price_per_ticket = price_after_discount + self.biaya_admin
+        tables = self._refresh_tables()
+        (base_price, waktu_diskon_persen, waktu_diskon_nominal, libur_persen, holiday_diskon,
+         member_persen, member_diskon, total_diskon, price_after_discount,
+         price_per_ticket) = self._lookup_row(film_title, jam_tayang, is_holiday, is_member, tables)
 
         # Menghitung total harga dengan biaya admin
         total_price = price_per_ticket * jumlah_tiket
@@ -89,16 +242,16 @@ class PriceCalculator:
                 "nominal": waktu_diskon_nominal
             },
             "diskon_libur": {
-                "persen": self.diskon_libur if is_holiday else 0,
+                "persen": libur_persen,
                 "nominal": holiday_diskon
             },
             "diskon_member": {
-                "persen": self.diskon_member if is_member else 0,
+                "persen": member_persen,
                 "nominal": member_diskon
             },
             "total_diskon": total_diskon,
             "harga_setelah_diskon": price_after_discount,
-            "biaya_admin": self.biaya_admin,
+            "biaya_admin": tables.snapshot.get_biaya_admin(),
             "harga_per_tiket": price_per_ticket,
             "jumlah_tiket": jumlah_tiket,
             "total_harga": total_price,
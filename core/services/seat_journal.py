@@ -0,0 +1,366 @@
+# ======================================
+# AutoTicket CLI Project
+# ======================================
+# File: seat_journal.py
+
+import atexit
+import json
+import logging
+import os
+import shutil
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+SNAPSHOT_FILE = "snapshot.json"
+SEGMENT_PREFIX = "journal-"
+SEGMENT_SUFFIX = ".log"
+# Subfolder journal setiap worker API dalam mode multi-worker
+WORKER_PREFIX = "worker-"
+
+logger = logging.getLogger(__name__)
+
+
+class JournalError(RuntimeError):
+    """Record journal gagal disimpan ke disk (misalnya disk penuh atau error I/O)."""
+
+
+def _segments(directory: str) -> List[Tuple[int, str]]:
+    segments = []
+    for name in os.listdir(directory):
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+            start = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            segments.append((start, os.path.join(directory, name)))
+    return sorted(segments)
+
+
+def _read_snapshot(directory: str) -> Tuple[int, Dict[str, Any]]:
+    path = os.path.join(directory, SNAPSHOT_FILE)
+    if not os.path.exists(path):
+        return 0, {}
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    return data.get("base_seq", 0), data.get("shows", {})
+
+
+def _write_snapshot_file(directory: str, base_seq: int, shows: Dict[str, Any]) -> None:
+    path = os.path.join(directory, SNAPSHOT_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump({"base_seq": base_seq, "shows": shows}, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def _iter_records(directory: str) -> Iterator[Dict[str, Any]]:
+    for _, path in _segments(directory):
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Baris terakhir yang terpotong saat crash diabaikan
+                    break
+
+
+def worker_directory(directory: str, pid: int) -> str:
+    """Folder journal milik satu worker API di dalam JOURNAL_DIR."""
+    return os.path.join(directory, f"{WORKER_PREFIX}{pid}")
+
+
+def _worker_directories(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.startswith(WORKER_PREFIX) and os.path.isdir(os.path.join(directory, name))]
+
+
+def merge_journals(directory: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Menggabungkan journal utama dan journal setiap worker (mode multi-worker).
+
+    Nomor seq hanya berurutan di dalam satu journal, sedangkan lsn (nomor urut
+    journal per pertunjukan) diberikan di bawah lock pertunjukan lintas proses.
+    Untuk setiap pertunjukan dipakai snapshot dengan lsn terbesar, lalu record
+    dari semua journal dengan lsn lebih besar diterapkan urut lsn. Record
+    lama tanpa lsn hanya ada di journal utama dan disaring memakai seq.
+
+    Returns:
+        (shows, records) dengan format yang sama seperti SeatJournal.recover
+    """
+    if not os.path.isdir(directory):
+        return {}, []
+    main_base, main_shows = _read_snapshot(directory)
+    shows = dict(main_shows)
+    for worker_dir in _worker_directories(directory):
+        for key, show in _read_snapshot(worker_dir)[1].items():
+            if key not in shows or show.get("lsn", 0) > shows[key].get("lsn", 0):
+                shows[key] = show
+
+    records = []
+    for record in _iter_records(directory):
+        if "lsn" not in record:
+            applied_seq = main_shows.get(json.dumps(record["show"]), {}).get("seq", main_base)
+            if record["seq"] > applied_seq:
+                records.append(record)
+    for journal_dir in [directory] + _worker_directories(directory):
+        for record in _iter_records(journal_dir):
+            show = shows.get(json.dumps(record["show"]))
+            if "lsn" in record and record["lsn"] > (show.get("lsn", 0) if show else 0):
+                records.append(record)
+    # Pengurutan stabil: record lama tanpa lsn tetap di depan dengan urutan seq-nya
+    records.sort(key=lambda record: record.get("lsn", 0))
+    return shows, records
+
+
+def compact_journals(directory: str, shows: Dict[str, Any]) -> None:
+    """
+    Menyimpan state hasil merge_journals sebagai snapshot journal utama, lalu
+    menghapus segmen journal utama dan seluruh journal worker yang sudah
+    tercakup. Dipanggil proses induk sebelum worker baru dimulai.
+    """
+    os.makedirs(directory, exist_ok=True)
+    base_seq = _read_snapshot(directory)[0]
+    for record in _iter_records(directory):
+        base_seq = max(base_seq, record["seq"])
+    _write_snapshot_file(directory, base_seq, {
+        key: dict(show, seq=base_seq) for key, show in shows.items()
+    })
+
+    for _, segment in _segments(directory):
+        os.remove(segment)
+    for worker_dir in _worker_directories(directory):
+        shutil.rmtree(worker_dir, ignore_errors=True)
+
+
+class SeatJournal:
+    """
+    Write-ahead log untuk operasi kursi (assign/release) dengan snapshot berkala.
+
+    Setiap operasi mendapat nomor urut (seq) dan ditulis ke segmen log
+    append-only. Penulisan ke disk dilakukan oleh satu thread flusher yang
+    menggabungkan semua record yang menunggu ke dalam satu write + fsync
+    (group commit), sehingga banyak pemesanan bersamaan hanya membayar satu
+    fsync. Setelah snapshot_every record, state kursi disimpan sebagai
+    snapshot dan segmen log lama dihapus.
+
+    Jika write atau fsync gagal, thread flusher tetap berjalan: record
+    dalam batch tersebut ditandai gagal, wait() untuk record itu melempar
+    JournalError, dan record berikutnya ditulis ke segmen baru karena
+    segmen yang gagal bisa berisi baris terpotong.
+    """
+
+    def __init__(self, directory: str, snapshot_every: int = 10000):
+        """
+        Args:
+            directory: Folder tempat snapshot dan segmen log disimpan
+            snapshot_every: Jumlah record sebelum snapshot baru dibuat
+        """
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+
+        # Dipasang oleh SeatManager: mengembalikan state kursi untuk snapshot
+        self.snapshot_provider: Optional[Callable[[], Dict[str, Any]]] = None
+
+        self._cond = threading.Condition()
+        self._buffer: List[Tuple[int, str]] = []
+        self._seq = 0
+        self._durable_seq = 0
+        self._since_snapshot = 0
+        self._rotate_seq: Optional[int] = None
+        self._rotated_seq = 0
+        self._snapshot_running = False
+        self._snapshot_lock = threading.Lock()
+        self._closed = False
+        # seq -> error untuk record yang gagal disimpan, diambil oleh wait()
+        self._failed: Dict[int, BaseException] = {}
+        self.last_error: Optional[BaseException] = None
+
+        self._base_seq, self._snapshot_shows = _read_snapshot(directory)
+        self._seq = self._durable_seq = max(self._base_seq, self._last_logged_seq())
+
+        self._segment_start = self._seq + 1
+        self._file = open(self._segment_path(self._segment_start), "a", encoding="utf-8")
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="seat-journal", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    # ===================== FILE SEGMEN & SNAPSHOT =====================
+
+    def _segment_path(self, start_seq: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{start_seq:012d}{SEGMENT_SUFFIX}")
+
+    def _last_logged_seq(self) -> int:
+        last = 0
+        for record in _iter_records(self.directory):
+            last = max(last, record["seq"])
+        return last
+
+    def recover(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Mengembalikan snapshot terakhir dan record log yang belum tercakup olehnya.
+
+        Returns:
+            (shows, records): shows memetakan kunci pertunjukan (JSON) ke
+            {"bits": hex bitmap, "size": jumlah kursi, "seq": seq snapshot};
+            records adalah operasi yang harus diterapkan ulang secara berurutan.
+        """
+        records = []
+        for record in _iter_records(self.directory):
+            show = self._snapshot_shows.get(json.dumps(record["show"]))
+            applied_seq = show["seq"] if show else self._base_seq
+            if record["seq"] > applied_seq:
+                records.append(record)
+        return self._snapshot_shows, records
+
+    # ===================== PENULISAN LOG =====================
+
+    def append(self, op: str, show_key: Tuple, indices: List[int], lsn: int = 0) -> int:
+        """
+        Menambahkan record ke log. Harus dipanggil di bawah lock pertunjukan
+        agar urutan record sama dengan urutan perubahan di memori.
+
+        Args:
+            lsn: Nomor urut journal pertunjukan (SeatMap.log_seq) untuk merge_journals
+
+        Returns:
+            Nomor urut record; gunakan wait(seq) untuk menunggu hingga tersimpan
+        """
+        with self._cond:
+            self._seq += 1
+            line = json.dumps({"seq": self._seq, "lsn": lsn, "op": op, "show": list(show_key),
+                               "seats": list(indices)})
+            self._buffer.append((self._seq, line + "\n"))
+            self._since_snapshot += 1
+            self._cond.notify_all()
+            return self._seq
+
+    def wait(self, seq: int) -> None:
+        """
+        Menunggu sampai record dengan nomor urut seq sudah di-fsync.
+
+        Raises:
+            JournalError: jika record gagal ditulis ke disk
+        """
+        with self._cond:
+            while self._durable_seq < seq and seq not in self._failed and not self._closed:
+                self._cond.wait()
+            error = self._failed.pop(seq, None)
+        if error is not None:
+            raise JournalError(f"Record journal {seq} gagal disimpan: {error}") from error
+
+    @property
+    def last_seq(self) -> int:
+        with self._cond:
+            return self._seq
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._buffer and self._rotate_seq is None and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._buffer:
+                    return
+                batch, self._buffer = self._buffer, []
+                rotate_seq, self._rotate_seq = self._rotate_seq, None
+                snapshot_due = (self._since_snapshot >= self.snapshot_every and not self._snapshot_running
+                                and self.snapshot_provider is not None)
+                if snapshot_due:
+                    self._snapshot_running = True
+                    self._since_snapshot = 0
+
+            error = None
+            try:
+                if rotate_seq is None:
+                    self._write(batch)
+                else:
+                    # Record sampai rotate_seq masuk segmen lama, sisanya ke segmen baru
+                    self._write([item for item in batch if item[0] <= rotate_seq])
+                    self._close_file()
+                    self._segment_start = rotate_seq + 1
+                    self._file = open(self._segment_path(self._segment_start), "a", encoding="utf-8")
+                    self._write([item for item in batch if item[0] > rotate_seq])
+            except Exception as exc:
+                error = exc
+                logger.error("Journal kursi gagal menulis %d record: %s", len(batch), exc)
+                # Segmen ini bisa berisi baris terpotong; record berikutnya ditulis ke segmen baru
+                self._close_file()
+
+            with self._cond:
+                if error is not None:
+                    self.last_error = error
+                    for seq, _ in batch:
+                        self._failed[seq] = error
+                elif batch:
+                    self._durable_seq = batch[-1][0]
+                if rotate_seq is not None:
+                    self._rotated_seq = rotate_seq
+                self._cond.notify_all()
+
+            if snapshot_due:
+                threading.Thread(target=self.snapshot, name="seat-snapshot", daemon=True).start()
+
+    def _write(self, batch: List[Tuple[int, str]]) -> None:
+        if not batch:
+            return
+        if self._file is None:
+            self._segment_start = batch[0][0]
+            self._file = open(self._segment_path(self._segment_start), "a", encoding="utf-8")
+        self._file.write("".join(line for _, line in batch))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _close_file(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        self._file = None
+
+    # ===================== SNAPSHOT & KOMPAKSI =====================
+
+    def snapshot(self) -> None:
+        """
+        Menyimpan snapshot state kursi lalu menghapus segmen log yang sudah tercakup.
+        Hanya satu snapshot yang berjalan pada satu waktu.
+        """
+        with self._snapshot_lock:
+            try:
+                self._write_snapshot()
+            finally:
+                with self._cond:
+                    self._snapshot_running = False
+
+    def _write_snapshot(self) -> None:
+        with self._cond:
+            base_seq = self._seq
+            self._rotate_seq = base_seq
+            self._cond.notify_all()
+            while self._rotated_seq < base_seq and not self._closed:
+                self._cond.wait()
+            if self._rotated_seq < base_seq:
+                # Journal sudah ditutup sebelum segmen sempat dirotasi
+                return
+
+        shows = self.snapshot_provider() if self.snapshot_provider else {}
+        _write_snapshot_file(self.directory, base_seq, shows)
+
+        for start, segment in _segments(self.directory):
+            if start <= base_seq:
+                os.remove(segment)
+
+    def close(self) -> None:
+        """Menulis semua record yang tersisa lalu menghentikan thread flusher."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        # Tunggu snapshot yang sedang berjalan selesai sebelum file ditutup
+        with self._snapshot_lock:
+            self._close_file()
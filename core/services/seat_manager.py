@@ -3,24 +3,78 @@
 # ======================================
 # File: seat_manager.py
 
-from typing import Dict, List, Tuple, Optional
+import json
+import logging
+import secrets
+import threading
+import time
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple, Optional
 from config.config_manager import ConfigManager
+from core.services.best_seats import BestSeatIndex
+from core.services.hold_registry import HoldRegistry
+from core.services.seat_journal import JournalError, SeatJournal, compact_journals, merge_journals
+from core.services.seat_map import SeatMap
+from core.services.shared_seat_store import SharedSeatStore
+from models.seat_layout import DEFAULT_KURSI_PER_BARIS, SeatLayout
+
+# Kunci inventaris kursi: (teater, film, jam tayang, tanggal)
+ShowKey = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+# Jeda minimal (detik) antar pembersihan inventaris pertunjukan yang sudah selesai
+PURGE_INTERVAL = 60
+
+logger = logging.getLogger(__name__)
 
 
 class SeatManager:
+    # Jumlah kursi per baris untuk teater tanpa layout di konfigurasi (A1..A10, B1..)
+    kursi_per_baris = DEFAULT_KURSI_PER_BARIS
 
     def __init__(self, config_manager: ConfigManager):
         self.config_manager = config_manager
         self.max_kursi = config_manager.get_max_kursi()
         self.teater_info = config_manager.get_teater_info()
 
-        self.seat_status: Dict[str, List[bool]] = {}
-
-        jumlah_teater = self.teater_info.get("jumlah_teater", 0)
-        tipe_teater = self.teater_info.get("tipe_teater", {})
-
-        for teater_name in tipe_teater.keys():
-            self.seat_status[teater_name] = [True] * self.max_kursi
+        # Nama teater, layout kursi, dan durasi film diturunkan dari snapshot
+        # konfigurasi, lalu dibangun ulang saat snapshot berganti (hot reload)
+        self._config_snapshot = None
+        self._teater_names: frozenset = frozenset()
+        self._durasi_film: Dict[str, int] = {}
+        self._default_layout = SeatLayout.uniform(self.max_kursi, self.kursi_per_baris)
+        self._layouts: Dict[str, SeatLayout] = {}
+        self._refresh_config()
+
+        # Inventaris kursi per pertunjukan, dibuat saat pertama kali dipesan
+        self.seat_status: Dict[ShowKey, SeatMap] = {}
+        self._last_purge = 0.0
+        # Dipanggil dengan waktu pembersihan setelah pertunjukan selesai dihapus
+        self.purge_listener: Optional[Callable[[datetime], None]] = None
+        # Dipanggil dengan kunci pertunjukan setiap kali kursinya berubah, masih di
+        # bawah lock pertunjukan; pendengar tidak boleh memblokir (lihat SeatStreamHub)
+        self.change_listener: Optional[Callable[[ShowKey], None]] = None
+
+        # Satu lock per pertunjukan agar cek-dan-pesan bersifat atomik tanpa
+        # membuat pemesanan di pertunjukan lain ikut mengantre
+        self._show_locks: Dict[ShowKey, threading.RLock] = {}
+        self._registry_lock = threading.RLock()
+
+        # Antrean blok kursi terbaik per (pertunjukan, jumlah kursi), diakses di bawah lock pertunjukan
+        self._best_indexes: Dict[Tuple[ShowKey, int], BestSeatIndex] = {}
+
+        # Hold kursi sementara; diganti HoldStore (SQLite) lewat attach_hold_store untuk multi-worker
+        self.hold_ttl = config_manager.get_hold_ttl()
+        self.holds = HoldRegistry()
+
+        # Write-ahead log opsional, dipasang lewat attach_journal
+        self.journal: Optional[SeatJournal] = None
+
+        # Inventaris bersama lintas proses (opsional), dipasang lewat attach_shared_store
+        self.shared_store: Optional[SharedSeatStore] = None
+
+        # Layout teater yang masih punya pertunjukan aktif tidak boleh berubah saat hot reload
+        config_manager.reload_guard = self._check_layout_change
 
         # State untuk automata penempatan kursi
         self.STATES = {
@@ -35,79 +89,369 @@ class SeatManager:
         # State saat ini
         self.current_state = self.STATES["INITIAL"]
 
-    def get_seat_status(self, teater_name: str) -> List[bool]:
-        return self.seat_status.get(teater_name, [])
+    # ===================== INVENTARIS PER PERTUNJUKAN =====================
+
+    @staticmethod
+    def _parse_durasi(durasi: str) -> int:
+        try:
+            return int(str(durasi).split()[0])
+        except (ValueError, IndexError):
+            return 0
+
+    def make_show_key(self, teater_name: str, film_title: Optional[str] = None,
+                      jam_tayang: Optional[str] = None, tanggal: Optional[str] = None) -> ShowKey:
+        """
+        Membentuk kunci inventaris pertunjukan.
+
+        Tanpa jam tayang, kunci merujuk ke inventaris umum teater
+        (perilaku lama). Tanggal default adalah hari ini; format tanggal
+        harus ISO (YYYY-MM-DD), jika tidak ValueError dilempar.
+        """
+        if jam_tayang is None:
+            return (teater_name, None, None, None)
+
+        if tanggal is None:
+            tanggal = date.today().isoformat()
+        else:
+            tanggal = date.fromisoformat(tanggal).isoformat()
+        return (teater_name, film_title, jam_tayang, tanggal)
+
+    def _refresh_config(self) -> None:
+        """Membangun ulang nama teater, layout, dan durasi film bila snapshot konfigurasi berubah"""
+        snapshot = self.config_manager.snapshot
+        if snapshot is self._config_snapshot:
+            return
+        self.teater_info = snapshot.get_teater_info()
+        teater_names = frozenset(self.teater_info.get("tipe_teater", {}).keys())
+        durasi_film = {
+            film.get("judul", ""): self._parse_durasi(film.get("durasi", ""))
+            for film in snapshot.config.get("film", ())
+        }
+        self._teater_names = teater_names
+        self._durasi_film = durasi_film
+        self._default_layout = self._default_layout_for(snapshot)
+        self.max_kursi = self._default_layout.size
+        # Tabel nama kursi sudah dibangun di snapshot; teater tanpa layout memakai layout bawaan
+        self._layouts = snapshot.seat_layouts
+        self._config_snapshot = snapshot
+
+    @property
+    def teater_names(self) -> frozenset:
+        self._refresh_config()
+        return self._teater_names
+
+    @property
+    def durasi_film(self) -> Dict[str, int]:
+        self._refresh_config()
+        return self._durasi_film
+
+    def _default_layout_for(self, snapshot) -> SeatLayout:
+        if snapshot.get_max_kursi() == self._default_layout.size:
+            return self._default_layout
+        return SeatLayout.uniform(snapshot.get_max_kursi(), self.kursi_per_baris)
+
+    def _check_layout_change(self, snapshot) -> None:
+        """
+        Dipanggil ConfigManager sebelum snapshot baru diterbitkan. Inventaris
+        pertunjukan menyimpan kursi per nomor indeks layout, jadi layout teater
+        yang masih punya pertunjukan aktif tidak boleh berubah; snapshot
+        ditolak (ValueError) dan dicoba lagi setelah pertunjukannya selesai.
+        """
+        now = datetime.now()
+        shows = self.shared_store.show_keys() if self.shared_store is not None else list(self.seat_status)
+        aktif = {key[0] for key in shows if (end := self.get_show_end(key)) is None or end > now}
+        default_layout = self._default_layout_for(snapshot)
+        for teater_name in sorted(aktif):
+            layout = snapshot.seat_layouts.get(teater_name, default_layout)
+            if not self.layout_for(teater_name).same_seats(layout):
+                raise ValueError(
+                    f"Layout kursi {teater_name} tidak boleh diubah selama masih ada pertunjukan yang belum selesai"
+                )
+
+        if self.shared_store is not None:
+            teater_names = snapshot.get_teater_info().get("tipe_teater", {})
+            size = max((snapshot.seat_layouts.get(name, default_layout).size for name in teater_names),
+                       default=default_layout.size)
+            if size > self.shared_store.capacity:
+                raise ValueError(
+                    f"Kapasitas shared memory ({self.shared_store.capacity}) lebih kecil dari jumlah kursi teater terbesar ({size})"
+                )
+
+    def layout_for(self, teater_name: Optional[str]) -> SeatLayout:
+        """Layout kursi teater; layout bawaan (MAX_KURSI, 10 kursi per baris) jika tidak dikonfigurasi"""
+        self._refresh_config()
+        return self._layouts.get(teater_name, self._default_layout)
+
+    @property
+    def max_seats(self) -> int:
+        """Jumlah kursi teater terbesar di antara semua layout"""
+        return max((self.layout_for(name).size for name in self.teater_names), default=self.max_kursi)
+
+    def has_teater(self, teater_name: str) -> bool:
+        return teater_name in self.teater_names
+
+    def get_show_end(self, show_key: ShowKey) -> Optional[datetime]:
+        teater_name, film_title, jam_tayang, tanggal = show_key
+        if not jam_tayang or not tanggal:
+            return None
+        try:
+            mulai = datetime.strptime(f"{tanggal} {jam_tayang}", "%Y-%m-%d %H:%M")
+        except ValueError:
+            return None
+        return mulai + timedelta(minutes=self.durasi_film.get(film_title, 0))
+
+    def purge_finished_shows(self, now: Optional[datetime] = None) -> int:
+        """
+        Menghapus inventaris pertunjukan yang sudah selesai.
+
+        Returns:
+            Jumlah inventaris yang dihapus
+        """
+        now = now or datetime.now()
+        if self.shared_store is not None:
+            def selesai_di(key: ShowKey) -> bool:
+                end = self.get_show_end(key)
+                return end is not None and end <= now
+
+            removed = self.shared_store.purge(selesai_di)
+            self.holds.discard_shows(selesai_di)
+            with self._registry_lock:
+                for key in [key for key in self._best_indexes if selesai_di(key[0])]:
+                    self._best_indexes.pop(key, None)
+                self._last_purge = time.monotonic()
+            self._notify_purge(now)
+            return removed
+
+        with self._registry_lock:
+            selesai = [key for key in self.seat_status
+                       if (end := self.get_show_end(key)) is not None and end <= now]
+            selesai_set = set(selesai)
+            for key in [key for key in self._best_indexes if key[0] in selesai_set]:
+                self._best_indexes.pop(key, None)
+            self.holds.discard_shows(selesai_set.__contains__)
+            for key in selesai:
+                del self.seat_status[key]
+                lock = self._show_locks.get(key)
+                # Lock yang sedang dipegang dibiarkan, akan dihapus pada pembersihan berikutnya
+                if lock is not None and lock.acquire(blocking=False):
+                    del self._show_locks[key]
+                    lock.release()
+            self._last_purge = time.monotonic()
+        self._notify_purge(now)
+        return len(selesai)
+
+    def _notify_purge(self, now: datetime) -> None:
+        if self.purge_listener is not None:
+            self.purge_listener(now)
+
+    def _notify_change(self, show_key: ShowKey) -> None:
+        if self.change_listener is not None:
+            self.change_listener(show_key)
+
+    def _lock_for(self, show_key: ShowKey) -> threading.RLock:
+        if self.shared_store is not None:
+            return self.shared_store.lock_for(show_key)
+        lock = self._show_locks.get(show_key)
+        if lock is None:
+            with self._registry_lock:
+                lock = self._show_locks.setdefault(show_key, threading.RLock())
+        return lock
+
+    def try_lock_show(self, show_key: ShowKey) -> Optional[threading.RLock]:
+        """
+        Mengambil lock pertunjukan tanpa menunggu. Hanya untuk inventaris di
+        memori satu proses; dengan shared memory selalu None karena lock fcntl
+        bisa memblokir.
+
+        Returns:
+            Lock yang sudah dipegang (pemanggil wajib melepasnya), atau None
+        """
+        if self.shared_store is not None:
+            return None
+        lock = self._lock_for(show_key)
+        return lock if lock.acquire(blocking=False) else None
 
-    def get_available_seats(self, teater_name: str) -> List[int]:
-        seats = self.seat_status.get(teater_name, [])
-        return [i for i, available in enumerate(seats) if available]
+    def _get_inventory(self, show_key: ShowKey, create: bool = False) -> Optional[SeatMap]:
+        if show_key[0] not in self.teater_names:
+            return None
 
-    def get_total_available_seats(self, teater_name: str) -> int:
-        return sum(1 for seat in self.seat_status.get(teater_name, []) if seat)
+        if self.shared_store is not None:
+            if create and time.monotonic() - self._last_purge >= PURGE_INTERVAL:
+                self.purge_finished_shows()
+            return self.shared_store.get(show_key, create, self.layout_for(show_key[0]).size)
+
+        seats = self.seat_status.get(show_key)
+        if seats is None and create:
+            with self._registry_lock:
+                seats = self.seat_status.get(show_key)
+                if seats is None:
+                    if time.monotonic() - self._last_purge >= PURGE_INTERVAL:
+                        self.purge_finished_shows()
+                    seats = self.seat_status[show_key] = SeatMap(self.layout_for(show_key[0]).size)
+        return seats
+
+    def get_seat_status(self, teater_name: str, film_title: Optional[str] = None,
+                        jam_tayang: Optional[str] = None, tanggal: Optional[str] = None) -> List[bool]:
+        if not self.has_teater(teater_name):
+            return []
+        seats = self._get_inventory(self.make_show_key(teater_name, film_title, jam_tayang, tanggal))
+        return list(seats) if seats is not None else [True] * self.layout_for(teater_name).size
+
+    def get_available_seats(self, teater_name: str, film_title: Optional[str] = None,
+                            jam_tayang: Optional[str] = None, tanggal: Optional[str] = None,
+                            limit: Optional[int] = None) -> List[int]:
+        if not self.has_teater(teater_name):
+            return []
+        self._expire_due_holds()
+        seats = self._get_inventory(self.make_show_key(teater_name, film_title, jam_tayang, tanggal))
+        if seats is None:
+            size = self.layout_for(teater_name).size
+            return list(range(size if limit is None else min(limit, size)))
+        return seats.free_indices(limit)
+
+    def get_total_available_seats(self, teater_name: str, film_title: Optional[str] = None,
+                                  jam_tayang: Optional[str] = None, tanggal: Optional[str] = None) -> int:
+        if not self.has_teater(teater_name):
+            return 0
+        self._expire_due_holds()
+        seats = self._get_inventory(self.make_show_key(teater_name, film_title, jam_tayang, tanggal))
+        return self.layout_for(teater_name).size if seats is None else seats.free_count
+
+    def get_seat_map(self, teater_name: str, film_title: Optional[str] = None,
+                     jam_tayang: Optional[str] = None, tanggal: Optional[str] = None) -> Optional[SeatMap]:
+        """
+        Salinan peta kursi lengkap satu pertunjukan yang diambil di bawah lock
+        pertunjukan, atau None jika teater tidak dikenal
+        """
+        if not self.has_teater(teater_name):
+            return None
+        self._expire_due_holds()
+        show_key = self.make_show_key(teater_name, film_title, jam_tayang, tanggal)
+        with self._lock_for(show_key):
+            seats = self._get_inventory(show_key)
+            return seats.copy() if seats is not None else SeatMap(self.layout_for(teater_name).size)
+
+    def get_seat_version(self, show_key: ShowKey) -> int:
+        """
+        Nomor versi peta kursi pertunjukan tanpa menyalin bitmap maupun
+        mengambil lock (0 jika inventaris belum dibuat). Versi naik setiap
+        kali ada kursi yang dipesan atau dibebaskan.
+        """
+        seats = self._get_inventory(show_key)
+        return seats.version if seats is not None else 0
+
+    def get_theater_availability(self, teater_name: str, shows: List[Tuple[str, str]],
+                                 tanggal: Optional[str] = None) -> Optional[Tuple[List[int], SeatMap]]:
+        """
+        Menggabungkan inventaris beberapa pertunjukan satu teater pada satu
+        tanggal (default hari ini).
+
+        Args:
+            shows: Daftar (judul film, jam tayang) yang digabungkan
+
+        Returns:
+            (jumlah kursi tersedia per pertunjukan sesuai urutan shows, peta
+            kursi yang tersedia di semua pertunjukan), atau None jika teater
+            tidak dikenal
+        """
+        if not self.has_teater(teater_name):
+            return None
+        self._expire_due_holds()
+        size = self.layout_for(teater_name).size
+        common = (1 << size) - 1
+        totals = []
+        for film_title, jam_tayang in shows:
+            seats = self._get_inventory(self.make_show_key(teater_name, film_title, jam_tayang, tanggal))
+            if seats is None:
+                totals.append(size)
+                continue
+            totals.append(seats.free_count)
+            common &= seats.to_mask()
+        return totals, SeatMap.from_mask(size, common)
 
     # ===================== PENAMAAN KURSI =====================
 
-    def get_seat_name(self, nomor_kursi: int) -> str:
+    def get_seat_name(self, nomor_kursi: int, teater_name: Optional[str] = None) -> str:
         try:
             nomor_kursi = int(nomor_kursi)
         except (ValueError, TypeError):
             return "Invalid"
 
-        huruf_baris = chr(65 + (nomor_kursi // 10))  # 65 = 'A'
-        nomor = (nomor_kursi % 10) + 1
-        return f"{huruf_baris}{nomor}"
+        # Lookup tabel layout teater (A1.., baris setelah Z menjadi AA, AB, ...)
+        name = self.layout_for(teater_name).name(nomor_kursi)
+        return name if name is not None else "Invalid"
 
-    def get_seat_index(self, seat_name: str) -> int:
-        if len(seat_name) < 2:
-            return -1
-
-        row_letter = seat_name[0].upper()
-        try:
-            col = int(seat_name[1:])
-        except ValueError:
+    def get_seat_index(self, seat_name: str, teater_name: Optional[str] = None) -> int:
+        if not isinstance(seat_name, str):
             return -1
+        return self.layout_for(teater_name).index(seat_name)
 
-        # Konversi huruf ke baris (A -> 0, B -> 1, dst)
-        row = ord(row_letter) - 65  # 65 adalah kode ASCII untuk 'A'
-
-        # Asumsi: 10 kursi per baris
-        return row * 10 + (col - 1)  # -1 karena kolom dimulai dari 1
-
-    # ===================== PENEMPATAN KURSI =====================
-
-    def _find_consecutive_seats(self, teater_name: str, jumlah_kursi: int) -> List[int]:
-        seats = self.seat_status.get(teater_name, [])
-        if not seats:
+    def _find_consecutive_seats(self, seats: SeatMap, jumlah_kursi: int) -> List[int]:
+        start_index = seats.find_run(jumlah_kursi)
+        if start_index < 0:
             return []
-
-        consecutive_count = 0
-        start_index = -1
-
-        for i in range(len(seats)):
-            if seats[i]:  # Jika kursi tersedia
-                if consecutive_count == 0:
-                    start_index = i
-                consecutive_count += 1
-
-                if consecutive_count == jumlah_kursi:
-                    return list(range(start_index, start_index + jumlah_kursi))
-            else:
-                consecutive_count = 0
-                start_index = -1
-
-        return []
-
-    def assign_seat(self, teater_name: str, jumlah_kursi: int = 1, prefer_consecutive: bool = True) -> Optional[
-        List[str]]:
+        return list(range(start_index, start_index + jumlah_kursi))
+
+    def _best_index(self, show_key: ShowKey, seats: SeatMap, jumlah_kursi: int) -> BestSeatIndex:
+        layout = self.layout_for(show_key[0])
+        mask = seats.to_mask()
+        index = self._best_indexes.get((show_key, jumlah_kursi))
+        if index is None or index.layout is not layout:
+            # Dibangun ulang juga saat layout teater berganti (hot reload)
+            index = self._best_indexes[(show_key, jumlah_kursi)] = BestSeatIndex(layout, jumlah_kursi, mask)
+        else:
+            index.sync(mask)
+        return index
+
+    def _find_best_seats(self, show_key: ShowKey, seats: SeatMap, jumlah_kursi: int) -> Tuple[List[int], bool]:
+        """
+        Kursi terbaik menurut skor layout: blok bersebelahan dengan skor
+        tertinggi, atau jika tidak ada blok yang muat, kursi satuan dengan
+        skor tertinggi.
+
+        Returns:
+            (nomor kursi, True jika kursi berupa satu blok bersebelahan)
+        """
+        index = self._best_index(show_key, seats, jumlah_kursi)
+        awal = index.best()
+        if awal >= 0:
+            allocated = list(range(awal, awal + jumlah_kursi))
+            index.take(allocated)
+            return allocated, True
+
+        singles = self._best_index(show_key, seats, 1) if jumlah_kursi > 1 else index
+        allocated = []
+        while len(allocated) < jumlah_kursi and (seat := singles.best()) >= 0:
+            singles.take([seat])
+            allocated.append(seat)
+        return allocated, False
+
+    def assign_seat(self, teater_name: str, jumlah_kursi: int = 1, prefer_consecutive: bool = True,
+                    film_title: Optional[str] = None, jam_tayang: Optional[str] = None,
+                    tanggal: Optional[str] = None, best_available: bool = False) -> Optional[List[str]]:
         # Reset state
         self.current_state = self.STATES["INITIAL"]
 
         # Cek teater ada
-        if teater_name not in self.seat_status:
+        if not self.has_teater(teater_name):
             return None
 
+        self._expire_due_holds()
+        show_key = self.make_show_key(teater_name, film_title, jam_tayang, tanggal)
+        with self._lock_for(show_key):
+            allocated = self._assign_locked(show_key, jumlah_kursi, prefer_consecutive, best_available)
+            indices = [self.get_seat_index(name, teater_name) for name in allocated or []]
+            seq = self._log("assign", show_key, indices)
+
+        self._sync(seq, rollback={show_key: indices})
+        return allocated
+
+    def _assign_locked(self, show_key: ShowKey, jumlah_kursi: int, prefer_consecutive: bool,
+                       best_available: bool = False) -> Optional[List[str]]:
+        seats = self._get_inventory(show_key, create=True)
+
         # Cek jumlah kursi tersedia
-        if self.get_total_available_seats(teater_name) < jumlah_kursi:
+        if seats.free_count < jumlah_kursi:
             self.current_state = self.STATES["FULL"]
             return None
 
@@ -116,9 +460,13 @@ class SeatManager:
 
         allocated_seats = []
 
+        # Mode kursi terbaik: blok dengan skor tertinggi dari antrean prioritas
+        if best_available:
+            allocated_seats, consecutive = self._find_best_seats(show_key, seats, jumlah_kursi)
+            self.current_state = self.STATES["CONSECUTIVE" if consecutive else "SCATTERED"]
         # Jika prefer kursi berurutan, coba cari kursi berurutan dulu
-        if prefer_consecutive:
-            consecutive_seats = self._find_consecutive_seats(teater_name, jumlah_kursi)
+        elif prefer_consecutive:
+            consecutive_seats = self._find_consecutive_seats(seats, jumlah_kursi)
 
             if consecutive_seats:
                 # Transisi ke state CONSECUTIVE
@@ -127,38 +475,426 @@ class SeatManager:
             else:
                 # Jika tidak ada kursi berurutan, gunakan kursi terpisah
                 self.current_state = self.STATES["SCATTERED"]
-                available_seats = self.get_available_seats(teater_name)
-                allocated_seats = available_seats[:jumlah_kursi]
+                allocated_seats = seats.free_indices(jumlah_kursi)
         else:
             # Langsung gunakan kursi terpisah
             self.current_state = self.STATES["SCATTERED"]
-            available_seats = self.get_available_seats(teater_name)
-            allocated_seats = available_seats[:jumlah_kursi]
+            allocated_seats = seats.free_indices(jumlah_kursi)
 
         # Tandai kursi sebagai tidak tersedia
-        for idx in allocated_seats:
-            self.seat_status[teater_name][idx] = False
+        seats.assign(allocated_seats)
+        self._notify_change(show_key)
 
         # Transisi ke state COMPLETED
         self.current_state = self.STATES["COMPLETED"]
 
         # Kembalikan nama kursi
-        return [self.get_seat_name(idx) for idx in allocated_seats]
+        layout = self.layout_for(show_key[0])
+        return [layout.name(idx) for idx in allocated_seats]
+
+    def assign_batch(self, requests: List[Tuple[Any, ...]]) -> Optional[List[List[str]]]:
+        """
+        Mengalokasikan kursi untuk banyak pemesanan sekaligus secara atomik:
+        semua pemesanan mendapat kursi, atau tidak ada yang berubah.
+        Lock setiap pertunjukan diambil sekali dengan urutan tetap (terurut
+        berdasarkan kunci) agar dua batch yang bersilangan tidak deadlock.
+
+        Args:
+            requests: Daftar (kunci pertunjukan, jumlah kursi, prefer berurutan),
+                opsional diikuti flag kursi terbaik
+
+        Returns:
+            Daftar nama kursi per pemesanan sesuai urutan, atau None jika gagal
+        """
+        if any(show_key[0] not in self.teater_names for show_key, *_ in requests):
+            return None
+
+        self._expire_due_holds()
+        show_keys = sorted({show_key for show_key, *_ in requests},
+                           key=lambda key: tuple("" if part is None else part for part in key))
+
+        # Lock inventaris bersama diurutkan per stripe karena beberapa pertunjukan bisa berbagi stripe
+        locks = list({id(lock): lock for lock in map(self._lock_for, show_keys)}.values())
+        locks.sort(key=lambda lock: getattr(lock, "stripe", 0))
+
+        seqs = []
+        with ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+
+            allocations: List[List[str]] = []
+            for show_key, jumlah_kursi, prefer_consecutive, *best_available in requests:
+                allocated = self._assign_locked(show_key, jumlah_kursi, prefer_consecutive, any(best_available))
+                if not allocated or len(allocated) < jumlah_kursi:
+                    # Kembalikan kursi yang sudah dialokasikan di batch ini
+                    for (done_key, *_), names in zip(requests, allocations):
+                        self._release_locked(done_key, [self.get_seat_index(name, done_key[0]) for name in names])
+                    if allocated:
+                        self._release_locked(show_key, [self.get_seat_index(name, show_key[0]) for name in allocated])
+                    return None
+                allocations.append(allocated)
+
+            # Satu record journal per pertunjukan untuk seluruh batch
+            per_show: Dict[ShowKey, List[int]] = {}
+            for (show_key, *_), names in zip(requests, allocations):
+                per_show.setdefault(show_key, []).extend(self.get_seat_index(name, show_key[0]) for name in names)
+            for show_key, indices in per_show.items():
+                seqs.append(self._log("assign", show_key, indices))
+
+        self._sync(*seqs, rollback=per_show)
+        return allocations
+
+    def release_seat(self, teater_name: str, seat_names: List[str], film_title: Optional[str] = None,
+                     jam_tayang: Optional[str] = None, tanggal: Optional[str] = None) -> bool:
+        if not self.has_teater(teater_name):
+            return False
 
-    def release_seat(self, teater_name: str, seat_names: List[str]) -> bool:
-        if teater_name not in self.seat_status:
+        show_key = self.make_show_key(teater_name, film_title, jam_tayang, tanggal)
+        seats = self._get_inventory(show_key)
+        if seats is None:
             return False
 
         success = True
+        indices = []
 
         for seat_name in seat_names:
-            seat_index = self.get_seat_index(seat_name)
-            if 0 <= seat_index < len(self.seat_status[teater_name]):
-                self.seat_status[teater_name][seat_index] = True
+            seat_index = self.get_seat_index(seat_name, teater_name)
+            if 0 <= seat_index < len(seats):
+                indices.append(seat_index)
             else:
                 success = False
 
-        return success
+        return self.release_indices(show_key, indices) and success
+
+    def release_indices(self, show_key: ShowKey, indices: List[int]) -> bool:
+        """
+        Membebaskan kursi berdasarkan nomor indeks yang tersimpan, tanpa
+        mengurai ulang nama kursi. Hanya kursi yang sudah dipesan yang
+        dibebaskan; kursi yang masih kosong atau sedang ditahan hold milik
+        pemesanan lain dilewati.
+
+        Returns:
+            False jika inventaris pertunjukan tidak ditemukan atau ada kursi yang dilewati
+        """
+        seats = self._get_inventory(show_key)
+        if seats is None:
+            return False
+
+        with self._lock_for(show_key):
+            held = self.holds.held_indices(show_key)
+            indices = list(dict.fromkeys(indices))
+            owned = [index for index in indices
+                     if 0 <= index < len(seats) and not seats.is_free(index) and index not in held]
+            seats.release(owned)
+            if owned:
+                self._notify_change(show_key)
+            seq = self._log("release", show_key, owned)
+
+        try:
+            self._sync(seq)
+        except JournalError as error:
+            # Kursi tetap dibebaskan di memori; setelah pemulihan kursi ini hanya
+            # tercatat terisi (tidak pernah terjual dua kali)
+            logger.warning("Pembebasan kursi %s tidak tersimpan di journal: %s", show_key, error)
+        return len(owned) == len(indices)
+
+    def reserve_seats(self, teater_name: str, seat_names: List[str], film_title: Optional[str] = None,
+                      jam_tayang: Optional[str] = None, tanggal: Optional[str] = None) -> List[str]:
+        """
+        Memesan kursi spesifik secara atomik: semua kursi dipesan, atau tidak sama sekali.
+        Pengecekan dan penandaan dilakukan di bawah lock pertunjukan yang sama.
+
+        Returns:
+            Daftar kursi yang tidak tersedia (kosong jika pemesanan berhasil)
+        """
+        if not self.has_teater(teater_name):
+            return list(seat_names)
+
+        self._expire_due_holds()
+        show_key = self.make_show_key(teater_name, film_title, jam_tayang, tanggal)
+        with self._lock_for(show_key):
+            unavailable = self._reserve_locked(show_key, seat_names)
+            if not unavailable:
+                indices = [self.get_seat_index(name, teater_name) for name in seat_names]
+                seq = self._log("assign", show_key, indices)
+
+        if not unavailable:
+            self._sync(seq, rollback={show_key: indices})
+        return unavailable
+
+    def _reserve_locked(self, show_key: ShowKey, seat_names: List[str]) -> List[str]:
+        seats = self._get_inventory(show_key, create=True)
+
+        indices = []
+        unavailable = []
+        layout = self.layout_for(show_key[0])
+        for seat_name in seat_names:
+            seat_index = layout.index(seat_name)
+            # Kursi yang sama dengan penulisan berbeda ("C5", "c5") hanya boleh muncul sekali
+            if not 0 <= seat_index < len(seats) or not seats.is_free(seat_index) or seat_index in indices:
+                unavailable.append(seat_name)
+            else:
+                indices.append(seat_index)
+
+        if not unavailable:
+            seats.assign(indices)
+            self._notify_change(show_key)
+        return unavailable
+
+    # ===================== HOLD KURSI SEMENTARA =====================
+
+    def hold_seats(self, teater_name: str, jumlah_kursi: int = 1, prefer_consecutive: bool = True,
+                   film_title: Optional[str] = None, jam_tayang: Optional[str] = None,
+                   tanggal: Optional[str] = None, seat_names: Optional[List[str]] = None,
+                   ttl: Optional[float] = None, best_available: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Menahan kursi sementara selama ttl detik (default HOLD_TTL_DETIK).
+        Jika seat_names diberikan, kursi tersebut yang ditahan; jika tidak,
+        kursi dipilih seperti assign_seat. Hold yang tidak dikonfirmasi
+        dikembalikan ke inventaris saat kedaluwarsa.
+
+        Returns:
+            Data hold (hold_id, kursi, expires_at), atau None jika kursi tidak tersedia
+        """
+        if not self.has_teater(teater_name):
+            return None
+
+        self._expire_due_holds()
+        show_key = self.make_show_key(teater_name, film_title, jam_tayang, tanggal)
+        with self._lock_for(show_key):
+            if seat_names is not None:
+                if not seat_names or self._reserve_locked(show_key, seat_names):
+                    return None
+                allocated = list(seat_names)
+            else:
+                allocated = self._assign_locked(show_key, jumlah_kursi, prefer_consecutive, best_available)
+                if not allocated:
+                    return None
+
+            hold = {
+                "hold_id": f"HOLD-{secrets.token_hex(8)}",
+                "show_key": show_key,
+                "indices": [self.get_seat_index(name, teater_name) for name in allocated],
+                "kursi": allocated,
+                "expires_at": time.time() + (self.hold_ttl if ttl is None else ttl)
+            }
+            # Daftar hold hanya diubah di bawah lock pertunjukannya
+            self.holds.add(hold)
+        return dict(hold)
+
+    def get_hold(self, hold_id: str) -> Optional[Dict[str, Any]]:
+        hold = self.holds.get(hold_id)
+        if hold is None or hold["expires_at"] <= time.time():
+            return None
+        return dict(hold)
+
+    def confirm_hold(self, hold_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Mengubah hold menjadi pemesanan permanen.
+
+        Returns:
+            Data hold yang dikonfirmasi, atau None jika hold tidak ada/kedaluwarsa
+        """
+        hold = self.holds.get(hold_id)
+        if hold is None:
+            return None
+
+        show_key = hold["show_key"]
+        with self._lock_for(show_key):
+            hold = self.holds.take(hold_id)
+            if hold is None:
+                return None
+
+            if hold["expires_at"] <= time.time():
+                self._release_locked(show_key, hold["indices"])
+                return None
+            seq = self._log("assign", show_key, hold["indices"])
+
+        self._sync(seq, rollback={show_key: hold["indices"]})
+        return hold
+
+    def release_hold(self, hold_id: str) -> bool:
+        """Membatalkan hold dan mengembalikan kursinya ke inventaris."""
+        hold = self.holds.get(hold_id)
+        if hold is None:
+            return False
+
+        show_key = hold["show_key"]
+        with self._lock_for(show_key):
+            hold = self.holds.take(hold_id)
+            if hold is None:
+                return False
+            self._release_locked(show_key, hold["indices"])
+        return True
+
+    def expire_holds(self, now: Optional[float] = None) -> int:
+        """
+        Mengembalikan semua hold yang sudah kedaluwarsa ke inventaris.
+        Hold kedaluwarsa dari semua worker diambil dari daftar hold, lalu
+        kursinya dibebaskan sekaligus per pertunjukan dengan satu operasi mask.
+
+        Returns:
+            Jumlah hold yang kedaluwarsa
+        """
+        now = time.time() if now is None else now
+
+        count = 0
+        for show_key, hold_ids in self.holds.due(now).items():
+            with self._lock_for(show_key):
+                indices = []
+                for hold_id in hold_ids:
+                    hold = self.holds.take(hold_id)
+                    if hold is not None:
+                        indices.extend(hold["indices"])
+                        count += 1
+
+                seats = self._get_inventory(show_key)
+                if seats is not None and indices:
+                    seats.release_mask(SeatMap.mask_from(indices))
+                    self._notify_change(show_key)
+        return count
+
+    def _expire_due_holds(self) -> None:
+        if self.holds.has_due(time.time()):
+            self.expire_holds()
+
+    def _release_locked(self, show_key: ShowKey, indices: List[int]) -> None:
+        seats = self._get_inventory(show_key)
+        if seats is not None and indices:
+            seats.release(indices)
+            self._notify_change(show_key)
+
+    # ===================== INVENTARIS BERSAMA LINTAS PROSES =====================
+
+    def attach_shared_store(self, store: SharedSeatStore) -> None:
+        """
+        Memakai inventaris kursi di shared memory sehingga beberapa worker
+        melihat kursi yang sama. Lock pertunjukan menjadi lock lintas proses.
+        Hold dipindah ke penyimpanan bersama lewat attach_hold_store.
+        """
+        if store.capacity < self.max_seats:
+            raise ValueError(
+                f"Kapasitas shared memory ({store.capacity}) lebih kecil dari jumlah kursi teater terbesar ({self.max_seats})"
+            )
+        self.shared_store = store
+
+    def attach_hold_store(self, store) -> None:
+        """
+        Memakai daftar hold bersama (HoldStore) sehingga hold bisa dikonfirmasi,
+        dibatalkan, dan dikedaluwarsakan dari worker mana pun.
+        """
+        self.holds = store
+
+    # ===================== JOURNAL & PEMULIHAN =====================
+
+    def attach_journal(self, journal: SeatJournal, recover: bool = True) -> None:
+        """
+        Memulihkan state kursi dari snapshot dan log, lalu mencatat setiap
+        perubahan berikutnya ke journal. Pertunjukan yang sudah selesai
+        tidak dipulihkan. Worker dalam mode multi-worker memakai
+        recover=False karena state sudah dipulihkan proses induk lewat
+        restore_journals.
+        """
+        if recover:
+            self._apply_journal(*journal.recover())
+        self.journal = journal
+        journal.snapshot_provider = self._snapshot_state
+
+    def restore_journals(self, directory: str) -> None:
+        """
+        Dipanggil proses induk mode multi-worker sebelum worker dimulai:
+        journal utama dan journal semua worker digabung ke inventaris
+        (shared memory), lalu diringkas menjadi satu snapshot.
+        """
+        shows, records = merge_journals(directory)
+        self._apply_journal(shows, records)
+        compact_journals(directory, self._snapshot_state())
+
+    def _apply_journal(self, shows: Dict[str, Any], records: List[Dict[str, Any]]) -> None:
+        now = datetime.now()
+        for key_json, show in shows.items():
+            show_key = tuple(json.loads(key_json))
+            end = self.get_show_end(show_key)
+            if show_key[0] in self.teater_names and (end is None or end > now):
+                seats = self._restore_inventory(show_key, show["size"], int(show["bits"], 16))
+                seats.log_seq = show.get("lsn", 0)
+
+        for record in records:
+            show_key = tuple(record["show"])
+            end = self.get_show_end(show_key)
+            if end is not None and end <= now:
+                continue
+            seats = self._get_inventory(show_key, create=True)
+            if seats is None:
+                continue
+            if record["op"] == "assign":
+                seats.assign(record["seats"])
+            else:
+                seats.release(record["seats"])
+            seats.log_seq = max(seats.log_seq, record.get("lsn", 0))
+
+    def _restore_inventory(self, show_key: ShowKey, size: int, mask: int) -> SeatMap:
+        if self.shared_store is None:
+            seats = self.seat_status[show_key] = SeatMap.from_mask(size, mask)
+            return seats
+        seats = self.shared_store.get(show_key, True, size)
+        full = (1 << seats.size) - 1
+        seats.release_mask(full)
+        seats.assign_mask(full & ~mask)
+        return seats
+
+    def _snapshot_state(self) -> Dict[str, Any]:
+        shows = {}
+        seq = self.journal.last_seq if self.journal is not None else 0
+        show_keys = self.shared_store.show_keys() if self.shared_store is not None else list(self.seat_status)
+        for show_key in show_keys:
+            with self._lock_for(show_key):
+                seats = self._get_inventory(show_key)
+                if seats is None:
+                    continue
+                # Kursi yang hanya ditahan (belum dikonfirmasi) dicatat sebagai kosong
+                held = self.holds.held_indices(show_key)
+                shows[json.dumps(list(show_key))] = {
+                    "size": seats.size,
+                    "bits": format(seats.to_mask() | SeatMap.mask_from(held), "x"),
+                    "seq": seq,
+                    "lsn": seats.log_seq
+                }
+        return shows
+
+    def _log(self, op: str, show_key: ShowKey, indices: List[int]) -> int:
+        # Dipanggil di bawah lock pertunjukan agar urutan log (dan lsn) sama dengan urutan perubahan
+        if self.journal is None or not indices:
+            return 0
+        seats = self._get_inventory(show_key)
+        lsn = 0
+        if seats is not None:
+            seats.log_seq += 1
+            lsn = seats.log_seq
+        return self.journal.append(op, show_key, indices, lsn)
+
+    def _sync(self, *seqs: int, rollback: Optional[Dict[ShowKey, List[int]]] = None) -> None:
+        """
+        Dipanggil setelah lock dilepas: menunggu group commit tanpa menahan
+        pertunjukan. Jika ada record yang gagal disimpan, kursi pada rollback
+        dibebaskan kembali lalu JournalError diteruskan ke pemanggil.
+        """
+        if self.journal is None:
+            return
+        failure = None
+        for seq in seqs:
+            if not seq:
+                continue
+            try:
+                self.journal.wait(seq)
+            except JournalError as error:
+                failure = failure or error
+        if failure is None:
+            return
+        for show_key, indices in (rollback or {}).items():
+            with self._lock_for(show_key):
+                self._release_locked(show_key, indices)
+        raise failure
 
     # ===================== DISKON TIKET =====================
 
@@ -0,0 +1,298 @@
+# ======================================
+# AutoTicket CLI Project
+# ======================================
+# File: seat_map.py
+
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+class FreeRunIndex:
+    """
+    Segment tree atas deretan kursi untuk mencari kursi kosong berurutan.
+
+    Setiap node menyimpan panjang deretan kosong di awal (prefix), di akhir
+    (suffix), dan deretan terpanjang di dalam segmennya. Pencarian deretan
+    sepanjang N dan pembaruan satu kursi sama-sama O(log n), dan jika
+    deretan terpanjang di root lebih pendek dari N, jawabannya langsung
+    diketahui tanpa menelusuri pohon.
+    """
+
+    __slots__ = ("_leaves", "_prefix", "_suffix", "_best")
+
+    def __init__(self, free_flags: Iterable[bool], size: int):
+        leaves = 1
+        while leaves < max(size, 1):
+            leaves <<= 1
+        self._leaves = leaves
+
+        self._prefix = [0] * (2 * leaves)
+        self._suffix = [0] * (2 * leaves)
+        self._best = [0] * (2 * leaves)
+
+        for i, free in enumerate(free_flags):
+            if free:
+                node = leaves + i
+                self._prefix[node] = self._suffix[node] = self._best[node] = 1
+
+        for node in range(leaves - 1, 0, -1):
+            self._pull(node, leaves >> (node.bit_length() - 1))
+
+    def _pull(self, node: int, node_len: int) -> None:
+        left, right = 2 * node, 2 * node + 1
+        half = node_len >> 1
+        prefix, suffix, best = self._prefix, self._suffix, self._best
+
+        prefix[node] = prefix[left] if prefix[left] < half else half + prefix[right]
+        suffix[node] = suffix[right] if suffix[right] < half else half + suffix[left]
+        best[node] = max(best[left], best[right], suffix[left] + prefix[right])
+
+    def update(self, index: int, free: bool) -> None:
+        node = self._leaves + index
+        value = 1 if free else 0
+        self._prefix[node] = self._suffix[node] = self._best[node] = value
+
+        node_len = 1
+        node >>= 1
+        while node:
+            node_len <<= 1
+            self._pull(node, node_len)
+            node >>= 1
+
+    def find(self, length: int) -> int:
+        """
+        Mencari posisi awal paling kiri dari deretan kursi kosong sepanjang length.
+
+        Returns:
+            Nomor kursi awal, atau -1 jika tidak ada deretan sepanjang itu
+        """
+        if length <= 0 or self._best[1] < length:
+            return -1
+
+        node, node_len, offset = 1, self._leaves, 0
+        while node < self._leaves:
+            left, right = 2 * node, 2 * node + 1
+            half = node_len >> 1
+            if self._best[left] >= length:
+                node = left
+            elif self._suffix[left] + self._prefix[right] >= length:
+                return offset + half - self._suffix[left]
+            else:
+                node = right
+                offset += half
+            node_len = half
+        return offset
+
+
+class SeatMap:
+    """
+    Peta kursi ringkas untuk satu pertunjukan.
+
+    Status kursi disimpan sebagai bitmap di dalam bytearray (bit 1 = kursi
+    tersedia, urutan little-endian), sehingga 100 kursi hanya memakan 13 byte.
+    Jumlah kursi kosong disimpan sebagai counter yang diperbarui setiap kali
+    kursi dialokasikan atau dibebaskan. Indeks deretan kosong (FreeRunIndex)
+    dibangun saat pertama kali dibutuhkan lalu ikut diperbarui setiap perubahan.
+    Nomor versi naik setiap kali ada kursi yang berubah status, sehingga
+    klien dapat melewati peta yang tidak berubah. log_seq adalah nomor urut
+    record journal terakhir pertunjukan ini, dipakai untuk mengurutkan record
+    dari journal beberapa worker saat pemulihan.
+    """
+
+    __slots__ = ("size", "_bits", "_free", "_runs", "_version", "log_seq")
+
+    def __init__(self, size: int, buffer: Optional[bytearray] = None):
+        """
+        Args:
+            size: Jumlah kursi
+            buffer: Bitmap yang sudah ada (opsional). Jika tidak diberikan,
+                semua kursi dianggap tersedia.
+        """
+        self.size = size
+        nbytes = (size + 7) // 8
+
+        if buffer is None:
+            self._bits = bytearray(b"\xff" * nbytes)
+            if size % 8:
+                self._bits[-1] = (1 << (size % 8)) - 1
+            self._free = size
+        else:
+            self._bits = buffer
+            self._free = int.from_bytes(buffer[:nbytes], "little").bit_count()
+
+        self._runs: Optional[FreeRunIndex] = None
+        self._version = 0
+        self.log_seq = 0
+
+    @classmethod
+    def from_mask(cls, size: int, mask: int) -> "SeatMap":
+        """Membuat peta kursi dari bitmap integer (bit 1 = kursi tersedia)."""
+        return cls(size, bytearray(mask.to_bytes((size + 7) // 8, "little")))
+
+    # ===================== AKSES DASAR =====================
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> bool:
+        return self.is_free(index)
+
+    def __iter__(self) -> Iterator[bool]:
+        for i in range(self.size):
+            yield bool(self._bits[i >> 3] >> (i & 7) & 1)
+
+    def is_free(self, index: int) -> bool:
+        if not 0 <= index < self.size:
+            raise IndexError(f"Nomor kursi {index} di luar jangkauan")
+        return bool(self._bits[index >> 3] >> (index & 7) & 1)
+
+    @property
+    def free_count(self) -> int:
+        return self._free
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _adjust_free(self, delta: int) -> None:
+        if delta:
+            self._free += delta
+            self._version += 1
+
+    def copy(self) -> "SeatMap":
+        """Salinan lokal peta kursi beserta nomor versinya."""
+        clone = SeatMap(self.size, bytearray(self.to_bytes()))
+        clone._version = self.version
+        return clone
+
+    def to_bytes(self) -> bytes:
+        """Salinan bitmap kursi tersedia (bit 1 = tersedia, little-endian)."""
+        return bytes(self._bits[:(self.size + 7) // 8])
+
+    def free_runs(self) -> List[Tuple[int, int]]:
+        """
+        Deretan kursi tersedia sebagai pasangan (nomor kursi awal, panjang),
+        dihitung dari bitmap integer tanpa memeriksa kursi satu per satu.
+        """
+        runs = []
+        mask = self.to_mask()
+        while mask:
+            start = (mask & -mask).bit_length() - 1
+            shifted = mask >> start
+            length = (shifted ^ (shifted + 1)).bit_length() - 1
+            runs.append((start, length))
+            mask &= ~(((1 << length) - 1) << start)
+        return runs
+
+    def free_indices(self, limit: Optional[int] = None) -> List[int]:
+        """
+        Mengembalikan nomor kursi yang tersedia secara berurutan.
+        Byte yang seluruh kursinya terisi dilewati tanpa diperiksa per bit.
+
+        Args:
+            limit: Jumlah maksimal kursi yang dikembalikan (opsional)
+        """
+        result = []
+        if limit is None:
+            limit = self.size
+
+        for byte_index, byte in enumerate(self._bits[:(self.size + 7) // 8]):
+            while byte:
+                low_bit = byte & -byte
+                result.append((byte_index << 3) + low_bit.bit_length() - 1)
+                if len(result) >= limit:
+                    return result
+                byte ^= low_bit
+        return result
+
+    def find_run(self, length: int) -> int:
+        """
+        Mencari posisi awal deretan kursi kosong sepanjang length.
+
+        Returns:
+            Nomor kursi awal, atau -1 jika tidak ada
+        """
+        if length > self._free:
+            return -1
+        if self._runs is None:
+            self._runs = FreeRunIndex(self, self.size)
+        return self._runs.find(length)
+
+    # ===================== PERUBAHAN STATUS =====================
+
+    def assign(self, indices: Iterable[int]) -> int:
+        """
+        Menandai kursi sebagai terisi.
+
+        Returns:
+            Jumlah kursi yang berubah dari tersedia menjadi terisi
+        """
+        changed = 0
+        bits = self._bits
+        for index in indices:
+            bit = 1 << (index & 7)
+            if bits[index >> 3] & bit:
+                bits[index >> 3] &= ~bit & 0xFF
+                changed += 1
+                if self._runs is not None:
+                    self._runs.update(index, False)
+        self._adjust_free(-changed)
+        return changed
+
+    def release(self, indices: Iterable[int]) -> int:
+        """
+        Menandai kursi sebagai tersedia kembali.
+
+        Returns:
+            Jumlah kursi yang berubah dari terisi menjadi tersedia
+        """
+        changed = 0
+        bits = self._bits
+        for index in indices:
+            bit = 1 << (index & 7)
+            if not bits[index >> 3] & bit:
+                bits[index >> 3] |= bit
+                changed += 1
+                if self._runs is not None:
+                    self._runs.update(index, True)
+        self._adjust_free(changed)
+        return changed
+
+    # ===================== OPERASI MASK MASSAL =====================
+
+    @staticmethod
+    def mask_from(indices: Iterable[int]) -> int:
+        mask = 0
+        for index in indices:
+            mask |= 1 << index
+        return mask
+
+    def to_mask(self) -> int:
+        """Mengembalikan bitmap kursi tersedia sebagai integer."""
+        return int.from_bytes(self._bits[:(self.size + 7) // 8], "little")
+
+    def _store_mask(self, mask: int) -> None:
+        nbytes = (self.size + 7) // 8
+        self._bits[:nbytes] = mask.to_bytes(nbytes, "little")
+        # Indeks deretan dibangun ulang saat dibutuhkan berikutnya
+        self._runs = None
+
+    def all_free(self, mask: int) -> bool:
+        """Mengecek apakah semua kursi pada mask tersedia."""
+        return self.to_mask() & mask == mask
+
+    def assign_mask(self, mask: int) -> int:
+        """Menandai semua kursi pada mask sebagai terisi sekaligus."""
+        current = self.to_mask()
+        changed = (current & mask).bit_count()
+        self._store_mask(current & ~mask)
+        self._adjust_free(-changed)
+        return changed
+
+    def release_mask(self, mask: int) -> int:
+        """Membebaskan semua kursi pada mask sekaligus."""
+        mask &= (1 << self.size) - 1
+        current = self.to_mask()
+        changed = (mask & ~current).bit_count()
+        self._store_mask(current | mask)
+        self._adjust_free(changed)
+        return changed
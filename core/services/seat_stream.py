@@ -0,0 +1,178 @@
+# ======================================
+# AutoTicket CLI Project
+# ======================================
+# File: seat_stream.py
+
+import asyncio
+import base64
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from core.services.seat_manager import SeatManager, ShowKey
+from core.services.seat_map import SeatMap
+
+# Penanda di antrean pelanggan: pelanggan tertinggal dan perlu snapshot baru
+_RESYNC = ("resync", None)
+
+Event = Tuple[str, Optional[Dict[str, Any]]]
+
+
+def _indices(mask: int) -> List[int]:
+    """Nomor kursi dari bit yang menyala pada mask."""
+    result = []
+    while mask:
+        low_bit = mask & -mask
+        result.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return result
+
+
+class _Subscriber:
+    __slots__ = ("queue",)
+
+    def __init__(self, max_pending: int):
+        self.queue: asyncio.Queue = asyncio.Queue(max_pending)
+
+
+class _ShowChannel:
+    """Satu kanal per pertunjukan: satu pemantau, banyak pelanggan."""
+
+    __slots__ = ("show_key", "current", "subscribers", "task", "changed")
+
+    def __init__(self, show_key: ShowKey, current: SeatMap):
+        self.show_key = show_key
+        self.current = current
+        self.subscribers: Set[_Subscriber] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.changed = asyncio.Event()
+
+
+class SeatStreamHub:
+    """
+    Menyiarkan perubahan kursi per pertunjukan ke banyak pelanggan.
+
+    Setiap pertunjukan yang sedang ditonton punya satu pemantau yang tidur
+    sampai SeatManager memberi tahu ada kursi yang berubah (lewat
+    loop.call_soon_threadsafe, karena pemesanan berjalan di thread lain).
+    Peta kursi hanya disalin jika nomor versinya berbeda dari peta yang
+    terakhir disiarkan. Semua perubahan dalam satu interval digabung menjadi
+    satu delta (kursi yang terisi dan yang kembali kosong), lalu dikirim ke
+    semua pelanggan.
+
+    Perubahan dari worker lain pada inventaris shared memory tidak memicu
+    pemberitahuan di proses ini, jadi dalam mode itu pemantau juga bangun
+    setiap interval, tetapi hanya membaca nomor versi di header slot.
+
+    Pelanggan menerima snapshot lebih dulu, lalu delta. Pelanggan yang
+    antreannya penuh (klien lambat) menerima snapshot baru, bukan delta
+    yang tertinggal.
+    """
+
+    def __init__(self, seat_manager: SeatManager, interval: float = 0.25,
+                 keepalive: float = 15.0, max_pending: int = 64):
+        self.seat_manager = seat_manager
+        self.interval = interval
+        self.keepalive = keepalive
+        self.max_pending = max_pending
+        self._channels: Dict[ShowKey, _ShowChannel] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        seat_manager.change_listener = self._on_change
+
+    @property
+    def channel_count(self) -> int:
+        return len(self._channels)
+
+    async def _read(self, show_key: ShowKey) -> SeatMap:
+        # get_seat_map mengambil lock pertunjukan (bisa lock fcntl) dan bisa
+        # mengedarkan hold lewat SQLite, jadi tidak dijalankan di event loop
+        return await asyncio.to_thread(self.seat_manager.get_seat_map, *show_key)
+
+    def _on_change(self, show_key: ShowKey) -> None:
+        # Dipanggil dari thread pemesanan di bawah lock pertunjukan: hanya menjadwalkan, tidak menunggu
+        if self._loop is not None and show_key in self._channels:
+            try:
+                self._loop.call_soon_threadsafe(self._wake, show_key)
+            except RuntimeError:
+                # Event loop sudah ditutup; pemesanan tetap berhasil, tidak ada yang perlu dikabari
+                pass
+
+    def _wake(self, show_key: ShowKey) -> None:
+        channel = self._channels.get(show_key)
+        if channel is not None:
+            channel.changed.set()
+
+    def _snapshot_event(self, seat_map: SeatMap) -> Event:
+        return ("snapshot", {
+            "version": seat_map.version,
+            "size": seat_map.size,
+            "available_count": seat_map.free_count,
+            "bitmap": base64.b64encode(seat_map.to_bytes()).decode("ascii")
+        })
+
+    async def subscribe(self, teater_name: str, film_title: Optional[str] = None,
+                        jam_tayang: Optional[str] = None, tanggal: Optional[str] = None) -> AsyncIterator[Event]:
+        """
+        Generator event ("snapshot" | "delta" | "ping", data) untuk satu pertunjukan.
+        Berhenti berlangganan saat generator ditutup (klien terputus).
+        """
+        show_key = self.seat_manager.make_show_key(teater_name, film_title, jam_tayang, tanggal)
+        self._loop = asyncio.get_running_loop()
+        channel = self._channels.get(show_key)
+        if channel is None:
+            current = await self._read(show_key)
+            # Pelanggan lain bisa sudah membuat kanal selama peta kursi dibaca
+            channel = self._channels.get(show_key)
+            if channel is None:
+                channel = self._channels[show_key] = _ShowChannel(show_key, current)
+                channel.task = asyncio.create_task(self._watch(channel))
+
+        subscriber = _Subscriber(self.max_pending)
+        channel.subscribers.add(subscriber)
+        try:
+            # Snapshot dari peta yang terakhir disiarkan agar delta berikutnya berlaku tepat
+            yield self._snapshot_event(channel.current)
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    yield ("ping", None)
+                    continue
+                yield self._snapshot_event(channel.current) if event is _RESYNC else event
+        finally:
+            channel.subscribers.discard(subscriber)
+            if not channel.subscribers and self._channels.get(show_key) is channel:
+                del self._channels[show_key]
+                channel.task.cancel()
+
+    async def _watch(self, channel: _ShowChannel) -> None:
+        while True:
+            if self.seat_manager.shared_store is None:
+                await channel.changed.wait()
+            # Jeda singkat agar perubahan beruntun digabung menjadi satu delta
+            await asyncio.sleep(self.interval)
+            channel.changed.clear()
+            if self.seat_manager.get_seat_version(channel.show_key) == channel.current.version:
+                continue
+
+            latest = await self._read(channel.show_key)
+            previous = channel.current
+            old_mask, new_mask = previous.to_mask(), latest.to_mask()
+            if old_mask == new_mask:
+                continue
+
+            channel.current = latest
+            self._broadcast(channel, ("delta", {
+                "version": latest.version,
+                "available_count": latest.free_count,
+                "taken": _indices(old_mask & ~new_mask),
+                "freed": _indices(new_mask & ~old_mask)
+            }))
+
+    def _broadcast(self, channel: _ShowChannel, event: Event) -> None:
+        for subscriber in channel.subscribers:
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Delta yang tertinggal dibuang; pelanggan akan menerima snapshot baru
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                subscriber.queue.put_nowait(_RESYNC)
@@ -0,0 +1,397 @@
+# ======================================
+# AutoTicket CLI Project
+# ======================================
+# File: shared_seat_store.py
+
+import json
+import os
+import tempfile
+import threading
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from core.services.seat_map import SeatMap
+
+ShowKey = Tuple
+
+MAGIC = b"ATSS"
+HEADER_SIZE = 16
+
+# Tata letak satu slot: status (1) + kunci JSON (159) + ukuran (4) + kursi kosong (4) + versi (8)
+# + nomor urut journal (8) + bitmap
+KEY_SIZE = 159
+SLOT_META_SIZE = 1 + KEY_SIZE
+SLOT_HEADER_SIZE = 24
+
+SLOT_EMPTY = 0
+SLOT_USED = 1
+SLOT_DELETED = 2
+
+# Jumlah stripe lock lintas proses; offset 0 dipakai untuk registry slot
+LOCK_STRIPES = 4096
+
+
+def _open_shared_memory(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    if create:
+        # Pembuat tetap terdaftar di resource tracker agar segmen dibersihkan jika proses induk crash
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    # Python < 3.13: worker tidak boleh mendaftarkan segmen ke resource tracker,
+    # jika tidak segmen ikut dihapus (atau dilepas ganda) saat worker berhenti
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedShowLock:
+    """
+    Lock satu stripe pertunjukan yang berlaku lintas thread dan proses.
+
+    Thread di dalam satu proses diantrekan oleh RLock, sedangkan proses lain
+    diantrekan oleh byte-range lock fcntl pada file lock bersama. Lock fcntl
+    hanya diambil pada akuisisi terluar karena lock POSIX dimiliki per proses.
+    """
+
+    def __init__(self, fd: int, stripe: int):
+        self.fd = fd
+        self.stripe = stripe
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self._thread_lock.acquire(blocking):
+            return False
+        if self._depth == 0:
+            try:
+                fcntl.lockf(self.fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB, 1, self.stripe)
+            except OSError:
+                self._thread_lock.release()
+                return False
+        self._depth += 1
+        return True
+
+    def acquire_exclusive(self) -> bool:
+        """Akuisisi non-blocking yang gagal jika thread ini sudah memegang lock."""
+        if not self._thread_lock.acquire(blocking=False):
+            return False
+        if self._depth > 0:
+            self._thread_lock.release()
+            return False
+        self._thread_lock.release()
+        return self.acquire(blocking=False)
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, self.stripe)
+        self._thread_lock.release()
+
+    def __enter__(self) -> "SharedShowLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class SharedSeatMap(SeatMap):
+    """
+    SeatMap yang bitmap-nya berada di shared memory.
+
+    Jumlah kursi kosong dan nomor versi disimpan di header slot agar semua
+    proses melihat nilai yang sama. Indeks deretan kosong tetap lokal per
+    proses dan dibangun ulang jika versi di shared memory berubah oleh
+    proses lain.
+    """
+
+    __slots__ = ("_header", "_seen_version")
+
+    def __init__(self, size: int, header: memoryview, bits: memoryview):
+        self.size = size
+        self._bits = bits
+        self._header = header
+        self._runs = None
+        self._seen_version = -1
+
+    @property
+    def version(self) -> int:
+        return int.from_bytes(self._header[8:16], "little")
+
+    @property
+    def _free(self) -> int:
+        return int.from_bytes(self._header[4:8], "little")
+
+    @_free.setter
+    def _free(self, value: int) -> None:
+        # Setiap perubahan kursi menaikkan versi; jika indeks lokal sudah
+        # mengikuti perubahan ini, indeks tetap dianggap mutakhir
+        version = self.version
+        self._header[4:8] = value.to_bytes(4, "little")
+        self._header[8:16] = (version + 1).to_bytes(8, "little")
+        if self._seen_version == version:
+            self._seen_version = version + 1
+
+    @property
+    def log_seq(self) -> int:
+        return int.from_bytes(self._header[16:24], "little")
+
+    @log_seq.setter
+    def log_seq(self, value: int) -> None:
+        self._header[16:24] = value.to_bytes(8, "little")
+
+    def _adjust_free(self, delta: int) -> None:
+        # Versi di header dinaikkan oleh setter _free
+        if delta:
+            self._free += delta
+
+    def find_run(self, length: int) -> int:
+        version = self.version
+        if version != self._seen_version:
+            self._runs = None
+            self._seen_version = version
+        return super().find_run(length)
+
+    def _store_mask(self, mask: int) -> None:
+        super()._store_mask(mask)
+        self._seen_version = -1
+
+
+class SharedSeatStore:
+    """
+    Inventaris kursi per pertunjukan di multiprocessing.shared_memory.
+
+    Segmen dibuat sekali oleh proses induk (create) lalu dibuka oleh setiap
+    worker (attach). Slot pertunjukan dicari dengan open addressing atas hash
+    kunci pertunjukan; pembuatan dan penghapusan slot dikunci oleh lock
+    registry, sedangkan perubahan kursi dikunci per stripe pertunjukan.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        if fcntl is None:
+            raise RuntimeError("SharedSeatStore membutuhkan fcntl (POSIX)")
+
+        self._shm = shm
+        self._owner = owner
+        self.name = shm.name
+
+        buf = shm.buf
+        if bytes(buf[:4]) != MAGIC:
+            raise ValueError(f"Segmen shared memory '{shm.name}' bukan inventaris kursi")
+        self.slot_count = int.from_bytes(buf[4:8], "little")
+        self.capacity = int.from_bytes(buf[8:12], "little")
+        self._nbytes = (self.capacity + 7) // 8
+        self._slot_size = (SLOT_META_SIZE + SLOT_HEADER_SIZE + self._nbytes + 7) // 8 * 8
+
+        lock_path = os.path.join(tempfile.gettempdir(), f"{shm.name.lstrip('/')}.lock")
+        self._lock_path = lock_path
+        self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._locks: Dict[int, SharedShowLock] = {}
+        self._locks_guard = threading.Lock()
+        self._registry = self._stripe_lock(0)
+
+        # Cache per proses: kunci pertunjukan -> (nomor slot, peta kursi)
+        self._maps: Dict[ShowKey, Tuple[int, SharedSeatMap]] = {}
+
+    @classmethod
+    def create(cls, name: str, slot_count: int, capacity: int) -> "SharedSeatStore":
+        """
+        Membuat segmen shared memory baru.
+
+        Args:
+            name: Nama segmen
+            slot_count: Jumlah maksimal pertunjukan yang aktif bersamaan
+            capacity: Jumlah kursi maksimal per pertunjukan
+        """
+        nbytes = (capacity + 7) // 8
+        slot_size = (SLOT_META_SIZE + SLOT_HEADER_SIZE + nbytes + 7) // 8 * 8
+        shm = _open_shared_memory(name, create=True, size=HEADER_SIZE + slot_count * slot_size)
+        shm.buf[:HEADER_SIZE] = (MAGIC + slot_count.to_bytes(4, "little")
+                                 + capacity.to_bytes(4, "little") + bytes(4))
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedSeatStore":
+        """Membuka segmen yang sudah dibuat proses induk."""
+        return cls(_open_shared_memory(name), owner=False)
+
+    # ===================== LOCK =====================
+
+    def _stripe_lock(self, stripe: int) -> SharedShowLock:
+        lock = self._locks.get(stripe)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(stripe, SharedShowLock(self._lock_fd, stripe))
+        return lock
+
+    def lock_for(self, show_key: ShowKey) -> SharedShowLock:
+        """Lock lintas proses untuk pertunjukan; beberapa pertunjukan bisa berbagi stripe."""
+        return self._stripe_lock(1 + zlib.crc32(self._encode(show_key)) % (LOCK_STRIPES - 1))
+
+    # ===================== SLOT =====================
+
+    @staticmethod
+    def _encode(show_key: ShowKey) -> bytes:
+        encoded = json.dumps(list(show_key)).encode("utf-8")
+        if len(encoded) > KEY_SIZE:
+            raise ValueError("Kunci pertunjukan terlalu panjang untuk shared memory")
+        return encoded
+
+    def _slot_offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * self._slot_size
+
+    def _slot_matches(self, slot: int, padded: bytes) -> bool:
+        offset = self._slot_offset(slot)
+        buf = self._shm.buf
+        return buf[offset] == SLOT_USED and buf[offset + 1:offset + SLOT_META_SIZE] == padded
+
+    def _find(self, padded: bytes) -> Tuple[int, int]:
+        """
+        Returns:
+            (slot milik kunci atau -1, slot kosong pertama untuk disisipkan atau -1)
+        """
+        buf = self._shm.buf
+        start = zlib.crc32(padded) % self.slot_count
+        insert = -1
+        for step in range(self.slot_count):
+            slot = (start + step) % self.slot_count
+            state = buf[self._slot_offset(slot)]
+            if state == SLOT_EMPTY:
+                return -1, insert if insert >= 0 else slot
+            if state == SLOT_DELETED:
+                if insert < 0:
+                    insert = slot
+            elif self._slot_matches(slot, padded):
+                return slot, insert
+        return -1, insert
+
+    def _map_for_slot(self, slot: int) -> SharedSeatMap:
+        offset = self._slot_offset(slot) + SLOT_META_SIZE
+        buf = self._shm.buf
+        header = buf[offset:offset + SLOT_HEADER_SIZE]
+        size = int.from_bytes(header[0:4], "little")
+        bits = buf[offset + SLOT_HEADER_SIZE:offset + SLOT_HEADER_SIZE + self._nbytes]
+        return SharedSeatMap(size, header, bits)
+
+    def _allocate(self, slot: int, padded: bytes, size: int) -> None:
+        offset = self._slot_offset(slot)
+        buf = self._shm.buf
+        data = offset + SLOT_META_SIZE
+
+        template = SeatMap(size)
+        buf[data:data + 4] = size.to_bytes(4, "little")
+        buf[data + 4:data + 8] = size.to_bytes(4, "little")
+        buf[data + 8:data + 24] = bytes(16)
+        bitmap = data + SLOT_HEADER_SIZE
+        buf[bitmap:bitmap + self._nbytes] = template.to_mask().to_bytes(self._nbytes, "little")
+        buf[offset + 1:offset + SLOT_META_SIZE] = padded
+        # Status ditulis terakhir agar pembaca tanpa lock tidak melihat slot setengah jadi
+        buf[offset] = SLOT_USED
+
+    def get(self, show_key: ShowKey, create: bool = False, size: Optional[int] = None) -> Optional[SharedSeatMap]:
+        """
+        Mengambil peta kursi pertunjukan, membuat slot baru jika create=True.
+
+        Args:
+            show_key: Kunci pertunjukan
+            create: Buat slot jika belum ada
+            size: Jumlah kursi untuk slot baru (default kapasitas segmen)
+        """
+        padded = self._encode(show_key).ljust(KEY_SIZE, b"\0")
+
+        cached = self._maps.get(show_key)
+        if cached is not None:
+            if self._slot_matches(cached[0], padded):
+                return cached[1]
+            self._maps.pop(show_key, None)
+
+        slot, _ = self._find(padded)
+        if slot < 0:
+            if not create:
+                return None
+            with self._registry:
+                slot, insert = self._find(padded)
+                if slot < 0:
+                    if insert < 0:
+                        raise RuntimeError("Slot inventaris kursi di shared memory sudah penuh")
+                    slot = insert
+                    self._allocate(slot, padded, min(size or self.capacity, self.capacity))
+
+        seat_map = self._map_for_slot(slot)
+        self._maps[show_key] = (slot, seat_map)
+        return seat_map
+
+    def _slot_key(self, slot: int) -> Optional[ShowKey]:
+        offset = self._slot_offset(slot)
+        buf = self._shm.buf
+        if buf[offset] != SLOT_USED:
+            return None
+        return tuple(json.loads(bytes(buf[offset + 1:offset + SLOT_META_SIZE]).rstrip(b"\0")))
+
+    def show_keys(self) -> List[ShowKey]:
+        """Kunci semua pertunjukan yang punya slot, dipakai untuk snapshot journal."""
+        return [key for key in map(self._slot_key, range(self.slot_count)) if key is not None]
+
+    def purge(self, predicate: Callable[[ShowKey], bool]) -> int:
+        """
+        Menghapus slot pertunjukan yang memenuhi predicate. Slot yang lock-nya
+        sedang dipegang dilewati dan akan dihapus pada pembersihan berikutnya.
+
+        Returns:
+            Jumlah slot yang dihapus
+        """
+        removed = 0
+        buf = self._shm.buf
+        with self._registry:
+            for slot in range(self.slot_count):
+                show_key = self._slot_key(slot)
+                if show_key is None or not predicate(show_key):
+                    continue
+                offset = self._slot_offset(slot)
+                lock = self.lock_for(show_key)
+                if not lock.acquire_exclusive():
+                    continue
+                try:
+                    buf[offset] = SLOT_DELETED
+                finally:
+                    lock.release()
+                self._maps.pop(show_key, None)
+                removed += 1
+        return removed
+
+    # ===================== SIKLUS HIDUP =====================
+
+    def close(self) -> None:
+        """Melepas semua view ke segmen lalu menutupnya di proses ini."""
+        for _, seat_map in list(self._maps.values()):
+            seat_map._header.release()
+            seat_map._bits.release()
+        self._maps.clear()
+        try:
+            self._shm.close()
+        except BufferError:
+            # Masih ada peta kursi lama yang dipegang; segmen dilepas saat proses berakhir
+            pass
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Menghapus segmen dan file lock; hanya dilakukan oleh proses pembuat."""
+        if not self._owner:
+            return
+        self._shm.unlink()
+        try:
+            os.remove(self._lock_path)
+        except FileNotFoundError:
+            pass
@@ -3,6 +3,7 @@
 # ======================================
 # File: validation/ticket_validator.py
 
+from datetime import date
 from typing import Dict, List, Optional
 from config.config_manager import ConfigManager
 from core.services.film_service import get_film_schedule  
@@ -30,9 +31,19 @@ class TicketValidator:
 
     def __init__(self, config_manager: ConfigManager):
         self.config_manager = config_manager
-        self.loaded_config = self.config_manager.load_config()
-        self.film_data = self.loaded_config.get("film", [])
-        self.teater_data = self.config_manager.get_teater_info().get("tipe_teater", {})
+        # Pakai konfigurasi yang sudah dimuat pemanggil; parse hanya jika belum pernah dimuat
+        if self.config_manager.version == 0:
+            self.config_manager.load_config()
+        self.loaded_config = self.config_manager.config
+
+    @property
+    def film_data(self):
+        return self.config_manager.config.get("film", [])
+
+    @property
+    def teater_data(self):
+        # Selalu mengikuti snapshot konfigurasi yang sedang berlaku
+        return self.config_manager.get_teater_info().get("tipe_teater", {})
 
     def is_valid_film(self, film_title: str) -> bool:
         """
@@ -44,10 +55,7 @@ class TicketValidator:
         Returns:
             bool: True jika judul film valid
         """
-        return any(
-            film.get("judul", "").lower() == film_title.lower()
-            for film in self.film_data
-        )
+        return self.config_manager.get_film_catalog().get(film_title) is not None
 
     def get_valid_showtimes(self, film_title: str) -> Optional[List[str]]:
         """
@@ -59,10 +67,8 @@ class TicketValidator:
         Returns:
             List[str] | None: Daftar jam tayang jika tersedia
         """
-        for film in self.film_data:
-            if film.get("judul", "").lower() == film_title.lower():
-                return film.get("jadwal", [])
-        return None
+        film = self.config_manager.get_film_catalog().get(film_title)
+        return film.jadwal if film else None
 
     def is_valid_showtime(self, film_title: str, selected_time: str) -> bool:
         """
@@ -75,8 +81,7 @@ class TicketValidator:
         Returns:
             bool: True jika tersedia
         """
-        valid_times = self.get_valid_showtimes(film_title)
-        return selected_time in valid_times if valid_times else False
+        return self.config_manager.get_film_catalog().has_showtime(film_title, selected_time)
 
     def get_teater_by_film(self, film_title: str) -> Optional[str]:
         """
@@ -88,10 +93,8 @@ class TicketValidator:
         Returns:
             str | None: Nama teater jika ditemukan
         """
-        for film in self.film_data:
-            if film.get("judul", "").lower() == film_title.lower():
-                return film.get("teater")
-        return None
+        film = self.config_manager.get_film_catalog().get(film_title)
+        return film.teater if film else None
 
     def is_valid_teater(self, teater_name: str) -> bool:
         """
@@ -105,11 +108,43 @@ class TicketValidator:
         """
         return teater_name in self.teater_data
 
+    def is_valid_show_date(self, show_date: Optional[str]) -> bool:
+        """
+        Mengecek apakah tanggal pertunjukan berformat ISO (YYYY-MM-DD).
+
+        Args:
+            show_date (str | None): Tanggal pertunjukan, None berarti hari ini
+
+        Returns:
+            bool: True jika valid
+        """
+        if show_date is None:
+            return True
+        try:
+            date.fromisoformat(show_date)
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    def get_film_title(self, film_title: str) -> Optional[str]:
+        """
+        Mengambil judul film sesuai penulisan di konfigurasi.
+
+        Args:
+            film_title (str): Judul film (tidak peka huruf besar/kecil)
+
+        Returns:
+            str | None: Judul film jika ditemukan
+        """
+        film = self.config_manager.get_film_catalog().get(film_title)
+        return film.judul if film else None
+
     def validate_ticket_request(
         self,
         film_title: str,
         showtime: str,
-        ticket_count: int
+        ticket_count: int,
+        show_date: Optional[str] = None
     ) -> Dict[str, any]:
         """
         Validasi permintaan tiket pengguna.
@@ -118,30 +153,42 @@ class TicketValidator:
             film_title (str): Judul film
             showtime (str): Jam tayang
             ticket_count (int): Jumlah tiket
+            show_date (str | None): Tanggal pertunjukan (YYYY-MM-DD)
 
         Returns:
             Dict[str, any]: Hasil validasi dan pesan
         """
-        if not self.is_valid_film(film_title):
+        # Semua pengecekan memakai satu snapshot agar tidak tercampur konfigurasi lama dan baru
+        snapshot = self.config_manager.snapshot
+        catalog = snapshot.film_catalog
+        film = catalog.get(film_title)
+        if film is None:
             return {
                 "valid": False,
                 "message": f"❌ Film '{film_title}' tidak ditemukan."
             }
 
-        if not self.is_valid_showtime(film_title, showtime):
+        if not catalog.has_showtime(film_title, showtime):
             return {
                 "valid": False,
                 "message": f"❌ Jam tayang '{showtime}' tidak tersedia untuk film '{film_title}'."
             }
 
-        teater_name = self.get_teater_by_film(film_title)
-        if not self.is_valid_teater(teater_name):
+        if not self.is_valid_show_date(show_date):
+            return {
+                "valid": False,
+                "message": f"❌ Tanggal '{show_date}' tidak valid, gunakan format YYYY-MM-DD."
+            }
+
+        teater_name = film.teater
+        if teater_name not in snapshot.get_teater_info().get("tipe_teater", {}):
             return {
                 "valid": False,
                 "message": f"❌ Teater '{teater_name}' tidak valid atau belum terdaftar."
             }
 
-        max_seats = self.config_manager.get_max_kursi()
+        # Batas jumlah tiket mengikuti layout teater, bukan MAX_KURSI global
+        max_seats = snapshot.get_seat_count(teater_name)
         if ticket_count < 1 or ticket_count > max_seats:
             return {
                 "valid": False,
@@ -151,6 +198,7 @@ class TicketValidator:
         return {
             "valid": True,
             "message": "✅ Tiket valid untuk diproses.",
+            "film": film.judul,
             "teater": teater_name
         }
 
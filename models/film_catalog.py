@@ -0,0 +1,233 @@
+# ======================================
+# AutoTicket CLI Project
+# ======================================
+# File: film_catalog.py
+
+import hashlib
+import heapq
+import json
+from bisect import bisect_right
+from collections import Counter
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from models.entities import Film
+
+# Kunci urutan yang didukung; judul (casefold) selalu unik sehingga setiap kunci unik
+SORT_KEYS = {
+    "judul": lambda film: (film.judul.casefold(),),
+    "harga": lambda film: (film.harga_tiket, film.judul.casefold()),
+    "teater": lambda film: (film.teater.casefold(), film.judul.casefold()),
+}
+
+# Urutan asli film di konfigurasi
+CATALOG_ORDER = "katalog"
+
+
+def genre_tokens(genre: str) -> List[str]:
+    """Memecah string genre ("Action, Sci-Fi") menjadi token huruf kecil."""
+    return [token.strip().lower() for token in genre.split(",") if token.strip()]
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigram dari teks casefold yang diberi padding spasi di awal dan akhir."""
+    padded = f"  {text.casefold()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FilmCatalog:
+    """
+    Katalog film immutable yang dipakai bersama oleh facade, validator,
+    FilmService, dan PriceCalculator.
+
+    Dibangun sekali dari daftar film di konfigurasi, lalu menyediakan indeks:
+    - judul (casefold) -> film
+    - teater -> daftar film
+    - pasangan (judul casefold, jam tayang) yang valid
+    - token genre -> daftar film (inverted index)
+    - trigram judul -> daftar film, untuk pencarian judul yang toleran salah ketik
+    sehingga pencarian judul dan validasi jadwal bernilai O(1).
+
+    Untuk setiap kunci di SORT_KEYS juga disimpan urutan film yang sudah
+    diurutkan, sehingga daftar terurut dan paginasi tidak perlu mengurutkan
+    ulang per permintaan.
+
+    Atribut version adalah hash isi katalog: sama di semua proses untuk data
+    yang sama dan berubah setiap kali data film berubah.
+    """
+
+    __slots__ = ("_films", "_raw", "_by_title", "_by_teater", "_showtimes", "_version", "_orders",
+                 "_by_genre", "_by_trigram", "_trigram_counts")
+
+    def __init__(self, film_data: List[Dict[str, Any]]):
+        films = []
+        raw = []
+        by_title: Dict[str, int] = {}
+        by_teater: Dict[str, List[int]] = {}
+        showtimes = set()
+        by_genre: Dict[str, List[int]] = {}
+        by_trigram: Dict[str, List[int]] = {}
+        trigram_counts: List[int] = []
+
+        for data in film_data:
+            film = Film(**data)
+            key = film.judul.casefold()
+            if key in by_title:
+                # Judul ganda: entri pertama yang dipakai, sama seperti pencarian linear sebelumnya
+                continue
+
+            index = len(films)
+            films.append(film)
+            raw.append(MappingProxyType(dict(data)))
+            by_title[key] = index
+            by_teater.setdefault(film.teater, []).append(index)
+            showtimes.update((key, jam) for jam in film.jadwal)
+            for token in dict.fromkeys(genre_tokens(film.genre)):
+                by_genre.setdefault(token, []).append(index)
+            title_trigrams = trigrams(film.judul)
+            trigram_counts.append(len(title_trigrams))
+            for trigram in title_trigrams:
+                by_trigram.setdefault(trigram, []).append(index)
+
+        self._films: Tuple[Film, ...] = tuple(films)
+        self._raw: Tuple[Mapping[str, Any], ...] = tuple(raw)
+        self._by_title = by_title
+        self._by_teater = {teater: tuple(indices) for teater, indices in by_teater.items()}
+        self._showtimes = frozenset(showtimes)
+        self._by_genre = {token: tuple(indices) for token, indices in by_genre.items()}
+        self._by_trigram = {trigram: tuple(indices) for trigram, indices in by_trigram.items()}
+        self._trigram_counts = tuple(trigram_counts)
+        encoded = json.dumps(self._raw, sort_keys=True, default=dict).encode("utf-8")
+        self._version = hashlib.sha256(encoded).hexdigest()[:32]
+
+        # sort_by -> (kunci terurut, indeks film sesuai urutan kunci);
+        # "katalog" adalah urutan asli di konfigurasi
+        self._orders: Dict[str, Tuple[Tuple[tuple, ...], Tuple[int, ...]]] = {
+            CATALOG_ORDER: (tuple((index,) for index in range(len(self._films))), tuple(range(len(self._films))))
+        }
+        for sort_by, sort_key in SORT_KEYS.items():
+            ordered = sorted((sort_key(film), index) for index, film in enumerate(self._films))
+            self._orders[sort_by] = (
+                tuple(key for key, _ in ordered),
+                tuple(index for _, index in ordered)
+            )
+
+    def __len__(self) -> int:
+        return len(self._films)
+
+    def __iter__(self) -> Iterator[Film]:
+        return iter(self._films)
+
+    @property
+    def films(self) -> Tuple[Film, ...]:
+        return self._films
+
+    @property
+    def version(self) -> str:
+        """Hash isi katalog, dipakai sebagai ETag endpoint katalog."""
+        return self._version
+
+    @property
+    def raw_films(self) -> Tuple[Mapping[str, Any], ...]:
+        """Data film mentah dari konfigurasi (read-only)."""
+        return self._raw
+
+    def get(self, title: str) -> Optional[Film]:
+        """Mencari film berdasarkan judul, tidak peka huruf besar/kecil."""
+        index = self._by_title.get(title.casefold())
+        return self._films[index] if index is not None else None
+
+    def get_raw(self, title: str) -> Optional[Mapping[str, Any]]:
+        index = self._by_title.get(title.casefold())
+        return self._raw[index] if index is not None else None
+
+    def has_showtime(self, title: str, showtime: str) -> bool:
+        return (title.casefold(), showtime) in self._showtimes
+
+    def by_teater(self, teater_name: str) -> List[Film]:
+        return [self._films[i] for i in self._by_teater.get(teater_name, ())]
+
+    def raw_by_teater(self, teater_name: str) -> List[Mapping[str, Any]]:
+        return [self._raw[i] for i in self._by_teater.get(teater_name, ())]
+
+    def sorted_films(self, sort_by: str) -> List[Film]:
+        """Daftar film menurut kunci urutan (KeyError jika tidak dikenal)."""
+        return [self._films[i] for i in self._orders[sort_by][1]]
+
+    def sorted_indices(self, sort_by: str) -> Tuple[int, ...]:
+        return self._orders[sort_by][1]
+
+    def sort_position(self, sort_by: str, after_key: tuple) -> int:
+        """Posisi pertama dalam urutan sort_by yang kuncinya lebih besar dari after_key."""
+        return bisect_right(self._orders[sort_by][0], after_key)
+
+    def has_order(self, sort_by: str) -> bool:
+        return sort_by in self._orders
+
+    def sort_key(self, sort_by: str, film: Film) -> tuple:
+        if sort_by == CATALOG_ORDER:
+            return (self._by_title[film.judul.casefold()],)
+        return SORT_KEYS[sort_by](film)
+
+    # ===================== PENCARIAN =====================
+
+    def genre_indices(self, genre: str) -> Tuple[int, ...]:
+        """
+        Indeks film (urutan katalog) dengan genre yang cocok. Token yang sama
+        persis diambil langsung dari inverted index; selain itu token yang
+        mengandung kata kunci digabungkan, sama seperti pencocokan substring sebelumnya.
+        """
+        query = genre.strip().lower()
+        exact = self._by_genre.get(query)
+        if exact is not None:
+            return exact
+        matched = set()
+        for token, indices in self._by_genre.items():
+            if query in token:
+                matched.update(indices)
+        return tuple(sorted(matched))
+
+    def by_genre(self, genre: str) -> List[Film]:
+        return [self._films[i] for i in self.genre_indices(genre)]
+
+    def raw_by_genre(self, genre: str) -> List[Mapping[str, Any]]:
+        return [self._raw[i] for i in self.genre_indices(genre)]
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.3) -> List[Tuple[Film, float]]:
+        """
+        Pencarian film berperingkat berdasarkan kemiripan trigram judul
+        (rata-rata Jaccard dan porsi trigram kata kunci yang ditemukan di
+        judul, agar salah ketik pada judul panjang tetap cocok), dengan skor
+        tambahan untuk judul yang mengandung kata kunci dan film yang
+        genre-nya cocok.
+
+        Returns:
+            Daftar (film, skor 0..1) terurut dari skor tertinggi
+        """
+        text = query.strip().casefold()
+        if not text:
+            return []
+
+        query_trigrams = trigrams(text)
+        shared: Counter = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._by_trigram.get(trigram, ()))
+
+        scores: Dict[int, float] = {}
+        for index, count in shared.items():
+            jaccard = count / (len(query_trigrams) + self._trigram_counts[index] - count)
+            scores[index] = (jaccard + count / len(query_trigrams)) / 2
+            judul = self._films[index].judul.casefold()
+            if judul == text:
+                scores[index] = 1.0
+            elif text in judul:
+                scores[index] = max(scores[index], 0.6 + 0.4 * len(text) / len(judul))
+
+        for index in self._by_genre.get(text, ()):
+            scores[index] = max(scores.get(index, 0.0), 0.5)
+
+        ranked = heapq.nsmallest(
+            limit,
+            ((-score, index) for index, score in scores.items() if score >= min_score)
+        )
+        return [(self._films[index], round(-score, 4)) for score, index in ranked]
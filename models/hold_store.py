@@ -0,0 +1,139 @@
+# ======================================
+# AutoTicket CLI Project
+# ======================================
+# File: hold_store.py
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS holds (
+    hold_id TEXT PRIMARY KEY,
+    show_key TEXT NOT NULL,
+    indices TEXT NOT NULL,
+    kursi TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_holds_show ON holds (show_key);
+CREATE INDEX IF NOT EXISTS idx_holds_expiry ON holds (expires_at);
+"""
+
+INSERT_HOLD = "INSERT INTO holds (hold_id, show_key, indices, kursi, expires_at) VALUES (?, ?, ?, ?, ?)"
+SELECT_HOLD = "SELECT * FROM holds WHERE hold_id = ?"
+DELETE_HOLD = "DELETE FROM holds WHERE hold_id = ?"
+
+# Jeda minimal (detik) antar pengecekan hold kedaluwarsa milik worker lain
+SWEEP_INTERVAL = 1.0
+
+
+class HoldStore:
+    """
+    Daftar hold kursi sementara di SQLite, dipakai bersama semua worker API.
+
+    Antarmukanya sama dengan HoldRegistry. Setiap perubahan langsung
+    di-commit agar worker lain bisa mengonfirmasi, membatalkan, atau
+    mengedarkan hold yang kedaluwarsa. Hold diubah di bawah lock
+    pertunjukan lintas proses; penghapusan tetap dicek lewat rowcount
+    sehingga satu hold hanya diambil satu kali.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: Lokasi file database SQLite (boleh sama dengan RESERVATION_DB)
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._next_sweep = 0.0
+
+        connection = self._connection()
+        connection.executescript(SCHEMA)
+        connection.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30, cached_statements=64)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _row_to_hold(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "hold_id": row["hold_id"],
+            "show_key": tuple(json.loads(row["show_key"])),
+            "indices": json.loads(row["indices"]),
+            "kursi": json.loads(row["kursi"]),
+            "expires_at": row["expires_at"]
+        }
+
+    def add(self, hold: Dict[str, Any]) -> None:
+        with self._connection() as connection:
+            connection.execute(INSERT_HOLD, (
+                hold["hold_id"], json.dumps(list(hold["show_key"])), json.dumps(hold["indices"]),
+                json.dumps(hold["kursi"]), hold["expires_at"]
+            ))
+
+    def get(self, hold_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(SELECT_HOLD, (hold_id,)).fetchone()
+        return self._row_to_hold(row) if row is not None else None
+
+    def take(self, hold_id: str) -> Optional[Dict[str, Any]]:
+        """Menghapus hold dan mengembalikan datanya, atau None jika sudah diambil worker lain."""
+        hold = self.get(hold_id)
+        if hold is None:
+            return None
+        with self._connection() as connection:
+            if connection.execute(DELETE_HOLD, (hold_id,)).rowcount == 0:
+                return None
+        return hold
+
+    def held_indices(self, show_key: Tuple) -> Set[int]:
+        rows = self._connection().execute(
+            "SELECT indices FROM holds WHERE show_key = ?", (json.dumps(list(show_key)),)
+        )
+        return {index for row in rows for index in json.loads(row["indices"])}
+
+    def has_due(self, now: float) -> bool:
+        # Hold worker lain tidak terlihat di memori; database dicek paling sering tiap SWEEP_INTERVAL
+        if time.monotonic() < self._next_sweep:
+            return False
+        self._next_sweep = time.monotonic() + SWEEP_INTERVAL
+        row = self._connection().execute("SELECT 1 FROM holds WHERE expires_at <= ? LIMIT 1", (now,)).fetchone()
+        return row is not None
+
+    def due(self, now: float) -> Dict[Tuple, List[str]]:
+        """Hold yang sudah kedaluwarsa dari semua worker, dikelompokkan per pertunjukan."""
+        due: Dict[Tuple, List[str]] = {}
+        for row in self._connection().execute("SELECT hold_id, show_key FROM holds WHERE expires_at <= ?", (now,)):
+            due.setdefault(tuple(json.loads(row["show_key"])), []).append(row["hold_id"])
+        return due
+
+    def discard_shows(self, predicate: Callable[[Tuple], bool]) -> None:
+        """Menghapus hold pertunjukan yang sudah dihapus dari inventaris."""
+        connection = self._connection()
+        keys = [row["show_key"] for row in connection.execute("SELECT DISTINCT show_key FROM holds")]
+        selesai = [(key,) for key in keys if predicate(tuple(json.loads(key)))]
+        if selesai:
+            with connection:
+                connection.executemany("DELETE FROM holds WHERE show_key = ?", selesai)
+
+    def clear(self) -> None:
+        """
+        Menghapus semua hold. Dipanggil proses induk sebelum worker dimulai:
+        kursi yang ditahan tidak dipulihkan dari journal, jadi hold lama tidak berlaku lagi.
+        """
+        with self._connection() as connection:
+            connection.execute("DELETE FROM holds")
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
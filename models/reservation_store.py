@@ -0,0 +1,406 @@
+# ======================================
+# AutoTicket CLI Project
+# ======================================
+# File: reservation_store.py
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reservations (
+    reservation_id TEXT PRIMARY KEY,
+    film TEXT NOT NULL,
+    teater TEXT NOT NULL,
+    jadwal TEXT NOT NULL,
+    tanggal TEXT NOT NULL,
+    jumlah_tiket INTEGER NOT NULL,
+    is_holiday INTEGER NOT NULL,
+    is_member INTEGER NOT NULL,
+    harga INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reservation_seats (
+    reservation_id TEXT NOT NULL REFERENCES reservations(reservation_id),
+    kursi TEXT NOT NULL,
+    PRIMARY KEY (reservation_id, kursi)
+);
+CREATE INDEX IF NOT EXISTS idx_reservations_show ON reservations (film, tanggal, jadwal);
+"""
+
+# INSERT biasa: ID yang sudah ada memicu IntegrityError, tidak menimpa reservasi worker lain
+INSERT_RESERVATION = """
+INSERT INTO reservations
+    (reservation_id, film, teater, jadwal, tanggal, jumlah_tiket, is_holiday, is_member, harga, status, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSERT_SEAT = "INSERT OR IGNORE INTO reservation_seats (reservation_id, kursi) VALUES (?, ?)"
+UPDATE_STATUS = "UPDATE reservations SET status = ? WHERE reservation_id = ?"
+UPDATE_RELEASED = "UPDATE reservations SET status = ?, jumlah_tiket = ? WHERE reservation_id = ?"
+DELETE_SEAT = "DELETE FROM reservation_seats WHERE reservation_id = ? AND kursi = ?"
+COUNT_SEATS = "SELECT COUNT(*) FROM reservation_seats WHERE reservation_id = ?"
+SELECT_RESERVATION = "SELECT * FROM reservations WHERE reservation_id = ?"
+SELECT_SEATS = "SELECT kursi FROM reservation_seats WHERE reservation_id = ? ORDER BY rowid"
+
+# Percobaan ulang satu batch sebelum batch dibuang dan dicatat di log
+WRITE_RETRIES = 3
+
+logger = logging.getLogger(__name__)
+
+
+class ReservationStore:
+    """
+    Penyimpanan riwayat reservasi berbasis SQLite (mode WAL).
+
+    Setiap thread memakai koneksinya sendiri untuk membaca. Semua penulisan
+    dikirim ke antrean dan dieksekusi oleh satu thread writer yang
+    menggabungkan banyak reservasi ke dalam satu transaksi, sehingga endpoint
+    pemesanan tidak menunggu commit. Reservasi yang masih di antrean tetap
+    bisa dibaca lewat cache pending. Batch yang tetap gagal setelah
+    WRITE_RETRIES percobaan dicatat di log lalu dibuang agar writer tetap
+    berjalan dan flush() tidak menunggu selamanya.
+
+    Dengan write_through=True (mode multi-worker) setiap penulisan langsung
+    di-commit oleh thread pemanggil agar worker lain segera melihatnya, dan
+    pembatalan memakai cancel/release_owned yang mengklaim baris secara atomik.
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 500, flush_interval: float = 0.05,
+                 write_through: bool = False):
+        """
+        Args:
+            db_path: Lokasi file database SQLite
+            batch_size: Jumlah maksimal operasi per transaksi
+            flush_interval: Waktu tunggu maksimal (detik) sebelum batch ditulis
+            write_through: Commit langsung tanpa antrean writer (dipakai bersama beberapa proses)
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.write_through = write_through
+
+        self._local = threading.local()
+        self._queue: "queue.Queue[Optional[Tuple[str, Any]]]" = queue.Queue()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+
+        connection = self._connection()
+        connection.executescript(SCHEMA)
+        connection.commit()
+
+        self._writer: Optional[threading.Thread] = None
+        if not write_through:
+            self._writer = threading.Thread(target=self._write_loop, name="reservation-writer", daemon=True)
+            self._writer.start()
+        atexit.register(self.close)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Statement yang sama dipakai ulang dari cache statement per koneksi
+            connection = sqlite3.connect(self.db_path, timeout=30, cached_statements=64)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    # ===================== PENULISAN (ASINKRON) =====================
+
+    def save(self, reservation: Dict[str, Any]) -> None:
+        """
+        Menyimpan reservasi hasil book_tickets/reserve_seats tanpa menunggu commit.
+        """
+        record = {
+            "reservation_id": reservation["reservation_id"],
+            "film": reservation["film"],
+            "teater": reservation["teater"],
+            "jadwal": reservation["jadwal"],
+            "tanggal": reservation["tanggal"],
+            "kursi": list(reservation["kursi"]),
+            "jumlah_tiket": reservation["jumlah_tiket"],
+            "is_holiday": bool(reservation.get("is_holiday", False)),
+            "is_member": bool(reservation.get("is_member", False)),
+            "harga": reservation["harga"],
+            "status": reservation.get("status", "confirmed"),
+            "created_at": time.time()
+        }
+        self._submit("save", record)
+
+    def update_status(self, reservation_id: str, status: str) -> None:
+        with self._pending_lock:
+            if reservation_id in self._pending:
+                self._pending[reservation_id] = dict(self._pending[reservation_id], status=status)
+        self._submit("status", (status, reservation_id))
+
+    def release_seats(self, reservation_id: str, seats: List[str], status: str) -> None:
+        """
+        Menghapus kursi yang dibebaskan dari reservasi dan memperbarui statusnya
+        ("partially_released", atau "cancelled" jika tidak ada kursi tersisa).
+        """
+        with self._pending_lock:
+            if reservation_id in self._pending:
+                record = self._pending[reservation_id]
+                kursi = [seat for seat in record["kursi"] if seat not in seats]
+                self._pending[reservation_id] = dict(record, kursi=kursi, jumlah_tiket=len(kursi), status=status)
+        self._submit("release", {"reservation_id": reservation_id, "kursi": list(seats), "status": status})
+
+    def _submit(self, op: str, payload: Any) -> None:
+        if self.write_through:
+            self._write_with_retry(self._connection(), [(op, payload)])
+            return
+        if op == "save":
+            with self._pending_lock:
+                self._pending[payload["reservation_id"]] = payload
+        self._queue.put((op, payload))
+
+    def _write_loop(self) -> None:
+        connection = self._connection()
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while item is not None and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            try:
+                self._write_with_retry(connection, [op for op in batch if op is not None])
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is None:
+                connection.close()
+                return
+
+    def _write_with_retry(self, connection: sqlite3.Connection, batch: List[Tuple[str, Any]]) -> None:
+        """
+        Menulis batch dengan percobaan ulang untuk kesalahan sementara.
+        IntegrityError (ID reservasi ganda) tidak dicoba ulang: dalam mode
+        write-through diteruskan ke pemanggil, dalam mode antrean hanya
+        operasi yang bertabrakan yang dibuang.
+        """
+        for attempt in range(WRITE_RETRIES):
+            try:
+                self._write_batch(connection, batch)
+                return
+            except sqlite3.IntegrityError as error:
+                if self.write_through:
+                    raise
+                if len(batch) > 1:
+                    for item in batch:
+                        self._write_with_retry(connection, [item])
+                    return
+                op, payload = batch[0]
+                logger.error("Operasi %s reservasi %s ditolak %s: %s", op,
+                             payload[1] if op == "status" else payload["reservation_id"], self.db_path, error)
+                break
+            except sqlite3.Error as error:
+                if attempt + 1 < WRITE_RETRIES:
+                    time.sleep(self.flush_interval * 2 ** attempt)
+                    continue
+                logger.error("Gagal menyimpan %d operasi reservasi ke %s: %s", len(batch), self.db_path, error)
+
+        # Reservasi yang dibuang tidak disimpan lagi di cache pending
+        with self._pending_lock:
+            for op, payload in batch:
+                self._pending.pop(payload[1] if op == "status" else payload["reservation_id"], None)
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: List[Tuple[str, Any]]) -> None:
+        if not batch:
+            return
+
+        reservations, seats, updates = [], [], []
+        for op, payload in batch:
+            if op == "save":
+                reservations.append((
+                    payload["reservation_id"], payload["film"], payload["teater"], payload["jadwal"],
+                    payload["tanggal"], payload["jumlah_tiket"], int(payload["is_holiday"]),
+                    int(payload["is_member"]), payload["harga"], payload["status"], payload["created_at"]
+                ))
+                seats.extend((payload["reservation_id"], kursi) for kursi in payload["kursi"])
+            else:
+                updates.append((op, payload))
+
+        with connection:
+            connection.executemany(INSERT_RESERVATION, reservations)
+            connection.executemany(INSERT_SEAT, seats)
+            # Perubahan status dan pembebasan kursi dijalankan sesuai urutan antrean
+            for op, payload in updates:
+                if op == "status":
+                    connection.execute(UPDATE_STATUS, payload)
+                    continue
+                reservation_id = payload["reservation_id"]
+                connection.executemany(DELETE_SEAT, [(reservation_id, kursi) for kursi in payload["kursi"]])
+                remaining = connection.execute(COUNT_SEATS, (reservation_id,)).fetchone()[0]
+                connection.execute(UPDATE_RELEASED, (payload["status"], remaining, reservation_id))
+
+        with self._pending_lock:
+            for op, payload in batch:
+                self._pending.pop(payload[1] if op == "status" else payload["reservation_id"], None)
+
+    def flush(self) -> None:
+        """Menunggu hingga semua penulisan di antrean sudah di-commit."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._writer is None or not self._writer.is_alive():
+            return
+        self._queue.put(None)
+        self._writer.join()
+
+    # ===================== KLAIM ATOMIK (MODE MULTI-WORKER) =====================
+
+    def cancel(self, reservation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Menandai reservasi dibatalkan hanya jika belum dibatalkan, dalam satu
+        UPDATE, sehingga dua worker tidak membebaskan kursi yang sama.
+
+        Returns:
+            Reservasi sebelum dibatalkan, atau None jika tidak ada/sudah dibatalkan
+        """
+        reservation = self.get(reservation_id)
+        if reservation is None or reservation["status"] == "cancelled":
+            return None
+        with self._connection() as connection:
+            claimed = connection.execute(
+                "UPDATE reservations SET status = 'cancelled' WHERE reservation_id = ? AND status != 'cancelled'",
+                (reservation_id,)
+            ).rowcount
+        return reservation if claimed else None
+
+    def release_owned(self, teater: str, film_title: str, showtime: str, show_date: str,
+                      seats: List[str]) -> Optional[Dict[str, Tuple[List[str], str]]]:
+        """
+        Melepas kursi dari reservasi aktif pemiliknya dalam satu transaksi.
+        Jika ada kursi yang tidak dimiliki reservasi aktif, tidak ada yang diubah.
+
+        Returns:
+            ID reservasi -> (kursi yang dilepas, status baru), atau None jika ada kursi tanpa pemilik
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            rows = connection.execute(
+                "SELECT s.reservation_id, s.kursi FROM reservation_seats AS s "
+                "JOIN reservations AS r ON r.reservation_id = s.reservation_id "
+                "WHERE r.teater = ? AND r.film = ? AND r.jadwal = ? AND r.tanggal = ? AND r.status != 'cancelled' "
+                f"AND s.kursi IN ({', '.join('?' * len(seats))})",
+                [teater, film_title, showtime, show_date, *seats]
+            ).fetchall()
+            if {row["kursi"] for row in rows} != set(seats):
+                connection.rollback()
+                return None
+
+            released: Dict[str, Tuple[List[str], str]] = {}
+            for row in rows:
+                released.setdefault(row["reservation_id"], ([], ""))[0].append(row["kursi"])
+            for reservation_id, (names, _) in released.items():
+                connection.executemany(DELETE_SEAT, [(reservation_id, kursi) for kursi in names])
+                remaining = connection.execute(COUNT_SEATS, (reservation_id,)).fetchone()[0]
+                status = "partially_released" if remaining else "cancelled"
+                connection.execute(UPDATE_RELEASED, (status, remaining, reservation_id))
+                released[reservation_id] = (names, status)
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        return released
+
+    # ===================== PEMBACAAN =====================
+
+    def get(self, reservation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Mengambil reservasi berdasarkan ID, termasuk yang belum di-commit.
+        """
+        with self._pending_lock:
+            pending = self._pending.get(reservation_id)
+        if pending is not None:
+            return dict(pending)
+
+        connection = self._connection()
+        row = connection.execute(SELECT_RESERVATION, (reservation_id,)).fetchone()
+        if row is None:
+            return None
+
+        reservation = self._row_to_dict(row)
+        reservation["kursi"] = [seat["kursi"] for seat in connection.execute(SELECT_SEATS, (reservation_id,))]
+        return reservation
+
+    def find(self, film_title: Optional[str] = None, show_date: Optional[str] = None,
+             showtime: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Mencari reservasi yang sudah tersimpan, terbaru lebih dulu.
+        """
+        conditions, params = [], []
+        for column, value in (("film", film_title), ("tanggal", show_date), ("jadwal", showtime)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+
+        sql = "SELECT * FROM reservations"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        # Satu query: reservasi terbaru digabung dengan kursinya, lalu dikelompokkan per reservasi
+        sql = (
+            f"SELECT r.*, s.kursi AS seat FROM ({sql}) AS r "
+            "LEFT JOIN reservation_seats AS s ON s.reservation_id = r.reservation_id "
+            "ORDER BY r.created_at DESC, r.reservation_id DESC, s.rowid"
+        )
+        result: Dict[str, Dict[str, Any]] = {}
+        for row in self._connection().execute(sql, params):
+            reservation = result.get(row["reservation_id"])
+            if reservation is None:
+                reservation = result[row["reservation_id"]] = self._row_to_dict(row)
+                reservation.pop("seat")
+                reservation["kursi"] = []
+            if row["seat"] is not None:
+                reservation["kursi"].append(row["seat"])
+        return list(result.values())
+
+    def find_seat_owners(self, teater: str, film_title: str, showtime: str, show_date: str,
+                         seats: List[str]) -> List[Dict[str, Any]]:
+        """
+        Mencari reservasi aktif satu pertunjukan yang memiliki salah satu kursi, termasuk yang belum di-commit.
+        """
+        wanted = set(seats)
+        if not wanted:
+            return []
+        show = {"teater": teater, "film": film_title, "jadwal": showtime, "tanggal": show_date}
+        with self._pending_lock:
+            owners = {
+                reservation_id: dict(record) for reservation_id, record in self._pending.items()
+                if record["status"] != "cancelled" and wanted.intersection(record["kursi"])
+                and all(record[column] == value for column, value in show.items())
+            }
+
+        sql = (
+            "SELECT DISTINCT r.reservation_id FROM reservations AS r "
+            "JOIN reservation_seats AS s ON s.reservation_id = r.reservation_id "
+            "WHERE r.teater = ? AND r.film = ? AND r.jadwal = ? AND r.tanggal = ? AND r.status != 'cancelled' "
+            f"AND s.kursi IN ({', '.join('?' * len(wanted))})"
+        )
+        for row in self._connection().execute(sql, [teater, film_title, showtime, show_date, *wanted]):
+            if row["reservation_id"] not in owners:
+                reservation = self.get(row["reservation_id"])
+                if reservation is not None:
+                    owners[row["reservation_id"]] = reservation
+        return list(owners.values())
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        reservation = dict(row)
+        reservation["is_holiday"] = bool(reservation["is_holiday"])
+        reservation["is_member"] = bool(reservation["is_member"])
+        return reservation
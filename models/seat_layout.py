@@ -0,0 +1,186 @@
+# ======================================
+# AutoTicket CLI Project
+# ======================================
+# File: seat_layout.py
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Jumlah kursi per baris untuk teater tanpa layout di konfigurasi
+DEFAULT_KURSI_PER_BARIS = 10
+DEFAULT_KELAS = "reguler"
+
+# Posisi baris ideal sebagai porsi kedalaman teater (0 = baris terdepan di depan layar)
+IDEAL_ROW_DEPTH = 2 / 3
+
+
+def row_label(row: int) -> str:
+    """Nama baris ke-row (0 -> A, 25 -> Z, 26 -> AA, 27 -> AB, ...)."""
+    label = ""
+    row += 1
+    while row:
+        row, remainder = divmod(row - 1, 26)
+        label = chr(65 + remainder) + label
+    return label
+
+
+class SeatRow:
+    """Satu baris kursi: nama, nomor kursi pertama, jumlah kursi, posisi lorong, dan kelas."""
+
+    __slots__ = ("nama", "awal", "jumlah", "celah", "kelas")
+
+    def __init__(self, nama: str, awal: int, jumlah: int, celah: Tuple[int, ...], kelas: str):
+        self.nama = nama
+        self.awal = awal
+        self.jumlah = jumlah
+        self.celah = celah
+        self.kelas = kelas
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"nama": self.nama, "awal": self.awal, "jumlah": self.jumlah,
+                "celah": list(self.celah), "kelas": self.kelas}
+
+
+class SeatLayout:
+    """
+    Denah kursi satu teater.
+
+    Kursi diberi nomor indeks berurutan baris demi baris. Tabel nama -> indeks
+    dan indeks -> nama dibangun sekali saat layout dibuat, sehingga penamaan
+    dan penguraian nama kursi cukup berupa lookup. Lorong (celah) dicatat
+    sebagai nomor kursi di baris tersebut yang diikuti lorong.
+
+    Setiap kursi juga punya skor kualitas 0..1 yang dihitung sekali dari
+    posisinya: makin dekat ke tengah baris dan ke baris ideal (sekitar dua
+    pertiga ke belakang dari layar), makin tinggi skornya. Blok N kursi
+    bersebelahan (tidak melewati lorong atau pindah baris) dinilai dari
+    rata-rata skor kursinya dan dihitung sekali per N.
+    """
+
+    __slots__ = ("rows", "size", "_names", "_indices", "_row_of", "_scores", "_blocks")
+
+    def __init__(self, rows: Sequence[SeatRow]):
+        self.rows: Tuple[SeatRow, ...] = tuple(rows)
+        names: List[str] = []
+        row_of: List[int] = []
+        for row_number, row in enumerate(self.rows):
+            names.extend(f"{row.nama}{nomor}" for nomor in range(1, row.jumlah + 1))
+            row_of.extend([row_number] * row.jumlah)
+        self.size = len(names)
+        self._names: Tuple[str, ...] = tuple(names)
+        self._indices: Dict[str, int] = {name: index for index, name in enumerate(names)}
+        self._row_of: Tuple[int, ...] = tuple(row_of)
+        self._scores: Tuple[float, ...] = self._score_seats()
+        # panjang blok -> {nomor kursi awal: skor blok}
+        self._blocks: Dict[int, Dict[int, float]] = {}
+
+    @classmethod
+    def uniform(cls, size: int, kursi_per_baris: int = DEFAULT_KURSI_PER_BARIS,
+                kelas: str = DEFAULT_KELAS) -> "SeatLayout":
+        """Layout persegi: baris A, B, ... masing-masing kursi_per_baris kursi (baris terakhir bisa lebih pendek)."""
+        rows = []
+        for row, awal in enumerate(range(0, size, kursi_per_baris)):
+            rows.append(SeatRow(row_label(row), awal, min(kursi_per_baris, size - awal), (), kelas))
+        return cls(rows)
+
+    @classmethod
+    def from_config(cls, data: Mapping[str, Any]) -> "SeatLayout":
+        """
+        Membuat layout dari konfigurasi teater, salah satu dari:
+        - {"baris": 30, "kursi_per_baris": 20, "celah": [5, 15], "kelas": "reguler"}
+        - {"baris": [{"nama": "A", "jumlah": 12, "celah": [6], "kelas": "premium"}, ...]}
+        Nama baris yang tidak diberikan mengikuti urutan A..Z, AA, AB, ...
+        """
+        baris = data.get("baris")
+        default_kelas = data.get("kelas", DEFAULT_KELAS)
+        if isinstance(baris, int):
+            specs = [{"jumlah": data.get("kursi_per_baris", DEFAULT_KURSI_PER_BARIS),
+                      "celah": data.get("celah", ())}] * baris
+        elif isinstance(baris, (list, tuple)) and baris:
+            specs = baris
+        else:
+            raise ValueError("Layout teater harus memiliki 'baris' berupa jumlah baris atau daftar baris")
+
+        rows = []
+        awal = 0
+        seen = set()
+        for row, spec in enumerate(specs):
+            if not isinstance(spec, Mapping):
+                raise ValueError(f"Baris ke-{row + 1} pada layout teater harus berupa objek")
+            jumlah = spec.get("jumlah", data.get("kursi_per_baris", DEFAULT_KURSI_PER_BARIS))
+            if not isinstance(jumlah, int) or jumlah <= 0:
+                raise ValueError(f"Jumlah kursi baris ke-{row + 1} tidak valid: {jumlah!r}")
+            nama = str(spec.get("nama", row_label(row))).upper()
+            if nama in seen or not nama.isalpha():
+                raise ValueError(f"Nama baris '{nama}' tidak valid atau ganda")
+            seen.add(nama)
+            celah = tuple(sorted(int(posisi) for posisi in spec.get("celah", ()) if 0 < int(posisi) < jumlah))
+            rows.append(SeatRow(nama, awal, jumlah, celah, spec.get("kelas", default_kelas)))
+            awal += jumlah
+        return cls(rows)
+
+    def same_seats(self, other: "SeatLayout") -> bool:
+        """True jika kedua layout punya nama kursi yang sama pada nomor indeks yang sama."""
+        return self._names == other._names
+
+    def name(self, index: int) -> Optional[str]:
+        """Nama kursi untuk nomor indeks, atau None jika di luar layout."""
+        if 0 <= index < self.size:
+            return self._names[index]
+        return None
+
+    def index(self, seat_name: str) -> int:
+        """Nomor indeks kursi dari namanya (tidak peka huruf besar/kecil), atau -1."""
+        return self._indices.get(seat_name.strip().upper(), -1)
+
+    def row_of(self, index: int) -> SeatRow:
+        return self.rows[self._row_of[index]]
+
+    def seat_class(self, index: int) -> str:
+        return self.row_of(index).kelas
+
+    # ===================== SKOR KURSI =====================
+
+    def _score_seats(self) -> Tuple[float, ...]:
+        ideal = (len(self.rows) - 1) * IDEAL_ROW_DEPTH
+        row_span = max(ideal, len(self.rows) - 1 - ideal) or 1
+        scores = []
+        for row_number, row in enumerate(self.rows):
+            depth = abs(row_number - ideal) / row_span
+            centre = (row.jumlah - 1) / 2
+            for posisi in range(row.jumlah):
+                side = abs(posisi - centre) / centre if centre else 0.0
+                scores.append(round(1 - (depth + side) / 2, 6))
+        return tuple(scores)
+
+    def seat_score(self, index: int) -> float:
+        return self._scores[index]
+
+    def blocks(self, length: int) -> Dict[int, float]:
+        """
+        Semua blok length kursi bersebelahan dalam satu baris tanpa melewati
+        lorong, sebagai nomor kursi awal -> rata-rata skor kursi. Dihitung
+        sekali per panjang blok lalu disimpan.
+        """
+        blocks = self._blocks.get(length)
+        if blocks is None:
+            blocks = {}
+            for row in self.rows:
+                batas = (0,) + row.celah + (row.jumlah,)
+                for awal_segmen, akhir_segmen in zip(batas, batas[1:]):
+                    for awal in range(row.awal + awal_segmen, row.awal + akhir_segmen - length + 1):
+                        blocks[awal] = round(sum(self._scores[awal:awal + length]) / length, 6)
+            # Layout immutable; perhitungan ganda dari thread lain menghasilkan isi yang sama
+            self._blocks[length] = blocks
+        return blocks
+
+    @property
+    def kursi_per_baris(self) -> Optional[int]:
+        """Lebar baris jika semua baris (kecuali baris terakhir) sama lebar, selain itu None."""
+        widths = {row.jumlah for row in self.rows[:-1]}
+        if len(widths) > 1 or any(row.celah for row in self.rows):
+            return None
+        width = widths.pop() if widths else (self.rows[0].jumlah if self.rows else 0)
+        return width if not self.rows or self.rows[-1].jumlah <= width else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"jumlah_kursi": self.size, "baris": [row.to_dict() for row in self.rows]}
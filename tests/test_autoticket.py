@@ -1,3 +1,5 @@
+import asyncio
+import multiprocessing
 import unittest
 import sys
 import os
@@ -10,8 +12,38 @@ from config.config_manager import ConfigManager
 from core.services.film_service import FilmService
 from core.services.price_calculator import PriceCalculator
 from core.services.seat_manager import SeatManager
+from core.services.seat_journal import SeatJournal
+from core.services.seat_map import SeatMap
+from core.services.shared_seat_store import SharedSeatStore
 from core.autoticket_facade import AutoTicketFacade
 from core.validation import TicketValidator
+from models.reservation_store import ReservationStore
+from utils.id_generator import ReservationIdGenerator
+
+# Batas waktu (detik) dari import menu sampai menu tampil dan keluar. Sengaja longgar
+# (menu biasanya selesai dalam hitungan milidetik) agar tidak gagal di mesin yang sibuk;
+# regresi pemuatan modul berat ditangkap lewat CLI_HEAVY_MODULES
+CLI_STARTUP_BUDGET = 1.0
+
+# Modul berat yang tidak boleh ikut dimuat saat menu CLI tampil lalu keluar
+CLI_HEAVY_MODULES = (
+    "fastapi", "uvicorn", "starlette", "pydantic", "sqlite3",
+    "api.api", "core.autoticket_facade", "models.reservation_store", "models.hold_store"
+)
+
+def _book_from_worker(shm_name, jumlah, results):
+    """Dijalankan di proses terpisah: memesan kursi satu per satu lewat inventaris bersama."""
+    config = ConfigManager("config.json")
+    config.load_config()
+    manager = SeatManager(config)
+    manager.attach_shared_store(SharedSeatStore.attach(shm_name))
+    booked = []
+    for _ in range(jumlah):
+        seats = manager.assign_seat("Teater 2", 1, True, "Spider-Man: No Way Home", "20:00", "2099-01-05")
+        if seats:
+            booked.extend(seats)
+    results.put(booked)
+
 
 class TicketSystemTest(unittest.TestCase):
     @classmethod
@@ -36,6 +68,99 @@ class TicketSystemTest(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIsInstance(response.json(), list)
 
+    def test_films_conditional_get(self):
+        response = self.client.get("/films")
+        etag = response.headers["etag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("max-age", response.headers["cache-control"])
+
+        response = self.client.get("/films", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response.headers["etag"], etag)
+
+        response = self.client.get("/films?genre=action", headers={"If-None-Match": '"lain"'})
+        self.assertEqual(response.status_code, 200)
+
+        last_modified = response.headers["last-modified"]
+        for path in ("/films/Avengers: Endgame", "/films/Avengers: Endgame/showtimes"):
+            self.assertEqual(self.client.get(path, headers={"If-None-Match": etag}).status_code, 304)
+            self.assertEqual(self.client.get(path, headers={"If-Modified-Since": last_modified}).status_code, 304)
+        self.assertEqual(self.client.get("/films/Tidak Ada", headers={"If-None-Match": etag}).status_code, 404)
+
+    def test_catalog_responses_cached_as_bytes(self):
+        from api.api import catalog_responses
+
+        catalog_responses.clear()
+        first = self.client.get("/films?genre=Action")
+        self.assertEqual(first.headers["content-type"], "application/json")
+        etag = first.headers["etag"].strip('"')
+        cached = catalog_responses.get(etag, ("films", "action", None, None, None, None))
+        self.assertEqual(cached, first.content)
+
+        # Varian genre dengan huruf berbeda memakai bytes yang sama
+        self.assertEqual(self.client.get("/films?genre=ACTION").content, first.content)
+        self.assertEqual(self.client.get("/films").json(), [film.model_dump() for film in self.facade.get_films()])
+
+        detail = self.client.get("/films/avengers: endgame")
+        self.assertEqual(catalog_responses.get(etag, ("film", "avengers: endgame")), detail.content)
+        self.assertEqual(detail.json()["judul"], "Avengers: Endgame")
+        showtimes = self.client.get("/films/Avengers: Endgame/showtimes").json()
+        self.assertEqual(showtimes, list(self.facade.get_film_detail("Avengers: Endgame")["film"].jadwal))
+
+    def test_films_sort_projection_and_cursor(self):
+        films = self.facade.get_films()
+        by_price = sorted(films, key=lambda film: (film.harga_tiket, film.judul.casefold()))
+        self.assertEqual(self.facade.get_films(sort_by="harga"), by_price)
+
+        # Menelusuri semua halaman lewat cursor menghasilkan urutan lengkap tanpa duplikat
+        titles = []
+        cursor = None
+        while True:
+            page = self.facade.get_films_page(sort_by="harga", cursor=cursor, limit=1, fields=["judul"])
+            self.assertTrue(page["success"])
+            titles.extend(film["judul"] for film in page["films"])
+            self.assertTrue(all(list(film) == ["judul"] for film in page["films"]))
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(titles, [film.judul for film in by_price])
+
+        self.assertFalse(self.facade.get_films_page(cursor="bukan-cursor")["success"])
+        self.assertFalse(self.facade.get_films_page(fields=["poster"])["success"])
+
+        response = self.client.get("/films?sort=title&fields=judul,harga_tiket&limit=2")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([film["judul"] for film in data["films"]],
+                         sorted((film.judul for film in films), key=str.casefold)[:2])
+        self.assertEqual(set(data["films"][0]), {"judul", "harga_tiket"})
+        following = self.client.get(f"/films?sort=title&fields=judul,harga_tiket&limit=2&cursor={data['next_cursor']}")
+        self.assertEqual(following.status_code, 200)
+        self.assertNotIn(data["films"][0], following.json()["films"])
+        self.assertEqual(self.client.get("/films?sort=rating").status_code, 400)
+        self.assertEqual(self.client.get("/films?limit=2&cursor=salah").status_code, 400)
+
+    def test_film_search_index(self):
+        catalog = self.config.get_film_catalog()
+        self.assertEqual([film.judul for film in catalog.by_genre("drama")],
+                         [film.judul for film in catalog.films if "drama" in film.genre.lower()])
+        # Kata kunci sebagian tetap cocok seperti pencarian substring
+        self.assertEqual([film.judul for film in self.facade.get_films(genre="advent")],
+                         [film.judul for film in catalog.films if "advent" in film.genre.lower()])
+
+        results = self.facade.search_films("spidrman")["results"]
+        self.assertEqual(results[0]["film"].judul, "Spider-Man: No Way Home")
+        self.assertFalse(self.facade.search_films("  ")["success"])
+        self.assertIn("Avengers: Endgame", self.facade.get_film_detail("Avenger Endgam")["message"])
+
+        response = self.client.get("/films/search", params={"q": "avenger endgam"})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data[0]["judul"], "Avengers: Endgame")
+        self.assertTrue(all(0 < item["score"] <= 1 for item in data))
+        self.assertEqual(self.client.get("/films/search", params={"q": "zzzz"}).json(), [])
+
     def test_get_film_by_title(self):
         response = self.client.get("/films/Avengers: Endgame")
         self.assertEqual(response.status_code, 200)
@@ -54,6 +179,25 @@ class TicketSystemTest(unittest.TestCase):
         self.assertIn("total_price", data)
         self.assertGreater(data["total_price"], 0)
 
+    def test_get_prices_batch(self):
+        response = self.client.post("/prices/batch", json={
+            "films": ["F9: The Fast Saga", "Film Tidak Ada", "avengers: endgame"],
+            "showtimes": ["19:30", "10:00", "10:00"],
+            "is_holiday": [True, False, False],
+            "is_member": [True, False, True],
+            "ticket_counts": [2, 1, 1]
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["valid"], [True, False, True])
+        self.assertEqual(data["total_price"][1], 0)
+
+        single = self.client.get("/films/F9: The Fast Saga/price?showtime=19:30&is_holiday=true&is_member=true&ticket_count=2")
+        self.assertEqual(data["total_price"][0], single.json()["total_price"])
+
+        mismatch = self.client.post("/prices/batch", json={"films": ["F9: The Fast Saga"], "showtimes": []})
+        self.assertEqual(mismatch.status_code, 400)
+
     def test_get_available_seats(self):
         response = self.client.get("/seats/Teater 1")
         self.assertEqual(response.status_code, 200)
@@ -137,6 +281,66 @@ class TicketSystemTest(unittest.TestCase):
 
         self.assertIn(response.status_code, [400, 404])
 
+    def test_hold_and_confirm(self):
+        response = self.client.post("/holds", json={
+            "film_title": "Spider-Man: No Way Home",
+            "showtime": "17:00",
+            "seats": ["D1", "D2"],
+            "show_date": "2099-01-01"
+        })
+        self.assertEqual(response.status_code, 200)
+        hold_id = response.json()["hold_id"]
+
+        response = self.client.post(f"/holds/{hold_id}/confirm", json={"is_member": True})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["seats"], ["D1", "D2"])
+
+        response = self.client.delete(f"/holds/{hold_id}")
+        self.assertEqual(response.status_code, 404)
+
+    def test_book_batch_all_or_nothing(self):
+        bookings = [
+            {"film_title": "The Lion King", "showtime": "09:30", "ticket_count": 4, "show_date": "2099-01-03"},
+            {"film_title": "F9: The Fast Saga", "showtime": "10:30", "ticket_count": 2,
+             "is_member": True, "show_date": "2099-01-03"}
+        ]
+        response = self.client.post("/book/batch", json={"bookings": bookings})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([len(r["seats"]) for r in data["reservations"]], [4, 2])
+        self.assertEqual(data["total_price"], sum(r["price"] for r in data["reservations"]))
+
+        # Pesanan kedua melebihi kapasitas: pesanan pertama ikut dibatalkan
+        before = self.client.get("/seats/Teater 1?film_title=The Lion King&showtime=09:30&show_date=2099-01-03")
+        failing = [bookings[0], dict(bookings[1], ticket_count=99)]
+        response = self.client.post("/book/batch", json={"bookings": failing * 2})
+        self.assertEqual(response.status_code, 400)
+        after = self.client.get("/seats/Teater 1?film_title=The Lion King&showtime=09:30&show_date=2099-01-03")
+        self.assertEqual(before.json()["available_count"], after.json()["available_count"])
+
+    def test_reservation_lookup_and_cancel_by_id(self):
+        response = self.client.post("/book", json={
+            "film_title": "F9: The Fast Saga",
+            "showtime": "10:30",
+            "ticket_count": 3,
+            "show_date": "2099-01-02"
+        })
+        self.assertEqual(response.status_code, 200)
+        reservation_id = response.json()["reservation_id"]
+
+        response = self.client.get(f"/reservations/{reservation_id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "confirmed")
+
+        response = self.client.delete(f"/reservations/{reservation_id}")
+        self.assertEqual(response.status_code, 200)
+        seats = self.client.get("/seats/Teater 3?film_title=F9: The Fast Saga&showtime=10:30&show_date=2099-01-02")
+        self.assertEqual(seats.json()["available_count"], 100)
+
+        self.assertEqual(self.client.get(f"/reservations/{reservation_id}").json()["status"], "cancelled")
+        self.assertEqual(self.client.delete(f"/reservations/{reservation_id}").status_code, 404)
+        self.assertEqual(self.client.get("/reservations/RES-TIDAK-ADA").status_code, 404)
+
     # ========== services Layer tests ==========
     def test_film_service_get_all_films(self):
         films = self.film_service.get_all_films()
@@ -168,6 +372,193 @@ class TicketSystemTest(unittest.TestCase):
         self.assertIsInstance(price_info, dict)
         self.assertIn("total", price_info)
 
+    def test_price_calculator_table_matches_breakdown(self):
+        config = ConfigManager("config.json")
+        config.load_config()
+        calculator = PriceCalculator(config)
+        price_info = calculator.get_price("avengers: endgame", "10:00", True, True, 3)
+        per_ticket = calculator.get_ticket_price("Avengers: Endgame", "10:00", True, True)
+        self.assertEqual(price_info["harga_per_tiket"], per_ticket)
+        self.assertEqual(price_info["total"], per_ticket * 3)
+
+    def test_config_hot_reload(self):
+        import json
+        import tempfile
+        import time
+
+        with open("config.json", encoding="utf-8") as file:
+            data = json.load(file)
+
+        with tempfile.TemporaryDirectory() as config_dir:
+            config_path = os.path.join(config_dir, "config.json")
+            with open(config_path, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+
+            facade = AutoTicketFacade(config_path)
+            calculator = facade._calculator
+            per_ticket = calculator.get_ticket_price("Avengers: Endgame", "10:00", True, True)
+            jumlah_film = len(facade.get_films())
+            film_service = FilmService(facade._config)
+            version = facade._config.version
+            self.assertFalse(facade._config.reload_if_changed())
+
+            # File rusak tidak menggantikan snapshot yang sedang berlaku
+            with open(config_path, "w", encoding="utf-8") as file:
+                file.write("{rusak")
+            os.utime(config_path, ns=(0, 1))
+            self.assertFalse(facade._config.reload_if_changed())
+            self.assertIsNotNone(facade._config.last_reload_error)
+            self.assertEqual(facade._config.version, version)
+
+            # Bentuk bagian yang salah ditolak dengan pesan, tanpa menghentikan pemantau konfigurasi
+            for mtime, rusak in enumerate(({**data, "teater": []}, {**data, "film": {}}, [data]), start=2):
+                with open(config_path, "w", encoding="utf-8") as file:
+                    json.dump(rusak, file)
+                os.utime(config_path, ns=(0, mtime))
+                self.assertFalse(facade._config.reload_if_changed())
+                self.assertIn("ValueError", facade._config.last_reload_error)
+                self.assertEqual(facade._config.version, version)
+
+            facade._config.stop_watching()
+            facade._config.start_watching(0.01)
+            with open(config_path, "w", encoding="utf-8") as file:
+                json.dump({**data, "teater": []}, file)
+            os.utime(config_path, ns=(0, 5))
+            time.sleep(0.1)
+            self.assertTrue(facade._config._watcher.is_alive())
+            self.assertIn("teater", facade._config.last_reload_error)
+            facade._config.stop_watching()
+
+            # Snapshot baru memicu pembangunan ulang tabel harga dan daftar film
+            data["tiket"]["HARGA_ADMIN"] += 1000
+            film_baru = dict(data["film"][0], judul="Film Baru")
+            data["film"].append(film_baru)
+            with open(config_path, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            self.assertTrue(facade._config.reload_if_changed())
+            self.assertEqual(facade._config.version, version + 1)
+            self.assertIsNone(facade._config.last_reload_error)
+
+            self.assertEqual(calculator.get_ticket_price("Avengers: Endgame", "10:00", True, True), per_ticket + 1000)
+            self.assertEqual(len(facade.get_films()), jumlah_film + 1)
+            catalog, film_manager = facade._film_data
+            self.assertIs(catalog, facade._config.get_film_catalog())
+            self.assertEqual(len(film_manager.ambil_semua()), len(catalog.films))
+            # FilmService membaca katalog dari snapshot terbaru, bukan salinan saat dibuat
+            self.assertIsNotNone(film_service.get_film_info("Film Baru"))
+            self.assertEqual(len(film_service.get_all_films()), jumlah_film + 1)
+            self.assertTrue(facade._validator.validate_ticket_request("Film Baru", film_baru["jadwal"][0], 1)["valid"])
+            with self.assertRaises(TypeError):
+                facade._config.config["tiket"]["HARGA_ADMIN"] = 0
+            facade._config.stop_watching()
+
+    def test_layout_limits_and_reload_guard(self):
+        import json
+        import tempfile
+        from datetime import datetime
+
+        with open("config.json", encoding="utf-8") as file:
+            data = json.load(file)
+        data["teater"]["layout"]["Teater 3"] = {"baris": 3, "kursi_per_baris": 10}
+
+        with tempfile.TemporaryDirectory() as config_dir:
+            config_path = os.path.join(config_dir, "config.json")
+            with open(config_path, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            config = ConfigManager(config_path)
+            config.load_config()
+            seat_manager = SeatManager(config)
+            validator = TicketValidator(config)
+
+            # Jumlah tiket dibatasi jumlah kursi teater, bukan MAX_KURSI
+            self.assertFalse(validator.validate_ticket_request("F9: The Fast Saga", "10:30", 31)["valid"])
+            self.assertTrue(validator.validate_ticket_request("F9: The Fast Saga", "10:30", 30)["valid"])
+
+            show = ("Teater 3", "F9: The Fast Saga", "10:30", "2099-01-08")
+            self.assertEqual(seat_manager.reserve_seats(show[0], ["C10"], *show[1:]), [])
+
+            # Layout teater yang masih punya pertunjukan aktif tidak boleh berubah
+            data["teater"]["layout"]["Teater 3"] = {"baris": 2, "kursi_per_baris": 10}
+            with open(config_path, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.utime(config_path, ns=(0, 1))
+            self.assertFalse(config.reload_if_changed())
+            self.assertIn("Teater 3", config.last_reload_error)
+            self.assertEqual(seat_manager.layout_for("Teater 3").size, 30)
+            self.assertEqual(seat_manager.get_seat_map(*show).free_count, 29)
+
+            # Setelah pertunjukannya selesai dan dihapus, layout baru diterima
+            seat_manager.purge_finished_shows(datetime(2100, 1, 1))
+            self.assertTrue(config.reload_if_changed())
+            self.assertEqual(seat_manager.layout_for("Teater 3").size, 20)
+            self.assertFalse(validator.validate_ticket_request("F9: The Fast Saga", "10:30", 21)["valid"])
+
+    def test_config_parse_cache(self):
+        import shutil
+        import tempfile
+        from unittest import mock
+
+        # Manager lain pada file yang sama memakai hasil parse yang sama
+        first = ConfigManager("config.json")
+        first.load_config()
+        second = ConfigManager("config.json")
+        second.load_config()
+        self.assertIs(first.config, second.config)
+        self.assertIs(first.get_film_catalog(), second.get_film_catalog())
+
+        with tempfile.TemporaryDirectory() as config_dir:
+            config_path = os.path.join(config_dir, "config.json")
+            shutil.copy("config.json", config_path)
+            with mock.patch.dict(os.environ, {"CONFIG_CACHE": "1"}):
+                ConfigManager(config_path).load_config()
+                self.assertTrue(os.path.exists(config_path + ".cache"))
+
+                # Proses baru (cache per proses kosong) membaca artefak tanpa mem-parse JSON
+                config_manager = ConfigManager(config_path)
+                with mock.patch.dict("config.config_manager._parse_cache", clear=True), \
+                        mock.patch.object(ConfigManager, "_read_file", side_effect=AssertionError):
+                    config_manager.load_config()
+                self.assertEqual(config_manager.config, second.config)
+
+    def test_seat_map_encodings(self):
+        seats = SeatMap(300)
+        seats.assign([0, 1, 2, 150, 299])
+        self.assertEqual(seats.version, 1)
+        self.assertEqual(seats.free_runs(), [(3, 147), (151, 148)])
+        self.assertEqual(len(seats.to_bytes()), 38)
+        seats.release([0])
+        self.assertEqual(seats.copy().version, 2)
+
+    def test_seat_map_endpoint(self):
+        import base64
+
+        params = {"film_title": "The Lion King", "showtime": "12:30", "show_date": "2099-01-06"}
+        response = self.client.get("/seats/Teater 1/map", params=params)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["available_count"], data["size"])
+        etag = response.headers["etag"]
+        self.assertEqual(self.client.get("/seats/Teater 1/map", params=params,
+                                         headers={"If-None-Match": etag}).status_code, 304)
+
+        booked = self.client.post("/reservation", json={
+            "film_title": "The Lion King", "showtime": "12:30", "seats": ["A2", "B1"], "show_date": "2099-01-06"
+        })
+        self.assertEqual(booked.status_code, 200)
+
+        response = self.client.get("/seats/Teater 1/map", params=params, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertGreater(data["version"], 0)
+        bitmap = int.from_bytes(base64.b64decode(data["bitmap"]), "little")
+        self.assertFalse(bitmap >> 1 & 1)
+        self.assertFalse(bitmap >> 10 & 1)
+        self.assertTrue(bitmap & 1)
+
+        runs = self.client.get("/seats/Teater 1/map", params={**params, "encoding": "runs"}).json()["runs"]
+        self.assertEqual(runs[:2], [[0, 1], [2, 8]])
+        self.assertEqual(self.client.get("/seats/Teater 1/map", params={**params, "encoding": "rle"}).status_code, 400)
+
     def test_seat_manager_get_available_seats(self):
         available_seats = self.seat_manager.get_available_seats("Teater 1")
         self.assertIsInstance(available_seats, list)
@@ -184,12 +575,393 @@ class TicketSystemTest(unittest.TestCase):
         seat_index = self.seat_manager.get_seat_index("A1")
         self.assertEqual(seat_index, 0)
 
+    def test_seat_layouts(self):
+        from models.seat_layout import SeatLayout, row_label
+
+        self.assertEqual([row_label(i) for i in (0, 25, 26, 27, 701, 702)], ["A", "Z", "AA", "AB", "ZZ", "AAA"])
+        hall = SeatLayout.uniform(600, 10)
+        self.assertEqual(hall.name(260), "AA1")
+        self.assertEqual(hall.index("aa1"), 260)
+        self.assertEqual(hall.index("A11"), -1)
+
+        # Teater 3 memakai layout dari config.json: baris tidak sama lebar, lorong, dan kelas kursi
+        self.assertEqual(self.seat_manager.get_seat_name(10, "Teater 3"), "B1")
+        self.assertEqual(self.seat_manager.get_seat_index("B12", "Teater 3"), 21)
+        self.assertEqual(self.seat_manager.get_seat_index("A11", "Teater 3"), -1)
+        layout = self.seat_manager.layout_for("Teater 3")
+        self.assertEqual(layout.size, 100)
+        self.assertEqual(layout.seat_class(99), "sweetbox")
+        self.assertEqual(layout.row_of(0).celah, (5,))
+
+        seat_manager = SeatManager(self.config)
+        self.assertEqual(seat_manager.reserve_seats("Teater 3", ["B12", "H14"], "F9: The Fast Saga", "10:30", "2099-01-09"), [])
+        self.assertEqual(seat_manager.reserve_seats("Teater 3", ["A11"], "F9: The Fast Saga", "10:30", "2099-01-09"), ["A11"])
+        self.assertTrue(seat_manager.release_seat("Teater 3", ["B12"], "F9: The Fast Saga", "10:30", "2099-01-09"))
+        self.assertEqual(seat_manager.get_total_available_seats("Teater 3", "F9: The Fast Saga", "10:30", "2099-01-09"), 99)
+
+        with self.assertRaises(ValueError):
+            SeatLayout.from_config({"baris": [{"jumlah": 0}]})
+
+    def test_best_available_seats(self):
+        seat_manager = SeatManager(self.config)
+        show = ("Avengers: Endgame", "10:00", "2099-01-10")
+
+        # Teater 1: 10 baris x 10 kursi, baris ideal G (dua pertiga ke belakang), blok di tengah baris
+        self.assertEqual(seat_manager.assign_seat("Teater 1", 2, True, *show, best_available=True), ["G5", "G6"])
+        self.assertEqual(seat_manager.assign_seat("Teater 1", 2, True, *show, best_available=True), ["F5", "F6"])
+        self.assertEqual(seat_manager.assign_seat("Teater 1", 1, True, *show, best_available=True), ["H5"])
+
+        # Blok tidak melewati lorong Teater 3 dan selalu blok terbaik yang masih kosong
+        layout = seat_manager.layout_for("Teater 3")
+        show_3 = ("F9: The Fast Saga", "10:30", "2099-01-10")
+        taken = set()
+        for _ in range(20):
+            seats = seat_manager.assign_seat("Teater 3", 3, True, *show_3, best_available=True)
+            indices = [layout.index(name) for name in seats]
+            free_blocks = [score for awal, score in layout.blocks(3).items()
+                           if not taken & set(range(awal, awal + 3))]
+            if free_blocks:
+                self.assertEqual(layout.blocks(3)[indices[0]], max(free_blocks))
+                self.assertEqual(indices, list(range(indices[0], indices[0] + 3)))
+            self.assertFalse(taken & set(indices))
+            taken.update(indices)
+
+        # Kursi yang dibebaskan kembali menjadi kandidat terbaik
+        seat_manager.release_seat("Teater 1", ["G5", "G6"], *show)
+        self.assertEqual(seat_manager.assign_seat("Teater 1", 2, True, *show, best_available=True), ["G5", "G6"])
+
+        result = self.facade.book_tickets("Avengers: Endgame", "19:00", 2, seat_preference="terbaik",
+                                          show_date="2099-01-10")
+        self.assertTrue(result["success"])
+        self.assertEqual(result["kursi"], ["G5", "G6"])
+
     def test_seat_manager_assign_seat(self):
         assigned_seats = self.seat_manager.assign_seat("Teater 1", 2, prefer_consecutive=True)
         if assigned_seats:  # Jika ada kursi tersedia
             self.assertIsInstance(assigned_seats, list)
             self.assertEqual(len(assigned_seats), 2)
 
+    def test_seat_manager_inventory_per_show(self):
+        seat_manager = SeatManager(self.config)
+        seat_manager.assign_seat("Teater 1", 3, True, "Avengers: Endgame", "10:00", "2099-01-01")
+
+        self.assertEqual(seat_manager.get_total_available_seats("Teater 1", "Avengers: Endgame", "10:00", "2099-01-01"), 97)
+        self.assertEqual(seat_manager.get_total_available_seats("Teater 1", "Avengers: Endgame", "19:00", "2099-01-01"), 100)
+        self.assertEqual(seat_manager.get_total_available_seats("Teater 1", "The Lion King", "09:30", "2099-01-01"), 100)
+
+    def test_seat_manager_purge_finished_shows(self):
+        from datetime import datetime
+        seat_manager = SeatManager(self.config)
+        seat_manager.assign_seat("Teater 1", 1, True, "Avengers: Endgame", "10:00", "2099-01-01")
+        seat_manager.assign_seat("Teater 1", 1, True, "Avengers: Endgame", "19:00", "2099-01-01")
+
+        # Avengers 10:00 berdurasi 181 menit, selesai pukul 13:01
+        removed = seat_manager.purge_finished_shows(datetime(2099, 1, 1, 13, 5))
+        self.assertEqual(removed, 1)
+        self.assertEqual(len(seat_manager.seat_status), 1)
+
+    def test_seat_map_counter_and_masks(self):
+        seat_map = SeatMap(100)
+        seat_map.assign([0, 1, 99])
+        self.assertEqual(seat_map.free_count, 97)
+        self.assertFalse(seat_map.is_free(99))
+        self.assertEqual(seat_map.free_indices(2), [2, 3])
+
+        # Membebaskan kursi yang sudah kosong tidak mengubah counter
+        seat_map.release([1, 2])
+        self.assertEqual(seat_map.free_count, 98)
+
+        mask = SeatMap.mask_from([10, 11, 12])
+        self.assertTrue(seat_map.all_free(mask))
+        self.assertEqual(seat_map.assign_mask(mask), 3)
+        self.assertFalse(seat_map.all_free(mask))
+        self.assertEqual(seat_map.release_mask(mask), 3)
+        self.assertEqual(seat_map.free_count, 98)
+
+    def test_shared_seat_store_across_processes(self):
+        store = SharedSeatStore.create(f"autoticket-test-{os.getpid()}", 64, 100)
+        try:
+            context = multiprocessing.get_context("spawn")
+            results = context.Queue()
+            workers = [context.Process(target=_book_from_worker, args=(store.name, 30, results)) for _ in range(4)]
+            for worker in workers:
+                worker.start()
+            booked = [seat for _ in workers for seat in results.get(timeout=60)]
+            for worker in workers:
+                worker.join()
+
+            self.assertEqual(len(booked), 100)
+            self.assertEqual(len(set(booked)), 100)
+            seats = store.get(("Teater 2", "Spider-Man: No Way Home", "20:00", "2099-01-05"))
+            self.assertEqual(seats.free_count, 0)
+        finally:
+            store.close()
+            store.unlink()
+
+    def test_multi_worker_holds_and_journals_survive_restart(self):
+        import tempfile
+        import time
+        from core.services.seat_journal import worker_directory
+        from models.hold_store import HoldStore
+        show = ("Teater 2", "Spider-Man: No Way Home", "20:00", "2099-01-06")
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            journal_dir = os.path.join(data_dir, "journal")
+            db_path = os.path.join(data_dir, "state.db")
+            store = SharedSeatStore.create(f"autoticket-test-{os.getpid()}", 64, self.seat_manager.max_seats)
+            workers = []
+            try:
+                for pid in (101, 102):
+                    worker = SeatManager(self.config)
+                    worker.attach_shared_store(SharedSeatStore.attach(store.name))
+                    worker.attach_hold_store(HoldStore(db_path))
+                    worker.attach_journal(SeatJournal(worker_directory(journal_dir, pid)), recover=False)
+                    workers.append(worker)
+                first, second = workers
+
+                # Record dari dua journal berbeda diurutkan lewat lsn pertunjukan
+                self.assertEqual(first.assign_seat(show[0], 2, True, *show[1:]), ["A1", "A2"])
+                self.assertEqual(second.assign_seat(show[0], 3, True, *show[1:]), ["A3", "A4", "A5"])
+                first.journal.snapshot()
+                self.assertTrue(second.release_seat(show[0], ["A1"], *show[1:]))
+                self.assertEqual(first.assign_seat(show[0], 1, True, *show[1:]), ["A1"])
+
+                # Hold terlihat, bisa dikonfirmasi, dan dikedaluwarsakan dari worker lain
+                hold = first.hold_seats(show[0], 2, True, *show[1:], ttl=60)
+                self.assertFalse(second.release_seat(show[0], hold["kursi"], *show[1:]))
+                self.assertIsNotNone(second.confirm_hold(hold["hold_id"]))
+                second.hold_seats(show[0], 3, True, *show[1:], ttl=60)
+                self.assertEqual(first.expire_holds(time.time() + 120), 1)
+                self.assertEqual(second.get_total_available_seats(*show), 93)
+                for worker in workers:
+                    worker.journal.close()
+                    worker.shared_store.close()
+            finally:
+                store.close()
+                store.unlink()
+
+            # Restart: proses induk memulihkan semua journal worker ke segmen baru
+            restarted = SharedSeatStore.create(f"autoticket-test-{os.getpid()}", 64, self.seat_manager.max_seats)
+            try:
+                parent = SeatManager(self.config)
+                parent.attach_shared_store(restarted)
+                parent.restore_journals(journal_dir)
+                self.assertEqual(parent.get_total_available_seats(*show), 93)
+                self.assertEqual(os.listdir(journal_dir), ["snapshot.json"])
+            finally:
+                restarted.close()
+                restarted.unlink()
+
+            single = SeatManager(self.config)
+            single.attach_journal(SeatJournal(journal_dir))
+            self.assertEqual(single.get_total_available_seats(*show), 93)
+            self.assertEqual(single.assign_seat(show[0], 1, True, *show[1:]), ["A8"])
+            single.journal.close()
+
+    def test_reservation_store_write_through_claims(self):
+        import tempfile
+        facade = AutoTicketFacade("config.json")
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            db_path = os.path.join(data_dir, "reservasi.db")
+            store = ReservationStore(db_path, write_through=True)
+            other = ReservationStore(db_path, write_through=True)
+            first = facade.book_tickets("The Lion King", "15:30", 2, show_date="2099-01-06")
+            second = facade.book_tickets("The Lion King", "15:30", 2, show_date="2099-01-06")
+            store.save(first)
+            store.save(second)
+
+            # Langsung terlihat oleh proses lain tanpa menunggu writer
+            self.assertEqual(other.get(first["reservation_id"])["kursi"], first["kursi"])
+            self.assertIsNotNone(other.cancel(first["reservation_id"]))
+            self.assertIsNone(store.cancel(first["reservation_id"]))
+
+            show = (second["teater"], second["film"], second["jadwal"], second["tanggal"])
+            self.assertIsNone(store.release_owned(*show, [second["kursi"][0], first["kursi"][0]]))
+            released = other.release_owned(*show, second["kursi"][:1])
+            self.assertEqual(released, {second["reservation_id"]: (second["kursi"][:1], "partially_released")})
+            self.assertEqual(store.get(second["reservation_id"])["kursi"], second["kursi"][1:])
+
+            # ID yang bertabrakan tidak menimpa reservasi worker lain
+            import sqlite3
+            with self.assertRaises(sqlite3.IntegrityError):
+                other.save(dict(second, kursi=["J1"], jumlah_tiket=1))
+            self.assertEqual(store.get(second["reservation_id"])["kursi"], second["kursi"][1:])
+
+            # Dalam mode antrean hanya reservasi yang bertabrakan yang dibuang
+            queued = ReservationStore(db_path)
+            third = facade.book_tickets("The Lion King", "15:30", 1, show_date="2099-01-06")
+            queued.save(dict(first, kursi=["J2"], jumlah_tiket=1))
+            queued.save(third)
+            queued.flush()
+            self.assertEqual(store.get(third["reservation_id"])["kursi"], third["kursi"])
+            self.assertEqual(store.get(first["reservation_id"])["status"], "cancelled")
+            queued.close()
+
+    def test_seat_map_find_run(self):
+        seat_map = SeatMap(20)
+        seat_map.assign([3, 8, 12])
+
+        self.assertEqual(seat_map.find_run(3), 0)
+        self.assertEqual(seat_map.find_run(4), 4)
+        self.assertEqual(seat_map.find_run(7), 13)
+        self.assertEqual(seat_map.find_run(8), -1)
+
+        # Indeks ikut diperbarui setelah kursi dibebaskan
+        seat_map.release([8])
+        self.assertEqual(seat_map.find_run(7), 4)
+
+    def test_seat_manager_hold_expiry(self):
+        import time
+        seat_manager = SeatManager(self.config)
+        show = ("Teater 2", "Spider-Man: No Way Home", "20:00", "2099-01-01")
+
+        hold = seat_manager.hold_seats(show[0], 4, True, *show[1:], ttl=60)
+        confirmed = seat_manager.hold_seats(show[0], 2, True, *show[1:], ttl=60)
+        self.assertEqual(seat_manager.get_total_available_seats(*show), 94)
+        self.assertIsNotNone(seat_manager.confirm_hold(confirmed["hold_id"]))
+
+        self.assertEqual(seat_manager.expire_holds(time.time() + 120), 1)
+        self.assertEqual(seat_manager.get_total_available_seats(*show), 98)
+        self.assertIsNone(seat_manager.confirm_hold(hold["hold_id"]))
+
+    def test_seat_manager_journal_recovery(self):
+        import tempfile
+        show = ("Teater 1", "The Lion King", "18:30", "2099-01-01")
+
+        with tempfile.TemporaryDirectory() as journal_dir:
+            seat_manager = SeatManager(self.config)
+            seat_manager.attach_journal(SeatJournal(journal_dir, snapshot_every=3))
+            for _ in range(5):
+                seat_manager.assign_seat(show[0], 2, True, *show[1:])
+            seat_manager.release_seat(show[0], ["A1"], *show[1:])
+            seat_manager.hold_seats(show[0], 4, True, *show[1:])
+            seat_manager.journal.snapshot()
+            seat_manager.reserve_seats(show[0], ["J10"], *show[1:])
+            seat_manager.journal.close()
+
+            # Hold yang belum dikonfirmasi tidak ikut dipulihkan
+            recovered = SeatManager(self.config)
+            recovered.attach_journal(SeatJournal(journal_dir))
+            self.assertEqual(recovered.get_total_available_seats(*show), 90)
+            self.assertEqual(recovered.get_available_seats(*show, limit=1), [0])
+            self.assertEqual(recovered.reserve_seats(show[0], ["J10"], *show[1:]), ["J10"])
+            recovered.journal.close()
+
+    def test_seat_journal_write_failure_rolls_back(self):
+        import tempfile
+        from core.services.seat_journal import JournalError
+        show = ("Teater 1", "The Lion King", "15:30", "2099-01-07")
+
+        with tempfile.TemporaryDirectory() as journal_dir:
+            seat_manager = SeatManager(self.config)
+            journal = SeatJournal(journal_dir)
+            seat_manager.attach_journal(journal)
+            write = journal._write
+
+            def disk_full(batch):
+                raise OSError(28, "No space left on device")
+
+            # Flusher tetap hidup; pemesanan gagal dan kursinya dikembalikan, tidak menggantung
+            journal._write = disk_full
+            with self.assertRaises(JournalError):
+                seat_manager.assign_seat(show[0], 2, True, *show[1:])
+            with self.assertRaises(JournalError):
+                seat_manager.reserve_seats(show[0], ["J1"], *show[1:])
+            self.assertEqual(seat_manager.get_total_available_seats(*show), 100)
+
+            journal._write = write
+            self.assertEqual(seat_manager.assign_seat(show[0], 2, True, *show[1:]), ["A1", "A2"])
+            journal.close()
+
+            recovered = SeatManager(self.config)
+            recovered.attach_journal(SeatJournal(journal_dir))
+            self.assertEqual(recovered.get_total_available_seats(*show), 98)
+            recovered.journal.close()
+
+    def test_reservation_store_persists_batched_writes(self):
+        import tempfile
+        facade = AutoTicketFacade("config.json")
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            db_path = os.path.join(data_dir, "reservasi.db")
+            store = ReservationStore(db_path)
+            for _ in range(3):
+                store.save(facade.book_tickets("Avengers: Endgame", "16:00", 2, show_date="2099-01-01"))
+            booking = facade.book_tickets("The Lion King", "15:30", 1, is_member=True, show_date="2099-01-01")
+            store.save(booking)
+
+            # Masih di antrean writer tetapi sudah bisa dibaca
+            self.assertEqual(store.get(booking["reservation_id"])["kursi"], booking["kursi"])
+            store.close()
+
+            reopened = ReservationStore(db_path)
+            saved = reopened.get(booking["reservation_id"])
+            self.assertEqual(saved["harga"], booking["harga"])
+            self.assertTrue(saved["is_member"])
+            self.assertEqual(len(reopened.find(film_title="Avengers: Endgame", show_date="2099-01-01")), 3)
+            self.assertEqual(reopened.find(film_title="The Lion King")[0]["kursi"], booking["kursi"])
+
+            show = (booking["teater"], booking["film"], booking["jadwal"], booking["tanggal"])
+            self.assertEqual(len(reopened.find_seat_owners(*show, booking["kursi"])), 1)
+            reopened.release_seats(booking["reservation_id"], booking["kursi"], "cancelled")
+            reopened.flush()
+            self.assertEqual(reopened.find_seat_owners(*show, booking["kursi"]), [])
+            released = reopened.get(booking["reservation_id"])
+            self.assertEqual((released["status"], released["kursi"], released["jumlah_tiket"]), ("cancelled", [], 0))
+            reopened.close()
+
+    def test_reservation_store_survives_write_errors(self):
+        import sqlite3
+        import tempfile
+        facade = AutoTicketFacade("config.json")
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            store = ReservationStore(os.path.join(data_dir, "reservasi.db"), flush_interval=0.001)
+            write_batch = store._write_batch
+
+            def disk_full(connection, batch):
+                raise sqlite3.OperationalError("database or disk is full")
+
+            store._write_batch = disk_full
+            lost = facade.book_tickets("Avengers: Endgame", "16:00", 1, show_date="2099-01-01")
+            store.save(lost)
+            store.flush()
+            self.assertIsNone(store.get(lost["reservation_id"]))
+
+            # Writer tetap hidup setelah batch gagal
+            store._write_batch = write_batch
+            booking = facade.book_tickets("avengers: endgame", "16:00", 2, show_date="2099-01-01")
+            self.assertEqual(booking["film"], "Avengers: Endgame")
+            store.save(booking)
+            store.flush()
+            saved = store.find(film_title="Avengers: Endgame")
+            self.assertEqual([r["reservation_id"] for r in saved], [booking["reservation_id"]])
+            store.close()
+
+    def test_reservation_id_generator_unique_and_ordered(self):
+        generator = ReservationIdGenerator()
+        ids = [generator.next_id() for _ in range(20000)]
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(ids, sorted(ids))
+
+        # Penanda proses diturunkan dari PID, jadi worker lain di host yang sama tidak bisa bertabrakan
+        self.assertEqual(int(ids[0].split("-")[2][:6], 16), os.getpid() & 0xFFFFFF)
+
+    def test_film_catalog_shared_indexes(self):
+        catalog = self.config.get_film_catalog()
+        self.assertIs(catalog, self.config.get_film_catalog())
+        self.assertIs(self.facade._catalog, self.facade._config.get_film_catalog())
+
+        self.assertEqual(catalog.get("the LION king").judul, "The Lion King")
+        self.assertIsNone(catalog.get("Film Tidak Ada"))
+        self.assertTrue(catalog.has_showtime("avengers: endgame", "19:00"))
+        self.assertFalse(catalog.has_showtime("Avengers: Endgame", "09:30"))
+        self.assertEqual([f.judul for f in catalog.by_teater("Teater 1")], ["Avengers: Endgame", "The Lion King"])
+
+        with self.assertRaises(TypeError):
+            catalog.get_raw("F9: The Fast Saga")["harga_tiket"] = 1
+
     def test_validator_is_valid_film(self):
         self.assertTrue(self.validator.is_valid_film("Avengers: Endgame"))
         self.assertFalse(self.validator.is_valid_film("Film Tidak Ada"))
@@ -223,6 +995,207 @@ class TicketSystemTest(unittest.TestCase):
         self.assertTrue(result["success"])
         self.assertIn("total", result)
 
+    def test_facade_check_seats_per_show(self):
+        facade = AutoTicketFacade("config.json")
+        result = facade.book_tickets("The Lion King", "12:30", 4, show_date="2099-01-01")
+        self.assertTrue(result["success"])
+        self.assertEqual(result["tanggal"], "2099-01-01")
+
+        show = facade.check_seats(film_title="The Lion King", showtime="12:30", show_date="2099-01-01")
+        other_show = facade.check_seats(film_title="The Lion King", showtime="15:30", show_date="2099-01-01")
+        self.assertEqual(show["total"], 96)
+        self.assertEqual(other_show["total"], 100)
+
+        # Tanpa jam tayang, semua pertunjukan teater pada tanggal itu digabungkan
+        theater = facade.check_seats(theater_name="Teater 1", show_date="2099-01-01")
+        totals = {(item["film"], item["jadwal"]): item["total"] for item in theater["pertunjukan"]}
+        self.assertEqual(totals[("The Lion King", "12:30")], 96)
+        self.assertEqual(theater["total"], sum(totals.values()))
+        self.assertNotIn(result["kursi"][0], theater["contoh_kursi"])
+        self.assertFalse(facade.get_seat_map("Teater 1")["success"])
+
+        invalid = facade.check_seats(film_title="The Lion King", showtime="12:30", show_date="01-01-2099")
+        self.assertFalse(invalid["success"])
+
+    def test_facade_reserve_seats_concurrent(self):
+        from concurrent.futures import ThreadPoolExecutor
+        facade = AutoTicketFacade("config.json")
+
+        def reserve(_):
+            return facade.reserve_seats("F9: The Fast Saga", "13:30", ["C5", "C6"], show_date="2099-01-01")
+
+        def book(_):
+            return facade.book_tickets("F9: The Fast Saga", "16:30", 10, show_date="2099-01-01")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            reserved = list(pool.map(reserve, range(16)))
+            booked = list(pool.map(book, range(16)))
+
+        self.assertEqual(sum(r["success"] for r in reserved), 1)
+
+        # Kursi yang sama dengan penulisan berbeda ditolak sebelum harga dihitung dan kursi dikunci
+        duplicate = facade.reserve_seats("F9: The Fast Saga", "19:30", ["D5", "d5"], show_date="2099-01-01")
+        self.assertFalse(duplicate["success"])
+        self.assertEqual(facade.check_seats(film_title="F9: The Fast Saga", showtime="19:30",
+                                            show_date="2099-01-01")["total"], 100)
+        self.assertEqual(facade.reserve_seats("F9: The Fast Saga", "19:30", ["d5"], show_date="2099-01-01")["kursi"], ["D5"])
+        self.assertEqual(facade._seat_manager.reserve_seats("Teater 3", ["E1", "e1"], "F9: The Fast Saga", "19:30",
+                                                            "2099-01-01"), ["e1"])
+
+        sold = [seat for r in booked if r["success"] for seat in r["kursi"]]
+        self.assertEqual(len(sold), 100)
+        self.assertEqual(len(set(sold)), 100)
+
+    def test_facade_cancel_booking_ownership(self):
+        from datetime import datetime
+        facade = AutoTicketFacade("config.json")
+        seat_manager = facade._seat_manager
+        show = ("The Lion King", "15:30", "2099-01-03")
+        booking = facade.reserve_seats(show[0], show[1], ["A1", "A2", "A3"], show_date=show[2])
+        teater = booking["teater"]
+        show_key = seat_manager.make_show_key(teater, *show)
+        seat_manager.hold_seats(teater, film_title=show[0], jam_tayang=show[1], tanggal=show[2], seat_names=["B1"])
+
+        # Kursi kosong dan kursi yang ditahan hold tidak dimiliki reservasi mana pun
+        self.assertFalse(facade.cancel_booking(teater, ["C1"], *show)["success"])
+        self.assertFalse(facade.cancel_booking(teater, ["B1"], *show)["success"])
+        self.assertFalse(seat_manager.release_indices(show_key, [seat_manager.get_seat_index("B1", teater)]))
+        self.assertEqual(seat_manager.get_total_available_seats(teater, *show), 96)
+
+        result = facade.cancel_booking(teater, ["a1"], "the lion king", show[1], show[2])
+        self.assertTrue(result["success"])
+        reservation = facade.get_reservation(booking["reservation_id"])["reservation"]
+        self.assertEqual((reservation["status"], reservation["kursi"], reservation["jumlah_tiket"]),
+                         ("partially_released", ["A2", "A3"], 2))
+        self.assertFalse(facade.cancel_booking(teater, ["A1"], *show)["success"])
+
+        self.assertTrue(facade.cancel_reservation(booking["reservation_id"])["success"])
+        self.assertEqual(seat_manager.get_total_available_seats(teater, *show), 99)
+
+        # Reservasi pertunjukan yang sudah dihapus ikut keluar dari indeks
+        seat_manager.purge_finished_shows(datetime(2099, 1, 4))
+        facade.book_tickets("The Lion King", "15:30", 1, show_date="2099-01-05")
+        self.assertNotIn(booking["reservation_id"], facade._reservations)
+        self.assertNotIn(show_key, facade._reservations_by_show)
+
+    def test_facade_book_tickets_async_concurrent(self):
+        async def book_all():
+            return await asyncio.gather(*[
+                self.facade.book_tickets_async("Avengers: Endgame", "16:00", 2, show_date="2099-01-04")
+                for _ in range(60)
+            ])
+
+        results = asyncio.run(book_all())
+        booked = [seat for result in results if result["success"] for seat in result["kursi"]]
+        self.assertEqual(len(booked), 100)
+        self.assertEqual(len(set(booked)), 100)
+        self.assertEqual(sum(not result["success"] for result in results), 10)
+
+        # Tanpa journal, pemesanan yang lock pertunjukannya bebas berjalan langsung di event loop
+        import threading
+        from unittest import mock
+
+        threads = []
+        book_tickets = self.facade.book_tickets
+
+        def record_thread(*args):
+            threads.append(threading.get_ident())
+            return book_tickets(*args)
+
+        async def book_uncontended():
+            with mock.patch.object(self.facade, "book_tickets", record_thread):
+                result = await self.facade.book_tickets_async("Avengers: Endgame", "13:00", 1, show_date="2099-01-04")
+            return result, threading.get_ident()
+
+        result, loop_thread = asyncio.run(book_uncontended())
+        self.assertTrue(result["success"])
+        self.assertEqual(threads, [loop_thread])
+
+        # Lock yang dipegang thread lain tidak ditunggu di event loop; operasi pindah ke thread
+        show_lock = self.facade._seat_manager._lock_for(
+            self.facade._seat_manager.make_show_key("Teater 1", "Avengers: Endgame", "19:00", "2099-01-04")
+        )
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            with show_lock:
+                locked.set()
+                release.wait()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        locked.wait()
+
+        async def book_while_locked():
+            task = asyncio.create_task(
+                self.facade.book_tickets_async("Avengers: Endgame", "19:00", 1, show_date="2099-01-04")
+            )
+            await asyncio.sleep(0.05)
+            self.assertFalse(task.done())
+            release.set()
+            return await task
+
+        self.assertTrue(asyncio.run(book_while_locked())["success"])
+        holder.join()
+
+    def test_seat_stream_coalesced_deltas(self):
+        from core.services.seat_stream import SeatStreamHub
+
+        seat_manager = SeatManager(self.config)
+        show = ("Teater 1", "The Lion King", "15:30", "2099-01-07")
+
+        async def scenario():
+            hub = SeatStreamHub(seat_manager, interval=0.01)
+            reads = []
+            read = hub._read
+
+            async def counted_read(show_key):
+                reads.append(show_key)
+                return await read(show_key)
+
+            hub._read = counted_read
+            first = hub.subscribe(*show)
+            second = hub.subscribe(*show)
+            event, snapshot = await first.__anext__()
+            self.assertEqual(event, "snapshot")
+            self.assertEqual(snapshot["available_count"], snapshot["size"])
+            await second.__anext__()
+            self.assertEqual(hub.channel_count, 1)
+
+            # Dua perubahan dalam satu interval digabung menjadi satu delta
+            seat_manager.reserve_seats(show[0], ["A1", "A2", "A3"], *show[1:])
+            seat_manager.release_seat(show[0], ["A2"], *show[1:])
+            event, delta = await first.__anext__()
+            self.assertEqual(event, "delta")
+            self.assertEqual((delta["taken"], delta["freed"]), ([0, 2], []))
+            self.assertEqual(await second.__anext__(), (event, delta))
+
+            seat_manager.release_seat(show[0], ["A1"], *show[1:])
+            event, delta = await first.__anext__()
+            self.assertEqual((delta["taken"], delta["freed"]), ([], [0]))
+
+            # Tanpa perubahan, pemantau tidak menyalin peta kursi (tidak ada polling)
+            read_count = len(reads)
+            await asyncio.sleep(0.05)
+            self.assertEqual(len(reads), read_count)
+
+            # Perubahan dari thread lain dikabarkan lewat loop.call_soon_threadsafe
+            await asyncio.to_thread(seat_manager.reserve_seats, show[0], ["B1"], *show[1:])
+            event, delta = await first.__anext__()
+            self.assertEqual((event, delta["taken"]), ("delta", [10]))
+
+            await first.aclose()
+            await second.aclose()
+            self.assertEqual(hub.channel_count, 0)
+            return hub
+
+        hub = asyncio.run(scenario())
+
+        # Pemberitahuan ke event loop yang sudah ditutup tidak menggagalkan pemesanan
+        hub._channels[seat_manager.make_show_key(*show)] = None
+        self.assertEqual(seat_manager.reserve_seats(show[0], ["B2"], *show[1:]), [])
+        self.assertEqual(self.client.get("/seats/Teater 9/stream").status_code, 404)
+
     def test_facade_calculate_ticket_price(self):
         result = self.facade.calculate_ticket_price(
             "Avengers: Endgame", "10:00", is_holiday=False, is_member=True, ticket_count=1
@@ -238,5 +1211,29 @@ class TicketSystemTest(unittest.TestCase):
         self.assertIsInstance(result, dict)
         self.assertIn("success", result)
 
+    def test_cli_startup_budget(self):
+        import json
+        import subprocess
+
+        # Menu tampil lalu keluar (pilihan 8) dalam batas waktu, tanpa memuat web stack,
+        # facade, maupun SQLite
+        script = (
+            "import builtins, json, sys, time\n"
+            "start = time.perf_counter()\n"
+            "from cli.menu import start_cli\n"
+            "builtins.input = lambda prompt='': '8'\n"
+            "start_cli()\n"
+            "elapsed = time.perf_counter() - start\n"
+            f"heavy = [m for m in {CLI_HEAVY_MODULES!r} if m in sys.modules]\n"
+            "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+        )
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        self.assertEqual(result["heavy"], [])
+        self.assertLess(result["elapsed"], CLI_STARTUP_BUDGET)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,67 @@
+# ======================================
+# AutoTicket CLI Project
+# ======================================
+# File: id_generator.py
+
+import os
+import threading
+import time
+
+
+class ReservationIdGenerator:
+    """
+    Pembuat ID reservasi yang unik dan terurut berdasarkan waktu.
+
+    Format: PREFIX-TTTTTTTTTTTT-PPPPPPRRRRRRRR-SSSS (heksadesimal)
+    - T: milidetik sejak epoch, tidak pernah mundur walau jam sistem mundur
+    - P: PID proses (24 bit, cukup untuk batas PID Linux 2^22)
+    - R: 32 bit acak per proses
+    - S: nomor urut di dalam milidetik yang sama
+
+    Jaminan: dua proses yang berjalan bersamaan di satu host punya PID
+    berbeda, sehingga ID-nya tidak pernah sama; di dalam satu proses T dan S
+    tidak pernah berulang. Antar host, tabrakan butuh PID, 32 bit acak, dan
+    milidetik yang sama sekaligus (peluang ~2^-32 per pasangan proses ber-PID
+    sama). Penanda proses dibuat ulang setelah fork.
+
+    Karena lebar setiap bagian tetap, urutan string sama dengan urutan waktu
+    pembuatan di dalam satu proses.
+    """
+
+    def __init__(self, prefix: str = "RES"):
+        self.prefix = prefix
+        self._pid = 0
+        self._node = ""
+        self._last_millis = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def _refresh_node(self) -> None:
+        # Proses hasil fork mewarisi penanda induk; ganti dengan PID dan bit acak miliknya sendiri
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._node = f"{pid & 0xFFFFFF:06X}{int.from_bytes(os.urandom(4), 'big'):08X}"
+            self._last_millis = 0
+            self._sequence = 0
+
+    def next_id(self) -> str:
+        """
+        Mengembalikan ID berikutnya.
+
+        Returns:
+            str: ID reservasi, misal "RES-0192F3A4B5C6-0004D27A3F19C2-0000"
+        """
+        with self._lock:
+            self._refresh_node()
+            millis = max(int(time.time() * 1000), self._last_millis)
+            if millis == self._last_millis:
+                self._sequence += 1
+                if self._sequence > 0xFFFF:
+                    # Nomor urut habis dalam milidetik ini: pinjam milidetik berikutnya
+                    millis += 1
+                    self._sequence = 0
+            else:
+                self._sequence = 0
+            self._last_millis = millis
+            return f"{self.prefix}-{millis:012X}-{self._node}-{self._sequence:04X}"